@@ -0,0 +1,81 @@
+"""Micro-benchmark: interpreted `eval_rule` vs compiled applicability rules.
+
+Evaluates every control of every pack in the registry against a grid of
+contexts built from each use case and a set of scope-answer variants, checks
+that both paths agree, and prints the timings.
+
+    cd apps/api && python -m benchmarks.bench_rules [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+
+from truststack_grc.core.mapping.compiler import compile_rule
+from truststack_grc.core.mapping.rules import eval_rule
+from truststack_grc.core.packs.loader import PackRegistry
+from truststack_grc.core.projects.context import build_context
+from truststack_grc.core.taxonomy.loader import TaxonomyLoader
+
+def _contexts() -> list[dict]:
+    taxonomy = TaxonomyLoader.from_env()
+    out = []
+    for industry in taxonomy.list_industries():
+        for segment in industry.get("segments", []):
+            for uc in segment.get("use_cases", []):
+                for jur, tools, exposed, sourcing in itertools.product(
+                    [["US"], ["EU"], ["EU", "UK"]], [False, True], [False, True], ["api", "open_source", "fine_tuned"],
+                ):
+                    out.append(build_context(
+                        project_name="bench",
+                        industry_id=industry["id"],
+                        segment_id=segment["id"],
+                        use_case=uc,
+                        scope_answers={"jurisdictions": jur, "uses_tools": tools, "internet_exposed": exposed, "model_sourcing": sourcing},
+                    ))
+    return out
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    reg = PackRegistry.from_env()
+    rules = [
+        ctrl.applicability
+        for entry in reg.list_packs()
+        for pack in [reg.load_pack(entry["domain"], entry["pack_id"], v) for v in entry["versions"]]
+        if pack
+        for ctrl in pack.controls
+    ]
+    contexts = _contexts()
+
+    t0 = time.perf_counter()
+    compiled = [compile_rule(r) for r in rules]
+    compile_s = time.perf_counter() - t0
+
+    for ctx in contexts:
+        for rule, node in zip(rules, compiled):
+            a, b = eval_rule(rule, ctx), node.evaluate(ctx)
+            assert a[0] == b[0] and a[1].matched == b[1].matched, rule
+
+    def run(fn) -> float:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for ctx in contexts:
+                fn(ctx)
+        return time.perf_counter() - start
+
+    interp = run(lambda ctx: [eval_rule(r, ctx) for r in rules])
+    comp = run(lambda ctx: [n.evaluate(ctx) for n in compiled])
+    evals = args.repeat * len(contexts) * len(rules)
+    print(f"rules={len(rules)} contexts={len(contexts)} evaluations={evals}")
+    print(f"compile      {compile_s * 1e3:8.2f} ms (once per pack load)")
+    print(f"interpreted  {interp:8.3f} s  {interp / evals * 1e9:8.1f} ns/eval")
+    print(f"compiled     {comp:8.3f} s  {comp / evals * 1e9:8.1f} ns/eval")
+    print(f"speedup      {interp / comp:8.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
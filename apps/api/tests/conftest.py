@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+import pytest
+
+# Keep test runs away from the checked-in workspaces/ folder (settings are read at import time).
+_TMP = tempfile.mkdtemp(prefix="truststack-tests-")
+os.environ.setdefault("TRUSTSTACK_WORKSPACE_ROOT", os.path.join(_TMP, "workspaces"))
+os.environ.setdefault("TRUSTSTACK_CACHE_ROOT", os.path.join(_TMP, "cache"))
+
+# truststack_grc is imported inside the fixtures, after the environment above is in place.
+
+@pytest.fixture(params=["filesystem", "sqlite"])
+def storage(request, tmp_path):
+    """An empty store under `tmp_path`, once per backend."""
+    from truststack_grc.core.storage.base import StoragePaths
+    from truststack_grc.core.storage.filesystem import FileSystemStorage
+    from truststack_grc.core.storage.sqlite import SQLiteStorage
+
+    paths = StoragePaths(workspace_root=tmp_path)
+    if request.param == "filesystem":
+        return FileSystemStorage(paths)
+    return SQLiteStorage(paths, db_path=tmp_path / "t.sqlite3")
+
+@pytest.fixture
+def project_request() -> dict:
+    """A valid create-project request against the checked-in registry."""
+    from truststack_grc.core.packs.loader import PackRegistry
+    from truststack_grc.core.taxonomy.loader import TaxonomyLoader
+
+    industry = TaxonomyLoader.from_env().list_industries()[0]
+    segment = industry["segments"][0]
+    packs = [{"domain": p["domain"], "pack_id": p["pack_id"], "version": p["versions"][-1]} for p in PackRegistry.from_env().list_packs()]
+    return {
+        "name": "Claims bot", "industry_id": industry["id"], "segment_id": segment["id"], "use_case_id": segment["use_cases"][0]["id"],
+        "deployment_environment": "AWS Native", "scope_answers": {"uses_tools": True}, "selected_packs": packs[:3],
+    }
@@ -0,0 +1,10 @@
+from typing import Any, Callable
+
+def collect_pages(fetch: Callable[[Any], tuple[list, Any]]) -> list:
+    """Follow a cursor-paginated listing to the end; `fetch(cursor)` returns (page, next cursor)."""
+    out, cursor = [], None
+    while True:
+        page, cursor = fetch(cursor)
+        out += page
+        if cursor is None:
+            return out
@@ -0,0 +1,61 @@
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+from truststack_grc.core.storage import auditlog
+from truststack_grc.core.storage.auditlog import AuditEvent, AuditLog, AuditQuery
+from truststack_grc.main import app
+from tests.helpers import collect_pages
+
+def _pages(log, **kw):
+    return collect_pages(lambda cursor: log.query(AuditQuery(limit=7, cursor=cursor, **kw)))
+
+def test_segments_index_and_range_queries(tmp_path, monkeypatch):
+    monkeypatch.setattr(auditlog, "INDEX_INTERVAL", 512)
+    legacy = tmp_path / "auditlog.ndjson"
+    legacy.write_text("".join(
+        json.dumps({"ts": f"2025-01-01T00:00:{n:02d}+00:00", "event_type": "legacy", "actor": "a", "details": {}}) + "\n" for n in range(30)
+    ))
+    log = AuditLog(tmp_path / "audit", legacy=legacy)
+    log.segment_bytes = 4096
+
+    def worker(n: int) -> None:
+        for k in range(20):
+            log.append([AuditEvent("checklist.item.updated" if k % 2 else "evidence.uploaded", f"user{n}", {"k": k, "pad": "x" * 40})])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    events = log.read_all()
+    stamps = [e["ts"] for e in events]
+    assert len(events) == 30 + 160 and stamps == sorted(stamps)
+    assert len(list((tmp_path / "audit").glob("*.ndjson"))) > 3
+    assert not (tmp_path / "audit" / "00000000.idx").exists()
+
+    since, until = stamps[20], stamps[120]
+    expected = [e for e in events if since <= e["ts"] <= until]
+    assert _pages(log, since=since, until=until) == expected
+    assert (tmp_path / "audit" / "00000000.idx").exists()  # segment 0 indexed on first query
+    assert _pages(log) == events
+    assert _pages(log, since=since, event_types=("evidence.uploaded",)) == [
+        e for e in events if e["ts"] >= since and e["event_type"] == "evidence.uploaded"
+    ]
+
+    log.replace(events[:5])
+    assert log.read_all() == events[:5] and not legacy.exists()
+
+def test_audit_endpoint_filters_by_type(project_request):
+    client = TestClient(app)
+    project_id = client.post("/api/projects", json={**project_request, "name": "Audit me"}).json()["project_id"]
+    item_id = client.get(f"/api/projects/{project_id}/checklist").json()["items"][0]["item_id"]
+    client.patch(f"/api/projects/{project_id}/checklist/{item_id}", json={"status": "in_progress"})
+
+    res = client.get(f"/api/projects/{project_id}/audit", params={"event_type": "checklist.item.updated"}).json()
+    assert [e["event_type"] for e in res["events"]] == ["checklist.item.updated"] and res["next_cursor"] is None
+    everything = client.get(f"/api/projects/{project_id}/audit", params={"since": "2000-01-01T00:00:00Z"}).json()["events"]
+    assert [e["event_type"] for e in everything] == ["project.created", "checklist.item.updated"]
+    assert client.get(f"/api/projects/{project_id}/audit", params={"since": "yesterday"}).status_code == 400
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+from truststack_grc.core.storage.factory import get_storage
+from truststack_grc.main import app
+
+client = TestClient(app)
+
+def test_bulk_patch_applies_once_and_reports_per_item(project_request):
+    project_id = client.post("/api/projects", json=project_request).json()["project_id"]
+    checklist = client.get(f"/api/projects/{project_id}/checklist")
+    ids = [it["item_id"] for it in checklist.json()["items"]]
+    assert len(ids) > 1
+    patches = [{"item_id": i, "owner": "bob", "status": "in_progress"} for i in ids] + [{"item_id": "missing", "owner": "bob"}]
+
+    res = client.patch(f"/api/projects/{project_id}/checklist", json={"items": patches}, headers={"If-Match": checklist.headers["etag"]})
+    body = res.json()
+    assert res.status_code == 200 and body["updated"] == len(ids) and body["failed"] == 1
+    assert [r["ok"] for r in body["results"]] == [True] * len(ids) + [False]
+    assert body["revision"] == checklist.json()["revision"] + 1 and res.headers["etag"] == f'"rev-{body["revision"]}"'
+
+    items = {it["item_id"]: it for it in client.get(f"/api/projects/{project_id}/checklist").json()["items"]}
+    assert all(items[i]["owner"] == "bob" and items[i]["status"] == "in_progress" for i in ids)
+    events = [e for e in get_storage().read_audit(project_id) if e["event_type"] == "checklist.item.updated"]
+    assert [e["details"]["item_id"] for e in events] == ids and len({e["ts"] for e in events}) == 1
+
+    stale = client.patch(f"/api/projects/{project_id}/checklist", json={"items": patches}, headers={"If-Match": checklist.headers["etag"]})
+    assert stale.status_code == 412
+    assert client.patch(f"/api/projects/{project_id}/checklist", json={"items": []}).status_code == 422
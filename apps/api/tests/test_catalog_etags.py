@@ -0,0 +1,50 @@
+import json
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from truststack_grc.api.caching import RenderedCache
+from truststack_grc.config import get_settings
+
+from truststack_grc.core.packs.loader import PackRegistry
+from truststack_grc.core.taxonomy.loader import TaxonomyLoader
+from truststack_grc.main import app
+
+client = TestClient(app)
+
+def test_catalog_endpoints_revalidate_without_rebuilding(monkeypatch):
+    pack = PackRegistry.from_env().list_packs()[0]
+    urls = ["/api/packs", "/api/taxonomy/industries", f"/api/packs/{pack['domain']}/{pack['pack_id']}/{pack['versions'][-1]}"]
+    first = {url: client.get(url) for url in urls}
+    for url, res in first.items():
+        assert res.status_code == 200 and res.headers["etag"].startswith('"')
+        assert "max-age" in res.headers["cache-control"]
+
+    def boom(*_a, **_k):
+        raise AssertionError("catalog rebuilt")
+
+    monkeypatch.setattr(PackRegistry, "list_packs", boom)
+    monkeypatch.setattr(PackRegistry, "load_pack", boom)
+    monkeypatch.setattr(TaxonomyLoader, "model", boom)
+    # Within max-age the source files are not even stat'ed.
+    monkeypatch.setattr(PackRegistry, "source_signature", boom)
+    monkeypatch.setattr(TaxonomyLoader, "source_signature", boom)
+    for url, res in first.items():
+        etag = res.headers["etag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        again = client.get(url, headers={"If-None-Match": '"other"'})
+        assert again.status_code == 200 and again.json() == res.json() and again.headers["etag"] == etag
+
+def test_catalog_sources_are_restamped_once_per_max_age(monkeypatch):
+    cache = RenderedCache()
+    clock = [0.0]
+    monkeypatch.setattr("truststack_grc.api.caching.time.monotonic", lambda: clock[0])
+    stamped, built = [], []
+
+    def respond(sig):
+        return cache.respond(SimpleNamespace(headers={}), "k", lambda: stamped.append(sig) or sig, lambda: built.append(sig) or ({"sig": sig}, None))
+
+    respond("a")
+    assert json.loads(respond("b").body) == {"sig": "a"} and stamped == ["a"]
+    clock[0] += get_settings().catalog_max_age
+    assert json.loads(respond("b").body) == {"sig": "b"} and built == ["a", "b"]
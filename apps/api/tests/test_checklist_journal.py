@@ -0,0 +1,81 @@
+import os
+import threading
+
+import pytest
+
+from truststack_grc.core.storage.base import ProjectNotFound, StoragePaths
+from truststack_grc.core.storage.catalog import ProjectQuery
+from truststack_grc.core.storage.filesystem import COMPACTING, JOURNAL, FileSystemStorage
+
+def _storage(tmp_path) -> FileSystemStorage:
+    storage = FileSystemStorage(StoragePaths(workspace_root=tmp_path))
+    storage.write_project("p", {"project": {"id": "p", "name": "P", "updated_at": "2026-01-01T00:00:00+00:00"}}, create=True)
+    items = [{"item_id": f"i{n}", "title": f"T{n}", "status": "not_started", "owner": None, "evidence": []} for n in range(5)]
+    storage.write_checklist("p", {"project_id": "p", "items": items, "counts": {"total": 5}})
+    return storage
+
+def _set_status(status):
+    return lambda item: item.update(status=status)
+
+def test_item_patches_are_journaled_and_compacted(tmp_path):
+    storage = _storage(tmp_path)
+    base = tmp_path / "p" / "checklist.yaml"
+    mtime = base.stat().st_mtime_ns
+
+    storage.update_checklist_item("p", "i1", _set_status("in_progress"))
+    storage.update_checklist_item("p", "i1", lambda it: it["evidence"].append({"file_name": "a.txt"}))
+    storage.update_checklist_item("p", "i3", _set_status("implemented"))
+    storage.touch_project("p", "2026-02-01T00:00:00+00:00")
+    assert base.stat().st_mtime_ns == mtime
+    assert storage.update_checklist_item("p", "missing", _set_status("x")) is None
+
+    expected = storage.read_checklist("p")
+    assert [it["status"] for it in expected["items"]] == ["not_started", "in_progress", "not_started", "implemented", "not_started"]
+    assert expected["items"][1]["evidence"] == [{"file_name": "a.txt"}]
+    assert storage.read_project("p")["project"]["updated_at"] == "2026-02-01T00:00:00+00:00"
+
+    # A torn tail from a killed worker is ignored and sealed off by the next append.
+    with (tmp_path / "p" / JOURNAL).open("ab") as f:
+        f.write(b'{"op": "set", "item_id": "i0", "fie')
+    assert storage.read_checklist("p") == expected
+    storage.update_checklist_item("p", "i4", _set_status("risk_accepted"))
+    expected["items"][4]["status"] = "risk_accepted"
+    expected["revision"] += 1
+    assert storage.read_checklist("p") == expected
+
+    # Crash after the compacted base was swapped in but before the journal was dropped: replay is idempotent.
+    os.replace(tmp_path / "p" / JOURNAL, tmp_path / "p" / COMPACTING)
+    assert storage.read_checklist("p") == expected
+
+    assert storage.compact_checklist("p")
+    assert not (tmp_path / "p" / JOURNAL).exists() and not (tmp_path / "p" / COMPACTING).exists()
+    assert storage.read_checklist("p") == expected
+    assert storage.read_project("p")["project"]["updated_at"] == "2026-02-01T00:00:00+00:00"
+    assert not storage.compact_checklist("p")
+
+    # A full rewrite supersedes journaled item changes.
+    storage.update_checklist_item("p", "i0", _set_status("in_progress"))
+    revision = storage.write_checklist("p", expected)
+    assert revision == expected["revision"] + 2
+    assert storage.read_checklist("p") == {**expected, "revision": revision}
+
+def test_delete_waits_for_writers_and_is_not_undone_by_late_ones(tmp_path):
+    storage = _storage(tmp_path)
+    project = storage.read_project("p")
+    deleted = []
+    with storage._lock("p"):
+        # A writer (group commit, compaction) holds the lock: the directory stays put meanwhile.
+        thread = threading.Thread(target=lambda: deleted.append(storage.delete_project("p")))
+        thread.start()
+        thread.join(timeout=0.2)
+        assert thread.is_alive() and (tmp_path / "p" / "checklist.yaml").exists()
+    thread.join()
+    assert deleted == [True] and not (tmp_path / "p").exists()
+
+    # Writers that were already on their way find the project gone instead of recreating it.
+    with pytest.raises(ProjectNotFound):
+        storage.write_project("p", project)
+    with pytest.raises(ProjectNotFound):
+        storage.write_checklist("p", {"project_id": "p", "items": []})
+    assert storage.apply_changes("p", []) is False and storage.compact_checklist("p") is False
+    assert not (tmp_path / "p").exists() and [p["id"] for p in storage.query_projects(ProjectQuery())[0]] == []
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from truststack_grc.core.projects.service import ProjectService
+from truststack_grc.core.storage import itemindex
+from truststack_grc.core.storage.base import Storage, StoragePaths
+from truststack_grc.core.storage.catalog import InvalidCursor
+from truststack_grc.core.storage.checklist_query import ChecklistQuery
+from truststack_grc.core.storage.filesystem import FileSystemStorage
+from truststack_grc.main import app
+from tests.helpers import collect_pages
+
+def _pages(storage, project_id, **kw):
+    def fetch(cursor):
+        page = storage.query_checklist(project_id, ChecklistQuery(limit=2, cursor=cursor, **kw))
+        return page["items"], page["next_cursor"]
+    return collect_pages(fetch)
+
+def test_query_filters_sorts_and_pages_like_the_full_document(storage, project_request):
+    service = ProjectService(storage)
+    project_id = service.create_project(project_request, actor="a")["project_id"]
+    items = storage.read_checklist(project_id)["items"]
+    service.update_checklist_item(project_id, items[1]["item_id"], {"status": "implemented", "owner": "bob"}, actor="a")
+    items = storage.read_checklist(project_id)["items"]
+
+    assert _pages(storage, project_id) == items
+    for sort in ("severity", "status", "domain", "title", "owner"):
+        for order in ("asc", "desc"):
+            query = dict(sort=sort, order=order)
+            expected = Storage.query_checklist(storage, project_id, ChecklistQuery(limit=1000, **query))["items"]
+            assert _pages(storage, project_id, **query) == expected and len(expected) == len(items)
+
+    page = storage.query_checklist(project_id, ChecklistQuery(status=("implemented",), owner=("bob",), fields=("status", "title")))
+    assert page["total"] == 1 and page["items"] == [{"item_id": items[1]["item_id"], "title": items[1]["title"], "status": "implemented"}]
+    category = items[0]["category"]
+    assert [it["item_id"] for it in _pages(storage, project_id, category=(category,))] == [it["item_id"] for it in items if it["category"] == category]
+    assert storage.query_checklist(project_id, ChecklistQuery())["revision"] == storage.read_checklist(project_id)["revision"]
+    with pytest.raises(InvalidCursor):
+        storage.query_checklist(project_id, ChecklistQuery(sort="title", cursor=_cursor(storage, project_id)))
+
+def _cursor(storage, project_id):
+    return storage.query_checklist(project_id, ChecklistQuery(limit=1))["next_cursor"]
+
+def test_filesystem_index_only_reads_returned_items(tmp_path, monkeypatch, project_request):
+    storage = FileSystemStorage(StoragePaths(workspace_root=tmp_path))
+    project_id = ProjectService(storage).create_project(project_request, actor="a")["project_id"]
+    items = storage.read_checklist(project_id)["items"]
+    assert storage.query_checklist(project_id, ChecklistQuery(limit=1))["items"] == items[:1]
+
+    read = []
+    real = itemindex.read_items
+    monkeypatch.setattr(itemindex, "read_items", lambda path, index, rows: read.extend(rows) or real(path, index, rows))
+    monkeypatch.setattr("truststack_grc.core.storage.filesystem._read_yaml_cached", lambda *_: pytest.fail("checklist.yaml parsed"))
+    page = storage.query_checklist(project_id, ChecklistQuery(status=("not_started",), limit=1))
+    assert page["total"] == len(items) and len(read) == 1
+
+def test_checklist_endpoint_pages_on_request(project_request):
+    client = TestClient(app)
+    project_id = client.post("/api/projects", json={**project_request, "name": "Checklist query"}).json()["project_id"]
+    full = client.get(f"/api/projects/{project_id}/checklist")
+    assert "items" in full.json() and "next_cursor" not in full.json()
+
+    res = client.get(f"/api/projects/{project_id}/checklist", params={"fields": "title,status", "limit": 1})
+    body = res.json()
+    assert res.status_code == 200 and res.headers["etag"] == full.headers["etag"]
+    assert body["items"] == [{k: full.json()["items"][0][k] for k in ("item_id", "title", "status")}]
+    assert body["total"] == len(full.json()["items"]) and body["next_cursor"]
+    assert client.get(f"/api/projects/{project_id}/checklist", params={"cursor": "x"}).status_code == 400
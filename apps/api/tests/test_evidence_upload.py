@@ -0,0 +1,41 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile
+
+from truststack_grc.core.storage.factory import get_storage
+from truststack_grc.core.storage.uploads import CHUNK_SIZE, UploadTooLarge, stage_upload
+from truststack_grc.main import app
+
+client = TestClient(app)
+
+def test_uploads_are_streamed_into_shared_blobs_and_refcounted(project_request):
+    storage = get_storage()
+    projects = [client.post("/api/projects", json={**project_request, "name": f"Blob {n}"}).json()["project_id"] for n in range(2)]
+    items = {p: client.get(f"/api/projects/{p}/checklist").json()["items"][0]["item_id"] for p in projects}
+    payload = b"x" * (CHUNK_SIZE * 2 + 123)
+    digest = hashlib.sha256(payload).hexdigest()
+
+    metas = [client.post(f"/api/projects/{p}/evidence/{items[p]}", files={"file": ("soc2 report.pdf", payload)}).json() for p in projects]
+    assert all(m["bytes"] == len(payload) and m["blob"] == m["sha256"] == digest for m in metas)
+    assert metas[0]["file_name"] == "soc2 report.pdf"
+    blob = storage.blobs.path(digest)
+    assert blob.read_bytes() == payload and storage.blobs.refcount(digest) == 2
+    assert list(storage.blobs.staging_dir.iterdir()) == []
+    mtime = blob.stat().st_mtime_ns
+    client.post(f"/api/projects/{projects[0]}/evidence/{items[projects[0]]}", files={"file": ("copy.pdf", payload)})
+    assert blob.stat().st_mtime_ns == mtime and storage.blobs.refcount(digest) == 2
+
+    client.delete(f"/api/projects/{projects[0]}")
+    assert blob.exists() and storage.blobs.refcount(digest) == 1
+    client.delete(f"/api/projects/{projects[1]}")
+    assert not blob.exists() and storage.blobs.refcount(digest) == 0
+
+def test_oversized_upload_is_rejected_without_leftovers(tmp_path):
+    upload = UploadFile(io.BytesIO(b"y" * (CHUNK_SIZE + 1)), filename="big.bin")
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(stage_upload(upload, tmp_path / "evidence", max_bytes=CHUNK_SIZE))
+    assert list((tmp_path / "evidence").iterdir()) == []
@@ -0,0 +1,221 @@
+import itertools
+from typing import Any
+
+from truststack_grc.core.mapping import engine
+from truststack_grc.core.mapping.engine import generate_checklist
+from truststack_grc.core.mapping.rules import eval_rule
+from truststack_grc.core.packs.loader import PackRegistry
+from truststack_grc.core.packs.models import ControlDefinition, Pack, PackInfo, PackSource
+from truststack_grc.core.projects.context import build_context
+from truststack_grc.core.taxonomy.loader import TaxonomyLoader
+
+# Baseline (pre-optimization) checklist generator, kept verbatim as the oracle.
+def _uniq_list(items: list[Any]) -> list[Any]:
+    seen = set()
+    out = []
+    for x in items:
+        key = jsonable_key(x)
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(x)
+    return out
+
+def jsonable_key(x: Any) -> str:
+    if isinstance(x, dict):
+        return str(sorted((k, jsonable_key(v)) for k, v in x.items()))
+    if isinstance(x, list):
+        return str([jsonable_key(i) for i in x])
+    return repr(x)
+
+def reference_checklist(context: dict[str, Any], packs: list[Pack]) -> list[dict[str, Any]]:
+    merged: dict[str, dict[str, Any]] = {}
+
+    for pack in packs:
+        for ctrl in pack.controls:
+            ok, trace = eval_rule(ctrl.applicability, context)
+            if not ok:
+                continue
+
+            merge_key = ctrl.canonical_id or f"{pack.pack.domain}/{pack.pack.id}/{ctrl.id}"
+            instance_id = engine.stable_id(merge_key)
+
+            ref = {
+                "domain": pack.pack.domain,
+                "pack_id": pack.pack.id,
+                "version": pack.pack.version,
+                "control_id": ctrl.id,
+                "source": pack.pack.source.model_dump(),
+                "pack_hash": pack.hash,
+            }
+
+            why_parts = []
+            if ctrl.why:
+                why_parts.append(ctrl.why)
+            if trace.matched:
+                why_parts.append("Triggered by: " + "; ".join(trace.matched))
+
+            if merge_key not in merged:
+                merged[merge_key] = {
+                    "item_id": instance_id,
+                    "merge_key": merge_key,
+                    "canonical_id": ctrl.canonical_id,
+                    "title": ctrl.title,
+                    "objective": ctrl.objective,
+                    "severity": ctrl.severity,
+                    "category": ctrl.category,
+                    "domain": pack.pack.domain,
+                    "pack_refs": [ref],
+                    "why_applies": "\n".join(why_parts).strip(),
+                    "evidence_required": list(ctrl.evidence_required or []),
+                    "test_procedures": list(ctrl.test_procedures or []),
+                    "status": "not_started",
+                    "owner": None,
+                    "notes": None,
+                    "evidence": [],
+                }
+            else:
+                merged[merge_key]["pack_refs"].append(ref)
+                merged[merge_key]["evidence_required"] = _uniq_list(merged[merge_key]["evidence_required"] + list(ctrl.evidence_required or []))
+                merged[merge_key]["test_procedures"] = _uniq_list(merged[merge_key]["test_procedures"] + list(ctrl.test_procedures or []))
+                # Prefer highest severity when merged
+                sev_rank = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+                if sev_rank.get(ctrl.severity, 0) > sev_rank.get(merged[merge_key]["severity"], 0):
+                    merged[merge_key]["severity"] = ctrl.severity
+                # Extend why if useful
+                if why_parts:
+                    existing = merged[merge_key].get("why_applies") or ""
+                    add = "\n".join([p for p in why_parts if p and p not in existing])
+                    merged[merge_key]["why_applies"] = (existing + ("\n" if existing and add else "") + add).strip()
+
+    items = list(merged.values())
+    # deterministic ordering: domain, severity desc, title
+    sev_rank = {"critical": 3, "high": 2, "medium": 1, "low": 0}
+    items.sort(key=lambda x: (x["domain"], -sev_rank.get(x["severity"], 0), x["title"]))
+    return items
+
+
+def _pack(pack_id: str, controls: list[dict[str, Any]], domain: str = "security") -> Pack:
+    info = PackInfo(id=pack_id, name=pack_id, version="1", domain=domain, type="control_catalog", source=PackSource(name="t", reference="t"))
+    return Pack(pack=info, controls=[ControlDefinition(**c) for c in controls], path="", hash=f"hash-{pack_id}")
+
+def _ctrl(cid: str, rule: dict[str, Any], **kw: Any) -> dict[str, Any]:
+    return {"id": cid, "title": kw.pop("title", cid), "objective": "o", "severity": kw.pop("severity", "medium"), "applicability": rule, **kw}
+
+SYNTHETIC = [
+    _pack("a", [
+        _ctrl("A1", {}, canonical_id="C-1", why="baseline", evidence_required=[{"type": "doc", "name": "Policy"}], test_procedures=["t1"]),
+        _ctrl("A2", {"all": [{"has_tag": "llm"}, {"any": [{"equals": ["data.phi", True]}, {"in": ["EU", "jurisdiction.list"]}]}]}, canonical_id="C-2"),
+        _ctrl("A3", {"not": {"has_tag": "llm"}}, severity="high"),
+        _ctrl("A4", {"any": []}),
+        _ctrl("A5", {"contains": ["system.name", "bot"]}, canonical_id="C-1", severity="critical",
+              evidence_required=[{"name": "Policy", "type": "doc"}, {"type": "log", "name": "Logs"}], test_procedures=["t1", "t2"]),
+    ]),
+    _pack("b", [
+        _ctrl("B1", {"exists": "model.sourcing"}, canonical_id="C-1", why="baseline", test_procedures=["t2", "t3"]),
+        _ctrl("B2", {"all": [{"equals": ["pattern.agentic", True]}, {"equals": ["deployment.internet_exposed", True]}]}, canonical_id="C-2", why="tools"),
+        _ctrl("B3", {"in": ["US", "jurisdiction.list"]}, title="Zeta", severity="low"),
+        _ctrl("B4", {"has_tag": "llm"}, canonical_id="C-1", why="baseline\n", evidence_required=[{"type": "log", "name": "Logs"}]),
+        _ctrl("B5", {"has_tag": "llm"}, canonical_id="C-1", why="baseline\n", test_procedures=["t3", "t1"]),
+    ], domain="governance"),
+]
+
+def _contexts() -> list[dict[str, Any]]:
+    taxonomy = TaxonomyLoader.from_env()
+    out = []
+    for industry in taxonomy.list_industries():
+        for segment in industry.get("segments", []):
+            for uc in segment.get("use_cases", []):
+                for jur, tools, exposed, name in itertools.product([["US"], ["EU", "UK"], []], [False, True], [False, True], ["bot", "svc"]):
+                    out.append(build_context(
+                        project_name=name, industry_id=industry["id"], segment_id=segment["id"], use_case={**uc, "tags": uc.get("tags", []) + ["llm"] * tools},
+                        scope_answers={"jurisdictions": jur, "uses_tools": tools, "internet_exposed": exposed, "processes_phi": exposed},
+                    ))
+    return out
+
+def _registry_packs() -> list[Pack]:
+    reg = PackRegistry.from_env()
+    return [reg.load_pack(p["domain"], p["pack_id"], p["versions"][-1]) for p in reg.list_packs()]
+
+def test_predicate_index_never_drops_a_matching_control():
+    contexts = _contexts()
+    for pack in SYNTHETIC + _registry_packs():
+        for ctx in contexts:
+            candidates = set(pack.predicate_index.candidates(ctx))
+            for idx, ctrl in enumerate(pack.controls):
+                if eval_rule(ctrl.applicability, ctx)[0]:
+                    assert idx in candidates, (pack.pack.id, ctrl.id)
+
+def test_generate_checklist_matches_reference():
+    packs = SYNTHETIC + _registry_packs()
+    for ctx in _contexts():
+        for selection in (packs, list(reversed(packs)), SYNTHETIC):
+            assert generate_checklist(ctx, selection)["items"] == reference_checklist(ctx, selection)
+
+def test_batch_evaluation_matches_scalar_engine():
+    import pytest
+    pytest.importorskip("numpy")
+    from truststack_grc.core.mapping.batch import evaluate_batch
+
+    packs = SYNTHETIC + _registry_packs()
+    contexts = _contexts()
+    res = evaluate_batch(contexts, packs)
+    controls = [ctrl for pack in packs for ctrl in pack.controls]
+    assert res.matrix.shape == (len(contexts), len(controls))
+    for row, ctx in zip(res.matrix, contexts):
+        assert list(row) == [eval_rule(c.applicability, ctx)[0] for c in controls]
+    assert list(res.checklist_counts()) == [len(generate_checklist(ctx, packs)["items"]) for ctx in contexts]
+
+def test_explain_levels_only_change_why_applies():
+    packs = SYNTHETIC + _registry_packs()
+    for ctx in _contexts():
+        full = generate_checklist(ctx, packs)["items"]
+        summary = generate_checklist(ctx, packs, explain="summary")["items"]
+        none = generate_checklist(ctx, packs, explain="none")["items"]
+        strip = lambda items: [{**it, "why_applies": None} for it in items]
+        assert strip(full) == strip(summary) == strip(none)
+        assert all(it["why_applies"] == "" for it in none)
+        assert all("Triggered by:" not in it["why_applies"] for it in summary)
+
+def test_memoized_checklist_is_sound_and_isolated(tmp_path):
+    from truststack_grc.core.mapping.memo import ChecklistMemo, memoized_checklist
+
+    packs = SYNTHETIC + _registry_packs()
+    memo = ChecklistMemo(max_bytes=1 << 30, persist_dir=tmp_path)
+    contexts = _contexts()
+    for ctx in contexts:
+        assert memoized_checklist(ctx, packs, memo) == generate_checklist(ctx, packs)
+    # Contexts differing only in fields no rule reads share one template.
+    entries = memo.stats()["entries"]
+    assert memoized_checklist({**contexts[0], "unread": {"x": 1}}, packs, memo) == generate_checklist(contexts[0], packs)
+    assert memo.stats()["entries"] == entries and memo.stats()["hits"] == 1
+
+    got = memoized_checklist(contexts[0], packs, memo)
+    got["items"][0]["status"] = "done"
+    assert memoized_checklist(contexts[0], packs, memo)["items"][0]["status"] != "done"
+
+    fresh = ChecklistMemo(max_bytes=1, persist_dir=tmp_path)
+    assert memoized_checklist(contexts[0], packs, fresh) == generate_checklist(contexts[0], packs)
+    assert fresh.stats()["disk_hits"] == 1 and fresh.stats()["entries"] == 0
+
+def test_incremental_regeneration_matches_full():
+    import random
+    from truststack_grc.core.mapping.incremental import regenerate_checklist
+    from truststack_grc.core.mapping.memo import overlay_state
+
+    packs = SYNTHETIC + _registry_packs()
+    bumped = _pack("a", SYNTHETIC[0].model_dump()["controls"][:3])
+    bumped.pack.version = "2"
+    rng = random.Random(7)
+    for ctx in _contexts()[::5]:
+        for _ in range(6):
+            old = rng.sample(packs, rng.randint(0, len(packs)))
+            new = [p for p in old if rng.random() < 0.7] + [p for p in packs + [bumped] if p not in old and rng.random() < 0.4]
+            new = [p for p in new if not (p is bumped and SYNTHETIC[0] in new)]
+            prior = generate_checklist(ctx, old)["items"]
+            for n, item in enumerate(prior):
+                item["status"], item["notes"] = "in_progress", f"note {n}"
+            expected = generate_checklist(ctx, new)["items"]
+            overlay_state(expected, prior)
+            got = regenerate_checklist(ctx, old, new, prior)
+            assert got is not None and got["items"] == expected
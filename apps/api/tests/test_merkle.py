@@ -0,0 +1,51 @@
+import os
+import shutil
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.storage.hashing import sha256_dir
+from truststack_grc.core.storage.merkle import DirectoryHasher
+
+def test_legacy_digest_matches_sha256_dir_for_every_pack(tmp_path):
+    hasher = DirectoryHasher(sidecar_dir=tmp_path / "hashes")
+    packs_root = get_settings().config_root / "packs"
+    for version_dir in sorted(packs_root.glob("*/*/*")):
+        assert hasher.legacy_digest(version_dir) == sha256_dir(version_dir)
+
+def test_sidecar_reuses_unchanged_file_digests(tmp_path, monkeypatch):
+    src = get_settings().config_root / "packs" / "governance" / "eu-ai-act" / "2024-1689"
+    pack_dir = tmp_path / "pack"
+    shutil.copytree(src, pack_dir)
+    sidecar = tmp_path / "hashes"
+    first = DirectoryHasher(sidecar_dir=sidecar)
+    root = first.merkle_root(pack_dir)
+    legacy = first.legacy_digest(pack_dir)
+
+    # A fresh instance (new process) must be served from the sidecar without reading files.
+    second = DirectoryHasher(sidecar_dir=sidecar)
+    opened = []
+    real_open = type(pack_dir).open
+    monkeypatch.setattr(type(pack_dir), "open", lambda self, *a, **kw: (pack_dir in self.parents and opened.append(self.name)) or real_open(self, *a, **kw))
+    assert second.merkle_root(pack_dir) == root
+    assert second.legacy_digest(pack_dir) == legacy
+    assert opened == []
+
+    (pack_dir / "pack.yaml").write_text("changed: true\n", encoding="utf-8")
+    opened.clear()
+    assert second.merkle_root(pack_dir) != root
+    assert opened == ["pack.yaml"]
+    assert second.legacy_digest(pack_dir) == sha256_dir(pack_dir)
+
+def test_touched_tree_keeps_its_digest_without_a_full_rehash(tmp_path, monkeypatch):
+    src = get_settings().config_root / "packs" / "governance" / "eu-ai-act" / "2024-1689"
+    pack_dir = tmp_path / "pack"
+    shutil.copytree(src, pack_dir)
+    hasher = DirectoryHasher(sidecar_dir=tmp_path / "hashes")
+    legacy = hasher.legacy_digest(pack_dir)
+
+    st = (pack_dir / "pack.yaml").stat()
+    os.utime(pack_dir / "pack.yaml", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    opened = []
+    real_open = type(pack_dir).open
+    monkeypatch.setattr(type(pack_dir), "open", lambda self, *a, **kw: (pack_dir in self.parents and opened.append(self.name)) or real_open(self, *a, **kw))
+    assert hasher.legacy_digest(pack_dir) == legacy
+    assert opened == ["pack.yaml"]
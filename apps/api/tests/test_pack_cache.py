@@ -0,0 +1,64 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.packs.cache import PackCache
+from truststack_grc.core.packs.catalog import PackCatalog
+from truststack_grc.core.packs.loader import PackPaths, PackRegistry
+from truststack_grc.core.util.yamlio import read_yaml
+
+SRC = get_settings().config_root / "packs" / "governance" / "eu-ai-act"
+
+def _registry(tmp_path: Path, cache: PackCache) -> PackRegistry:
+    shutil.copytree(SRC, tmp_path / "governance" / "eu-ai-act")
+    return PackRegistry(PackPaths(root=tmp_path, packs_dir=tmp_path), get_settings().config_root.parent / "schemas", cache=cache)
+
+def test_pack_cache_hits_until_files_change(tmp_path):
+    cache = PackCache(maxsize=4)
+    reg = _registry(tmp_path, cache)
+    first = reg.load_pack("governance", "eu-ai-act", "2024-1689")
+    assert reg.load_pack("governance", "eu-ai-act", "2024-1689") is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    manifest = tmp_path / "governance" / "eu-ai-act" / "2024-1689" / "pack.yaml"
+    manifest.write_text(manifest.read_text(encoding="utf-8").replace("Reference checklist", "Updated checklist"), encoding="utf-8")
+    st = manifest.stat()
+    os.utime(manifest, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    reloaded = reg.load_pack("governance", "eu-ai-act", "2024-1689")
+    assert reloaded is not first
+    assert reloaded.hash != first.hash
+    assert cache.stats()["invalidations"] == 1
+
+def test_pack_cache_evicts_least_recently_used(tmp_path):
+    cache = PackCache(maxsize=1)
+    reg = _registry(tmp_path, cache)
+    shutil.copytree(tmp_path / "governance" / "eu-ai-act", tmp_path / "governance" / "eu-ai-act-copy")
+    reg.load_pack("governance", "eu-ai-act", "2024-1689")
+    reg.load_pack("governance", "eu-ai-act-copy", "2024-1689")
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 1
+
+def test_catalog_lists_without_loading_packs(tmp_path, monkeypatch):
+    reg = _registry(tmp_path / "packs", cache=None)
+    monkeypatch.setattr(reg, "load_pack", lambda **kw: pytest.fail("pack loaded for a listing"))
+    first = PackCatalog(tmp_path / "catalog").list_packs(reg)
+    pack = PackRegistry(reg.paths, reg.schema_dir, cache=None).load_pack("governance", "eu-ai-act", "2024-1689")
+    assert first[0]["name"] == pack.pack.name and first[0]["control_count"] == len(pack.controls) and first[0]["hash"] == pack.hash
+
+    # A fresh process is served from the persisted index without reading any pack file.
+    opened = []
+    real_open = Path.open
+    monkeypatch.setattr(Path, "open", lambda self, *a, **kw: (reg.paths.packs_dir in self.parents and opened.append(self.name)) or real_open(self, *a, **kw))
+    assert PackCatalog(tmp_path / "catalog").list_packs(reg) == first
+    assert opened == []
+
+    # Only the controls file that changed is parsed again.
+    parsed = []
+    monkeypatch.setattr("truststack_grc.core.packs.catalog.read_yaml", lambda path: parsed.append(path.name) or read_yaml(path))
+    (reg.paths.packs_dir / "governance" / "eu-ai-act" / "2024-1689" / "controls" / "extra.yaml").write_text("controls: []\n", encoding="utf-8")
+    changed = PackCatalog(tmp_path / "catalog").list_packs(reg)
+    assert changed[0]["hash"] != first[0]["hash"] and changed[0]["control_count"] == first[0]["control_count"]
+    assert parsed == ["pack.yaml", "extra.yaml"]
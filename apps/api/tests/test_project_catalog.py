@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from truststack_grc.core.projects.service import ProjectService
+from truststack_grc.core.storage.base import StoragePaths
+from truststack_grc.core.storage.catalog import InvalidCursor, ProjectQuery
+from truststack_grc.core.storage.db import DatabaseReplaced
+from truststack_grc.core.storage.filesystem import FileSystemStorage
+from truststack_grc.core.storage.sqlite import SQLiteStorage
+from tests.helpers import collect_pages
+
+def _pages(storage, **kw):
+    return collect_pages(lambda cursor: storage.query_projects(ProjectQuery(limit=2, cursor=cursor, **kw)))
+
+def test_catalog_tracks_writes_and_pages_with_cursors(storage, project_request):
+    service = ProjectService(storage)
+    ids = [service.create_project({**project_request, "name": f"Claims {n}"}, actor="a")["project_id"] for n in range(5)]
+
+    by_name = _pages(storage, sort="name", order="asc")
+    assert [p["id"] for p in by_name] == ids and by_name[0]["name"] == "Claims 0"
+    assert by_name[0]["deployment_environment"] == "AWS Native" and by_name[0]["counts"]["total"] > 0
+    assert [p["id"] for p in _pages(storage, q="claims 3")] == [ids[3]]
+    assert _pages(storage, deployment_environment="GCP Native") == []
+
+    item_id = storage.read_checklist(ids[1])["items"][0]["item_id"]
+    service.update_checklist_item(ids[1], item_id, {"status": "implemented"}, actor="a")
+    newest = storage.query_projects(ProjectQuery(limit=1))[0][0]
+    assert newest["id"] == ids[1] and newest["counts"]["by_status"]["implemented"] == 1
+    service.update_project(ids[2], {"name": "Renamed"}, actor="a")
+    assert [p["name"] for p in _pages(storage, sort="name", order="desc")][0] == "Renamed"
+
+    service.delete_project(ids[0], actor="a")
+    assert [p["id"] for p in _pages(storage, sort="created_at", order="asc")] == ids[1:]
+    with pytest.raises(InvalidCursor):
+        storage.query_projects(ProjectQuery(cursor="bogus"))
+
+    if isinstance(storage, FileSystemStorage):
+        expected = _pages(storage)
+        with storage.catalog.write() as conn:
+            conn.execute("DELETE FROM project_catalog")
+        assert _pages(storage) == expected
+
+def test_deleted_catalog_file_is_rebuilt_in_a_running_process(tmp_path, project_request):
+    storage = FileSystemStorage(StoragePaths(workspace_root=tmp_path))
+    service = ProjectService(storage)
+    ids = [service.create_project({**project_request, "name": f"Rebuilt {n}"}, actor="a")["project_id"] for n in range(2)]
+    assert {p["id"] for p in _pages(storage)} == set(ids)
+
+    for path in tmp_path.glob(".catalog.sqlite3*"):
+        path.unlink()
+    # Same thread (cached connection to the deleted file) and a thread that opens a new one.
+    assert {p["id"] for p in _pages(storage)} == set(ids)
+    result: list = []
+    thread = threading.Thread(target=lambda: result.append(_pages(storage)))
+    thread.start()
+    thread.join()
+    assert {p["id"] for p in result[0]} == set(ids)
+
+def test_deleted_primary_database_fails_instead_of_starting_over(tmp_path, project_request):
+    storage = SQLiteStorage(StoragePaths(workspace_root=tmp_path), db_path=tmp_path / "t.sqlite3")
+    ProjectService(storage).create_project(project_request, actor="a")
+    for path in tmp_path.glob("t.sqlite3*"):
+        path.unlink()
+    with pytest.raises(DatabaseReplaced):
+        storage.list_projects()
+    result: list = []
+    thread = threading.Thread(target=lambda: result.append(pytest.raises(DatabaseReplaced, storage.list_projects)))
+    thread.start()
+    thread.join()
+    assert result and not (tmp_path / "t.sqlite3").exists()
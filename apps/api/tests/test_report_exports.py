@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.reporting import service as reporting
+from truststack_grc.core.reporting.cache import ReportArtifactCache, report_cache
+from truststack_grc.core.projects.service import ProjectService
+from truststack_grc.core.reporting.service import ChecklistChanged, ReportingService
+from truststack_grc.core.storage.factory import get_storage
+from truststack_grc.main import app
+
+client = TestClient(app)
+
+def test_streamed_exports_match_the_documents(monkeypatch, project_request):
+    monkeypatch.setattr(reporting, "STREAM_PAGE", 2)
+    project_id = client.post("/api/projects", json={**project_request, "name": "Streamed export"}).json()["project_id"]
+    item_id = client.get(f"/api/projects/{project_id}/checklist").json()["items"][0]["item_id"]
+    client.patch(f"/api/projects/{project_id}/checklist/{item_id}", json={"status": "implemented"})
+    expected = ReportingService(get_storage()).export_json(project_id)
+
+    res = client.get(f"/api/reports/{project_id}", params={"format": "json"})
+    assert res.status_code == 200 and res.json() == expected
+
+    res = client.get(f"/api/reports/{project_id}", params={"format": "ndjson"})
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in res.text.splitlines()] == expected["checklist"]["items"]
+
+    streamed = client.get(f"/api/reports/{project_id}", params={"format": "csv"})
+    persisted = client.get(f"/api/reports/{project_id}", params={"format": "csv", "persist": "true"})
+    assert streamed.text == persisted.text
+    rows = list(csv.reader(io.StringIO(streamed.text)))
+    assert rows[0][0] == "item_id" and [r[0] for r in rows[1:]] == [it["item_id"] for it in expected["checklist"]["items"]]
+    assert (get_storage().project_dir(project_id) / "exports" / f"{project_id}.csv").exists()
+
+    for fmt in ("json", "csv", "ndjson"):
+        assert client.get("/api/reports/missing", params={"format": fmt}).status_code == 404
+
+def test_streamed_exports_refuse_to_mix_revisions(monkeypatch, project_request):
+    monkeypatch.setattr(reporting, "STREAM_PAGE", 1)
+    project_id = client.post("/api/projects", json={**project_request, "name": "Mixed revisions"}).json()["project_id"]
+    storage = get_storage()
+    items = storage.read_checklist(project_id)["items"]
+    assert len(items) > 1
+    for stream in (ReportingService.stream_ndjson, ReportingService.stream_csv, ReportingService.stream_json):
+        chunks = stream(ReportingService(storage), project_id)
+        next(chunks)
+        ProjectService(storage).update_checklist_item(project_id, items[-1]["item_id"], {"notes": stream.__name__}, actor="a")
+        with pytest.raises(ChecklistChanged):
+            list(chunks)
+
+def test_report_artifacts_are_cached_until_the_project_changes(monkeypatch, project_request):
+    project_id = client.post("/api/projects", json={**project_request, "name": "Cached report"}).json()["project_id"]
+    url = f"/api/reports/{project_id}"
+    first = client.get(url, params={"format": "html"})
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and "Cached report" in first.text
+    assert client.get(url, params={"format": "html"}, headers={"If-None-Match": etag}).status_code == 304
+    csv_first = client.get(url, params={"format": "csv"})
+
+    monkeypatch.setattr(ReportingService, "_load", lambda *_: pytest.fail("report rebuilt"))
+    monkeypatch.setattr(ReportingService, "stream_csv", lambda *_: pytest.fail("report rebuilt"))
+    again = client.get(url, params={"format": "html"})
+    assert again.text == first.text and again.headers["etag"] == etag
+    cached_csv = client.get(url, params={"format": "csv"})
+    assert cached_csv.text == csv_first.text and cached_csv.headers["etag"] == csv_first.headers["etag"]
+    monkeypatch.undo()
+
+    item_id = client.get(f"/api/projects/{project_id}/checklist").json()["items"][0]["item_id"]
+    client.patch(f"/api/projects/{project_id}/checklist/{item_id}", json={"status": "implemented"})
+    changed = client.get(url, params={"format": "html"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert len(list((report_cache.root / project_id).glob("html-*"))) == 1
+    client.delete(f"/api/projects/{project_id}")
+    assert not (report_cache.root / project_id).exists()
+
+def test_html_report_streams_from_the_shared_precompiled_environment(monkeypatch, project_request):
+    assert any((get_settings().cache_root / "jinja").iterdir())
+    assert ReportingService(get_storage()).env is reporting.report_env
+    monkeypatch.setattr(reporting, "STREAM_PAGE", 2)
+    project_id = client.post("/api/projects", json={**project_request, "name": "Streamed html"}).json()["project_id"]
+    expected = ReportingService(get_storage()).render_html(project_id)
+    res = client.get(f"/api/reports/{project_id}", params={"format": "html"})
+    assert res.status_code == 200 and res.text == expected
+    assert client.get(f"/api/reports/{project_id}", params={"format": "html"}).text == expected
+
+def test_slow_artifact_never_replaces_a_newer_one(tmp_path):
+    cache = ReportArtifactCache(tmp_path)
+    cache.store("p", "csv", "old", lambda path: path.write_text("old"))
+    slow = cache.tee("p", "csv", "stale", iter(["a", "b"]), still_current=lambda: False)
+    next(slow)
+    cache.store("p", "csv", "new", lambda path: path.write_text("new"))
+    assert b"".join(slow) == b"b"
+    assert cache.get("p", "csv", "stale") is None and cache.get("p", "csv", "new").read_text() == "new"
+
+    # Published while another artifact was in progress: not one that artifact supersedes.
+    current = cache.tee("p", "csv", "current", iter(["c"]))
+    next(current)
+    cache.store("p", "csv", "later", lambda path: path.write_text("later"))
+    list(current)
+    assert cache.get("p", "csv", "current") and cache.get("p", "csv", "later")
+    assert cache.get("p", "csv", "old") is None and cache.get("p", "csv", "new") is None
+
+def test_html_report_is_not_cached_when_the_checklist_changes_mid_stream(monkeypatch, project_request):
+    monkeypatch.setattr(reporting, "STREAM_PAGE", 1)
+    project_id = client.post("/api/projects", json={**project_request, "name": "Html mid-stream"}).json()["project_id"]
+    storage = get_storage()
+    item_id = storage.read_checklist(project_id)["items"][-1]["item_id"]
+    service = ReportingService(storage)
+    key = service.artifact_key(project_id, "html")
+    real = type(storage).query_checklist
+
+    def query_checklist(self, pid, query):
+        if query.cursor:  # an edit lands between two pages
+            ProjectService(self).update_checklist_item(pid, item_id, {"notes": "edited"}, actor="a")
+        return real(self, pid, query)
+
+    monkeypatch.setattr(type(storage), "query_checklist", query_checklist)
+    body = report_cache.tee(project_id, "html", key, service.stream_html(project_id), still_current=lambda: service.artifact_key(project_id, "html") == key)
+    with pytest.raises(ChecklistChanged):
+        list(body)
+    assert report_cache.get(project_id, "html", key) is None
@@ -9,3 +9,35 @@ def test_rules_in():
     ctx = {"jurisdiction": {"list": ["EU", "US"]}}
     ok, _ = eval_rule({"in": ["EU", "jurisdiction.list"]}, ctx)
     assert ok
+
+def test_compiled_rules_match_interpreter():
+    import pytest
+    from truststack_grc.core.mapping.compiler import compile_rule
+
+    ctx = {
+        "tags": ["llm", "rag"],
+        "data": {"phi": True, "pii": False},
+        "jurisdiction": {"list": ["EU", "US"], "eu": True},
+        "model": {"sourcing": "api"},
+        "system": {"name": "x"},
+    }
+    rules = [
+        None,
+        {},
+        {"all": [{"has_tag": "llm"}, {"equals": ["data.phi", True]}, {"in": ["EU", "jurisdiction.list"]}]},
+        {"all": [{"has_tag": "llm"}, {"has_tag": "nope"}]},
+        {"any": [{"equals": ["model.sourcing", "open_source"]}, {"exists": "system.name"}]},
+        {"not": {"contains": ["tags", "rag"]}},
+        {"not": {"equals": ["data.pii", True]}},
+        {"contains": ["system.name", "x"]},
+        {"exists": "missing.path"},
+        {"in": ["A", "model.sourcing"]},
+    ]
+    for rule in rules:
+        expected = eval_rule(rule, ctx)
+        got = compile_rule(rule).evaluate(ctx)
+        assert (got[0], got[1].matched) == (expected[0], expected[1].matched)
+
+    for bad in [{"equals": ["a"]}, {"bogus": 1}, {"all": [{"equals": [1, 2, 3]}]}, {"any": {"has_tag": "x"}}]:
+        with pytest.raises(ValueError):
+            compile_rule(bad)
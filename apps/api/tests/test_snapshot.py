@@ -0,0 +1,34 @@
+from truststack_grc.config import get_settings
+from truststack_grc.core.packs.loader import PackPaths, PackRegistry
+from truststack_grc.core.snapshot.artifact import open_snapshot
+from truststack_grc.core.snapshot.builder import build_registry_snapshot
+from truststack_grc.core.taxonomy.loader import TaxonomyLoader, TaxonomyPaths
+
+def test_snapshot_matches_yaml_tree(tmp_path):
+    settings = get_settings()
+    schema_dir = settings.config_root.parent / "schemas"
+    out = tmp_path / "registry.snapshot"
+    res = build_registry_snapshot(settings.config_root, schema_dir, out)
+    assert not res.errors and res.packs > 0
+
+    snap = open_snapshot(out)
+    packs_root = settings.config_root / "packs"
+    from_yaml = PackRegistry(PackPaths(root=packs_root, packs_dir=packs_root), schema_dir, cache=None)
+    from_snap = PackRegistry(PackPaths(root=packs_root, packs_dir=packs_root), schema_dir, snapshot=snap)
+    assert from_snap.list_packs() == from_yaml.list_packs()
+    pack = from_snap.load_pack("governance", "eu-ai-act", "2024-1689")
+    assert pack.model_dump() == from_yaml.load_pack("governance", "eu-ai-act", "2024-1689").model_dump()
+    assert from_snap.load_pack("governance", "eu-ai-act", "missing") is None
+
+    tax_root = settings.config_root / "taxonomy"
+    paths = TaxonomyPaths(root=tax_root, industries_dir=tax_root / "industries")
+    assert TaxonomyLoader(paths, schema_dir, snapshot=snap).list_industries() == TaxonomyLoader(paths, schema_dir).list_industries()
+
+def test_snapshot_documents_are_not_shared_between_readers(tmp_path):
+    settings = get_settings()
+    out = tmp_path / "registry.snapshot"
+    assert not build_registry_snapshot(settings.config_root, settings.config_root.parent / "schemas", out).errors
+    snap = open_snapshot(out)
+    snap.get("packs:list")[0]["name"] = "changed"
+    snap.get("taxonomy:industries").clear()
+    assert snap.get("packs:list")[0]["name"] != "changed" and snap.get("taxonomy:industries")
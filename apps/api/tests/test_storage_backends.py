@@ -0,0 +1,49 @@
+import asyncio
+import io
+
+from starlette.datastructures import UploadFile
+
+from truststack_grc.core.projects.service import ProjectService
+from truststack_grc.core.storage.base import StoragePaths
+from truststack_grc.core.storage.filesystem import FileSystemStorage
+from truststack_grc.core.storage.migrate import migrate_storage
+from truststack_grc.core.storage.sqlite import SQLiteStorage
+
+def _exercise(storage, request: dict) -> str:
+    service = ProjectService(storage)
+    project_id = service.create_project(request, actor="alice")["project_id"]
+    item_id = storage.read_checklist(project_id)["items"][1]["item_id"]
+    service.update_checklist_item(project_id, item_id, {"status": "in_progress", "owner": "bob"}, actor="alice")
+    upload = UploadFile(io.BytesIO(b"evidence"), filename="policy.pdf")
+    asyncio.run(service.add_evidence(project_id, item_id, upload, actor="alice"))
+    return project_id
+
+def _strip(doc: dict) -> dict:
+    # Drop wall-clock fields that differ between two runs.
+    out = {k: v for k, v in doc.items() if k not in ("generated_at", "project_id")}
+    if "items" in out:
+        out["items"] = [{**it, "evidence": [{k: v for k, v in e.items() if k != "uploaded_at"} for e in it["evidence"]]} for it in out["items"]]
+    return out
+
+def test_sqlite_storage_matches_filesystem_and_migrates(tmp_path, project_request):
+    fs = FileSystemStorage(StoragePaths(workspace_root=tmp_path / "fs"))
+    db = SQLiteStorage(StoragePaths(workspace_root=tmp_path / "db"), db_path=tmp_path / "db" / "t.sqlite3")
+    fs_id, db_id = _exercise(fs, project_request), _exercise(db, project_request)
+
+    assert _strip(db.read_checklist(db_id)) == _strip(fs.read_checklist(fs_id))
+    item = db.read_checklist(db_id)["items"][1]
+    assert item["status"] == "in_progress" and item["evidence"][0]["file_name"] == "policy.pdf"
+    assert db.read_checklist_item(db_id, item["item_id"]) == item
+    assert [e["event_type"] for e in db.read_audit(db_id)] == [e["event_type"] for e in fs.read_audit(fs_id)]
+    assert [p["id"] for p in db.list_projects()] == [db_id]
+
+    target = SQLiteStorage(StoragePaths(workspace_root=tmp_path / "fs"), db_path=tmp_path / "migrated.sqlite3")
+    for _ in range(2):
+        res = migrate_storage(fs, target)
+        assert res.errors == [] and res.projects == 1
+    assert target.read_project(fs_id) == fs.read_project(fs_id)
+    # Migration writes the checklist as a new revision of its own.
+    assert {**target.read_checklist(fs_id), "revision": 0} == {**fs.read_checklist(fs_id), "revision": 0}
+    assert target.read_audit(fs_id) == fs.read_audit(fs_id)
+
+    assert db.delete_project(db_id) and db.read_checklist(db_id) is None and db.list_projects() == []
@@ -0,0 +1,37 @@
+import os
+import shutil
+from pathlib import Path
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.storage.hashing import sha256_text
+from truststack_grc.core.taxonomy.loader import TaxonomyLoader, TaxonomyPaths
+
+def _loader(root: Path) -> TaxonomyLoader:
+    return TaxonomyLoader(TaxonomyPaths(root=root, industries_dir=root / "industries"), get_settings().config_root.parent / "schemas")
+
+def test_taxonomy_model_is_indexed_and_refreshed_on_change(tmp_path):
+    shutil.copytree(get_settings().config_root / "taxonomy", tmp_path, dirs_exist_ok=True)
+    model = _loader(tmp_path).model()
+    assert _loader(tmp_path).model() is model
+    assert model.tree_hash == sha256_text(str(model.industries))
+
+    for industry in model.industries:
+        assert _loader(tmp_path).get_industry(industry["id"]) == industry
+        for segment in industry["segments"]:
+            for uc in segment["use_cases"]:
+                got = _loader(tmp_path).get_use_case(uc["id"])
+                assert got["industry"]["id"] == industry["id"] and got["segment"]["id"] == segment["id"]
+                assert {k: v for k, v in got.items() if k not in ("industry", "segment")} == uc
+    assert _loader(tmp_path).get_use_case("nope") is None
+
+    # Callers get copies; the shared model is unaffected by what they do with them.
+    listed = _loader(tmp_path).list_industries()
+    listed[0]["segments"].clear()
+    _loader(tmp_path).get_industry(listed[0]["id"])["name"] = "changed"
+    assert _loader(tmp_path).list_industries() == model.industries and model.industries[0]["segments"]
+
+    uc_file = next(tmp_path.rglob("use_case.yaml"))
+    uc_file.write_text(uc_file.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+    st = uc_file.stat()
+    os.utime(uc_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert _loader(tmp_path).model() is not model
@@ -0,0 +1,61 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from truststack_grc.core.storage.base import ChangeSet
+from truststack_grc.core.storage.writes import WriteCoordinator
+from truststack_grc.main import app
+
+def _seed(storage):
+    storage.write_project("p", {"project": {"id": "p", "name": "P", "updated_at": "2026-01-01T00:00:00+00:00"}}, create=True)
+    items = [{"item_id": f"i{n}", "status": "not_started", "notes": "", "evidence": []} for n in range(4)]
+    return storage.write_checklist("p", {"project_id": "p", "items": items})
+
+def test_concurrent_changes_are_coalesced_without_lost_updates(storage):
+    base = _seed(storage)
+    coordinator = WriteCoordinator()
+    start = threading.Barrier(16)
+
+    def worker(n: int) -> None:
+        start.wait()
+        for k in range(5):
+            append = lambda item, tag=f"{n}.{k}": item.update(notes=item["notes"] + tag + ";")
+            assert coordinator.submit(storage, "p", ChangeSet([(f"i{n % 4}", append)]), updated_at=f"2026-02-01T00:00:{n:02d}+00:00")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    checklist = storage.read_checklist("p")
+    assert checklist["revision"] == base + 80
+    for n in range(4):
+        notes = checklist["items"][n]["notes"].split(";")[:-1]
+        assert sorted(notes) == sorted(f"{w}.{k}" for w in range(n, 16, 4) for k in range(5))
+    assert coordinator.stats()["changesets"] == 80
+    assert storage.read_project("p")["project"]["updated_at"] == "2026-02-01T00:00:15+00:00"
+
+    stale = ChangeSet([("i0", lambda item: item.update(status="implemented"))], expected_revision=base)
+    assert coordinator.submit(storage, "p", stale) and stale.conflict and stale.revision == base + 80
+    assert storage.read_checklist("p")["items"][0]["status"] == "not_started"
+
+def test_checklist_item_patch_honours_if_match(project_request):
+    client = TestClient(app)
+    project_id = client.post("/api/projects", json=project_request).json()["project_id"]
+    res = client.get(f"/api/projects/{project_id}/checklist")
+    etag, item_id = res.headers["etag"], res.json()["items"][0]["item_id"]
+    assert client.get(f"/api/projects/{project_id}/checklist", headers={"If-None-Match": etag}).status_code == 304
+
+    url = f"/api/projects/{project_id}/checklist/{item_id}"
+    ok = client.patch(url, json={"status": "in_progress"}, headers={"If-Match": etag})
+    assert ok.status_code == 200 and ok.json()["status"] == "in_progress" and ok.headers["etag"] != etag
+    stale = client.patch(url, json={"status": "implemented"}, headers={"If-Match": etag})
+    assert stale.status_code == 412 and stale.headers["etag"] == ok.headers["etag"]
+    assert client.patch(url, json={"owner": "bob"}, headers={"If-Match": "nonsense"}).status_code == 412
+    current = ok.headers["etag"]
+    assert client.patch(url, json={"owner": "bob"}, headers={"If-Match": f"W/{current}"}).status_code == 412
+    listed = client.patch(url, json={"owner": "carol"}, headers={"If-Match": f'{etag}, "other", {current}'})
+    assert listed.status_code == 200 and listed.json()["owner"] == "carol"
+    assert client.patch(url, json={"owner": "bob"}).status_code == 200
+    assert client.get(f"/api/projects/{project_id}/checklist").json()["items"][0]["status"] == "in_progress"
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Any, Callable
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from truststack_grc.config import get_settings
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison.
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def revision_etag(revision: int) -> str:
+    return f'"rev-{revision}"'
+
+def parse_if_match(if_match: str | None) -> tuple[int, ...] | None:
+    """Checklist revisions an If-Match header accepts; None when absent or `*`.
+
+    If-Match uses strong comparison: weak tags and tags that are not our
+    revision ETags match nothing. Raises ValueError for a malformed header.
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+    revisions: list[int] = []
+    for raw in if_match.split(","):
+        tag = raw.strip()
+        weak = tag.startswith("W/")
+        tag = tag.removeprefix("W/")
+        if len(tag) < 2 or not (tag.startswith('"') and tag.endswith('"')):
+            raise ValueError(f"Unrecognized If-Match: {if_match}")
+        if not weak and tag.startswith('"rev-') and tag[5:-1].isdigit():
+            revisions.append(int(tag[5:-1]))
+    return tuple(revisions)
+
+class RenderedCache:
+    """Rendered JSON bodies of read-only catalog endpoints with their strong ETags.
+
+    Each entry is stamped with the stat signature of the registry files it was
+    built from. While that signature holds, a request is answered from the
+    cached bytes (or with a 304) without loading or serializing anything. The
+    signature itself stats every source file, so it is re-taken at most once
+    per `catalog_max_age`, the staleness clients already accept.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[Any, str, bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def respond(self, request: Request, key: str, signature: Callable[[], Any], build: Callable[[], tuple[Any, str | None]]) -> Response:
+        """`signature()` stamps the sources; `build` returns (document, content hash or None to hash the rendered body)."""
+        settings = get_settings()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and now - entry[3] < settings.catalog_max_age:
+            _, etag, body, _ = entry
+        else:
+            sig = (settings.generator_version, signature())
+            if entry is not None and entry[0] == sig:
+                _, etag, body, _ = entry
+            else:
+                data, content_hash = build()
+                body = JSONResponse(jsonable_encoder(data)).body
+                seed = content_hash if content_hash is not None else hashlib.sha256(body).hexdigest()
+                etag = '"' + hashlib.sha256(f"{settings.generator_version}:{key}:{seed}".encode("utf-8")).hexdigest()[:32] + '"'
+            with self._lock:
+                self._entries[key] = (sig, etag, body, now)
+
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.catalog_max_age}, must-revalidate"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+catalog_responses = RenderedCache()
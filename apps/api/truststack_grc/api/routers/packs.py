@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
+from truststack_grc.api.caching import catalog_responses
 from truststack_grc.core.packs.loader import PackRegistry
 
 router = APIRouter()
 
 @router.get("")
-def list_packs():
+def list_packs(request: Request):
     reg = PackRegistry.from_env()
-    return {"packs": reg.list_packs()}
+    return catalog_responses.respond(request, "packs", reg.source_signature, lambda: ({"packs": reg.list_packs()}, None))
 
 @router.get("/{domain}/{pack_id}")
 def list_pack_versions(domain: str, pack_id: str):
@@ -20,9 +21,13 @@ def list_pack_versions(domain: str, pack_id: str):
     return {"domain": domain, "pack_id": pack_id, "versions": versions}
 
 @router.get("/{domain}/{pack_id}/{version}")
-def get_pack(domain: str, pack_id: str, version: str):
+def get_pack(domain: str, pack_id: str, version: str, request: Request):
     reg = PackRegistry.from_env()
-    pack = reg.load_pack(domain=domain, pack_id=pack_id, version=version)
-    if not pack:
-        raise HTTPException(status_code=404, detail="Pack version not found")
-    return pack.model_dump()
+
+    def build():
+        pack = reg.load_pack(domain=domain, pack_id=pack_id, version=version)
+        if not pack:
+            raise HTTPException(status_code=404, detail="Pack version not found")
+        return pack.model_dump(), pack.hash
+
+    return catalog_responses.respond(request, f"pack:{domain}/{pack_id}/{version}", lambda: reg.source_signature(domain, pack_id, version), build)
@@ -2,11 +2,17 @@ from __future__ import annotations
 
 from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Header
+from fastapi import APIRouter, HTTPException, UploadFile, File, Header, Query, Response
 from pydantic import BaseModel, Field
 
+from truststack_grc.api.caching import etag_matches, parse_if_match, revision_etag
 from truststack_grc.core.projects.service import ProjectService
-from truststack_grc.core.storage.filesystem import FileSystemStorage
+from truststack_grc.core.storage.auditlog import AuditQuery, normalize_ts
+from truststack_grc.core.storage.base import ProjectNotFound, RevisionConflict
+from truststack_grc.core.storage.catalog import InvalidCursor, ProjectQuery
+from truststack_grc.core.storage.checklist_query import ChecklistQuery
+from truststack_grc.core.storage.factory import get_storage
+from truststack_grc.core.storage.uploads import UploadTooLarge
 
 router = APIRouter()
 
@@ -34,36 +40,110 @@ class PatchProjectRequest(BaseModel):
     selected_packs: list[SelectedPack] | None = None
 
 @router.get("")
-def list_projects():
-    storage = FileSystemStorage.from_env()
-    return {"projects": storage.list_projects()}
+def list_projects(
+    q: str | None = None,
+    industry_id: str | None = None,
+    segment_id: str | None = None,
+    use_case_id: str | None = None,
+    deployment_environment: str | None = None,
+    sort: Literal["updated_at", "created_at", "name", "items_total"] = "updated_at",
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = None,
+):
+    storage = get_storage()
+    query = ProjectQuery(
+        q=q, industry_id=industry_id, segment_id=segment_id, use_case_id=use_case_id,
+        deployment_environment=deployment_environment, sort=sort, order=order, limit=limit, cursor=cursor,
+    )
+    try:
+        projects, next_cursor = storage.query_projects(query)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"projects": projects, "next_cursor": next_cursor}
 
 @router.get("/{project_id}")
 def get_project(project_id: str):
-    storage = FileSystemStorage.from_env()
+    storage = get_storage()
     proj = storage.read_project(project_id)
     if not proj:
         raise HTTPException(status_code=404, detail="Project not found")
     return proj
 
 @router.get("/{project_id}/checklist")
-def get_checklist(project_id: str):
-    storage = FileSystemStorage.from_env()
-    checklist = storage.read_checklist(project_id)
+def get_checklist(
+    project_id: str,
+    response: Response,
+    status: list[str] = Query(default=[]),
+    domain: list[str] = Query(default=[]),
+    severity: list[str] = Query(default=[]),
+    category: list[str] = Query(default=[]),
+    owner: list[str] = Query(default=[]),
+    fields: str | None = Query(default=None, description="Comma-separated item fields to return (item_id is always included)"),
+    sort: Literal["position", "severity", "status", "domain", "title", "owner"] | None = None,
+    order: Literal["asc", "desc"] = "asc",
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    cursor: str | None = None,
+    if_none_match: str | None = Header(default=None),
+):
+    storage = get_storage()
+    # Without query parameters: the whole document, as before.
+    paged = any([status, domain, severity, category, owner, fields, sort, limit, cursor])
+    if paged:
+        query = ChecklistQuery(
+            status=tuple(status), domain=tuple(domain), severity=tuple(severity), category=tuple(category), owner=tuple(owner),
+            fields=tuple(f.strip() for f in (fields or "").split(",") if f.strip()),
+            sort=sort or "position", order=order, limit=limit or 100, cursor=cursor,
+        )
+        try:
+            checklist = storage.query_checklist(project_id, query)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        checklist = storage.read_checklist(project_id)
     if not checklist:
         raise HTTPException(status_code=404, detail="Checklist not found")
+    etag = revision_etag(checklist.get("revision", 0))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return checklist
 
+@router.get("/{project_id}/audit")
+def get_audit(
+    project_id: str,
+    since: str | None = None,
+    until: str | None = None,
+    event_type: list[str] = Query(default=[]),
+    limit: int = Query(default=500, ge=1, le=5000),
+    cursor: str | None = None,
+):
+    storage = get_storage()
+    if not storage.read_project(project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    try:
+        query = AuditQuery(
+            since=normalize_ts(since) if since else None,
+            until=normalize_ts(until) if until else None,
+            event_types=tuple(event_type),
+            limit=limit,
+            cursor=cursor,
+        )
+        events, next_cursor = storage.query_audit(project_id, query)
+    except ValueError as e:  # bad timestamp or InvalidCursor
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"events": events, "next_cursor": next_cursor}
+
 @router.post("")
 def create_project(req: CreateProjectRequest, x_user: str | None = Header(default=None)):
-    storage = FileSystemStorage.from_env()
+    storage = get_storage()
     service = ProjectService(storage=storage)
     created = service.create_project(req.model_dump(), actor=x_user or "anonymous")
     return created
 
 @router.patch("/{project_id}")
 def patch_project(project_id: str, req: PatchProjectRequest, x_user: str | None = Header(default=None)):
-    storage = FileSystemStorage.from_env()
+    storage = get_storage()
     service = ProjectService(storage=storage)
     patch = req.model_dump(exclude_unset=True)
     if not patch:
@@ -79,13 +159,17 @@ def patch_project(project_id: str, req: PatchProjectRequest, x_user: str | None
         updated = service.update_project(project_id, patch, actor=x_user or "anonymous")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except RevisionConflict:
+        raise HTTPException(status_code=409, detail="Checklist is being edited concurrently; retry")
+    except ProjectNotFound:
+        updated = None  # deleted while being updated
     if not updated:
         raise HTTPException(status_code=404, detail="Project not found")
     return updated
 
 @router.delete("/{project_id}")
 def delete_project(project_id: str, x_user: str | None = Header(default=None)):
-    storage = FileSystemStorage.from_env()
+    storage = get_storage()
     service = ProjectService(storage=storage)
     deleted = service.delete_project(project_id, actor=x_user or "anonymous")
     if not deleted:
@@ -97,20 +181,71 @@ class PatchChecklistItemRequest(BaseModel):
     owner: str | None = None
     notes: str | None = None
 
+class BulkChecklistItemPatch(PatchChecklistItemRequest):
+    item_id: str
+
+class BulkPatchChecklistRequest(BaseModel):
+    items: list[BulkChecklistItemPatch] = Field(..., min_length=1, max_length=1000)
+
+@router.patch("/{project_id}/checklist")
+def patch_checklist(
+    project_id: str,
+    req: BulkPatchChecklistRequest,
+    response: Response,
+    x_user: str | None = Header(default=None),
+    if_match: str | None = Header(default=None),
+):
+    storage = get_storage()
+    service = ProjectService(storage=storage)
+    try:
+        expected = parse_if_match(if_match)
+    except ValueError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    patches = [item.model_dump(exclude_none=True) for item in req.items]
+    try:
+        res = service.update_checklist_items(project_id, patches, actor=x_user or "anonymous", expected_revision=expected)
+    except RevisionConflict as e:
+        raise HTTPException(status_code=412, detail=str(e), headers={"ETag": revision_etag(e.revision)})
+    if not res:
+        raise HTTPException(status_code=404, detail="Project or checklist not found")
+    response.headers["ETag"] = revision_etag(res["revision"])
+    return res
+
 @router.patch("/{project_id}/checklist/{item_id}")
-def patch_checklist_item(project_id: str, item_id: str, req: PatchChecklistItemRequest, x_user: str | None = Header(default=None)):
-    storage = FileSystemStorage.from_env()
+def patch_checklist_item(
+    project_id: str,
+    item_id: str,
+    req: PatchChecklistItemRequest,
+    response: Response,
+    x_user: str | None = Header(default=None),
+    if_match: str | None = Header(default=None),
+):
+    storage = get_storage()
     service = ProjectService(storage=storage)
-    updated = service.update_checklist_item(project_id, item_id, req.model_dump(exclude_none=True), actor=x_user or "anonymous")
+    try:
+        expected = parse_if_match(if_match)
+    except ValueError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    try:
+        updated = service.update_checklist_item(
+            project_id, item_id, req.model_dump(exclude_none=True), actor=x_user or "anonymous", expected_revision=expected
+        )
+    except RevisionConflict as e:
+        raise HTTPException(status_code=412, detail=str(e), headers={"ETag": revision_etag(e.revision)})
     if not updated:
         raise HTTPException(status_code=404, detail="Project or item not found")
-    return updated
+    item, revision = updated
+    response.headers["ETag"] = revision_etag(revision)
+    return item
 
 @router.post("/{project_id}/evidence/{item_id}")
 async def upload_evidence(project_id: str, item_id: str, file: UploadFile = File(...), x_user: str | None = Header(default=None)):
-    storage = FileSystemStorage.from_env()
+    storage = get_storage()
     service = ProjectService(storage=storage)
-    res = await service.add_evidence(project_id, item_id, file, actor=x_user or "anonymous")
+    try:
+        res = await service.add_evidence(project_id, item_id, file, actor=x_user or "anonymous")
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     if not res:
         raise HTTPException(status_code=404, detail="Project or item not found")
     return res
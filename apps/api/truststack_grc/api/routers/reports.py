@@ -1,40 +1,71 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse
+from typing import Callable, Iterator
 
-from truststack_grc.core.reporting.service import ReportingService
-from truststack_grc.core.storage.filesystem import FileSystemStorage
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from truststack_grc.api.caching import etag_matches
+from truststack_grc.core.reporting.cache import report_cache
+from truststack_grc.core.reporting.service import ChecklistChanged, ReportingService
+from truststack_grc.core.storage.factory import get_storage
 
 router = APIRouter()
 
+_MEDIA_TYPES = {"html": "text/html; charset=utf-8", "csv": "text/csv", "pdf": "application/pdf"}
+
+def _chunks(stream: Callable[[str], Iterator[str] | None], project_id: str) -> Iterator[str]:
+    try:
+        chunks = stream(project_id)
+    except ChecklistChanged as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if chunks is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return chunks
+
 @router.get("/{project_id}")
-def export_report(project_id: str, format: str = "html"):
-    storage = FileSystemStorage.from_env()
+def export_report(project_id: str, format: str = "html", persist: bool = False, if_none_match: str | None = Header(default=None)):
+    # html, csv and pdf are served from the report artifact cache with an ETag; json and
+    # ndjson (and html/csv on a cache miss) are streamed as they are produced. `persist=true`
+    # writes csv/pdf to the project's exports folder and serves that file.
+    storage = get_storage()
     service = ReportingService(storage=storage)
 
-    if format == "html":
-        html = service.render_html(project_id)
-        if html is None:
-            raise HTTPException(status_code=404, detail="Project not found")
-        return HTMLResponse(content=html)
-
     if format == "json":
-        data = service.export_json(project_id)
-        if data is None:
-            raise HTTPException(status_code=404, detail="Project not found")
-        return data
+        return StreamingResponse(_chunks(service.stream_json, project_id), media_type="application/json")
 
-    if format == "csv":
-        path = service.export_csv(project_id)
-        if path is None:
-            raise HTTPException(status_code=404, detail="Project not found")
-        return FileResponse(path, filename=f"{project_id}.csv", media_type="text/csv")
+    if format == "ndjson":
+        chunks = _chunks(service.stream_ndjson, project_id)
+        headers = {"Content-Disposition": f'attachment; filename="{project_id}.ndjson"'}
+        return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
 
-    if format == "pdf":
-        path = service.export_pdf(project_id)
+    if format in ("csv", "pdf") and persist:
+        path = service.export_csv(project_id) if format == "csv" else service.export_pdf(project_id)
         if path is None:
             raise HTTPException(status_code=404, detail="Project not found")
-        return FileResponse(path, filename=f"{project_id}.pdf", media_type="application/pdf")
+        return FileResponse(path, filename=f"{project_id}.{format}", media_type=_MEDIA_TYPES[format])
+
+    if format not in _MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Unknown format. Use html|json|csv|ndjson|pdf")
 
-    raise HTTPException(status_code=400, detail="Unknown format. Use html|json|csv|pdf")
+    key = service.artifact_key(project_id, format)
+    if key is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    headers = {"ETag": f'"{key[:32]}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if format != "html":
+        headers["Content-Disposition"] = f'attachment; filename="{project_id}.{format}"'
+
+    path = report_cache.get(project_id, format, key)
+    if path is None and format in ("html", "csv"):
+        chunks = _chunks(service.stream_html if format == "html" else service.stream_csv, project_id)
+        body = report_cache.tee(project_id, format, key, chunks, still_current=lambda: service.artifact_key(project_id, format) == key)
+        return StreamingResponse(body, media_type=_MEDIA_TYPES[format], headers=headers)
+    if path is None:
+        built = service.build_artifact(project_id, format)
+        if built is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        key, path = built
+        headers["ETag"] = f'"{key[:32]}"'
+    return FileResponse(path, media_type=_MEDIA_TYPES[format], headers=headers)
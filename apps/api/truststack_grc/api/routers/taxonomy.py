@@ -1,28 +1,42 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
+from truststack_grc.api.caching import catalog_responses
 from truststack_grc.core.taxonomy.loader import TaxonomyLoader
 
 router = APIRouter()
 
 @router.get("/industries")
-def list_industries():
+def list_industries(request: Request):
     loader = TaxonomyLoader.from_env()
-    return {"industries": loader.list_industries()}
+
+    def build():
+        model = loader.model()
+        return {"industries": model.industries}, model.tree_hash
+
+    return catalog_responses.respond(request, "taxonomy:industries", loader.source_signature, build)
 
 @router.get("/industries/{industry_id}")
-def get_industry(industry_id: str):
+def get_industry(industry_id: str, request: Request):
     loader = TaxonomyLoader.from_env()
-    industry = loader.get_industry(industry_id)
-    if not industry:
-        raise HTTPException(status_code=404, detail="Industry not found")
-    return industry
+
+    def build():
+        industry = loader.get_industry(industry_id)
+        if not industry:
+            raise HTTPException(status_code=404, detail="Industry not found")
+        return industry, None
+
+    return catalog_responses.respond(request, f"taxonomy:industry:{industry_id}", loader.source_signature, build)
 
 @router.get("/use-cases/{use_case_id}")
-def get_use_case(use_case_id: str):
+def get_use_case(use_case_id: str, request: Request):
     loader = TaxonomyLoader.from_env()
-    uc = loader.get_use_case(use_case_id)
-    if not uc:
-        raise HTTPException(status_code=404, detail="Use case not found")
-    return uc
+
+    def build():
+        uc = loader.get_use_case(use_case_id)
+        if not uc:
+            raise HTTPException(status_code=404, detail="Use case not found")
+        return uc, None
+
+    return catalog_responses.respond(request, f"taxonomy:use_case:{use_case_id}", loader.source_signature, build)
@@ -1,11 +1,25 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import json
 import sys
 from pathlib import Path
+from typing import Any
 
+import yaml
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.mapping.batch import evaluate_batch
+from truststack_grc.core.mapping.engine import generate_checklist
 from truststack_grc.core.packs.loader import PackRegistry
+from truststack_grc.core.projects.context import build_context
+from truststack_grc.core.snapshot.artifact import open_snapshot
+from truststack_grc.core.snapshot.builder import build_registry_snapshot
+from truststack_grc.core.storage.factory import get_storage
+from truststack_grc.core.storage.migrate import migrate_storage
 from truststack_grc.core.taxonomy.loader import TaxonomyLoader
+from truststack_grc.core.util.yamlio import read_yaml
 
 def cmd_list_packs(_args: argparse.Namespace) -> int:
     reg = PackRegistry.from_env()
@@ -44,6 +58,143 @@ def cmd_lint_packs(args: argparse.Namespace) -> int:
                     print(f"ERR {domain}/{pack_id}/{version}: {e}", file=sys.stderr)
     return 0 if ok else 2
 
+def cmd_build_snapshot(args: argparse.Namespace) -> int:
+    settings = get_settings()
+    config_root = Path(args.root).resolve() if args.root else settings.config_root
+    out = Path(args.out).resolve()
+    res = build_registry_snapshot(config_root=config_root, schema_dir=config_root.parent / "schemas", out=out)
+    for err in res.errors:
+        print(f"ERR {err}", file=sys.stderr)
+    if res.errors:
+        return 2
+    snap = open_snapshot(out)
+    print(f"OK  {out}  packs={res.packs}  entries={res.entries}  bytes={out.stat().st_size}  format={snap.meta['format_version']}")
+    return 0
+
+def _parse_value(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def _read_scenarios(path: Path) -> list[dict[str, Any]]:
+    """Scenarios from a --scenarios file; raises ValueError describing what is wrong with it."""
+    try:
+        doc = read_yaml(path)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        raise ValueError(f"cannot read scenarios file {path}: {e}") from None
+    scenarios = doc.get("scenarios")
+    if not isinstance(scenarios, list) or not scenarios:
+        raise ValueError(f"{path}: expected a non-empty `scenarios` list")
+    for i, sc in enumerate(scenarios, 1):
+        if not isinstance(sc, dict) or not sc.get("use_case_id"):
+            raise ValueError(f"{path}: scenario {i} has no use_case_id")
+        if not isinstance(sc.get("scope_answers") or {}, dict):
+            raise ValueError(f"{path}: scenario {i}: scope_answers must be a mapping")
+    return scenarios
+
+def _what_if_scenarios(args: argparse.Namespace, tax: TaxonomyLoader) -> list[dict[str, Any]]:
+    if args.scenarios:
+        scenarios = _read_scenarios(Path(args.scenarios))
+    else:
+        # Default grid: every use case with its declared scope defaults.
+        scenarios = []
+        for ind in tax.list_industries():
+            for seg in ind.get("segments", []):
+                for uc in seg.get("use_cases", []):
+                    defaults = {q["id"]: q["default"] for q in uc.get("scope_questions", []) if "default" in q}
+                    scenarios.append({"name": uc["id"], "use_case_id": uc["id"], "scope_answers": defaults})
+    overrides = dict(kv.split("=", 1) for kv in args.set)
+    for sc in scenarios:
+        sc["scope_answers"] = {**(sc.get("scope_answers") or {}), **{k: _parse_value(v) for k, v in overrides.items()}}
+    return scenarios
+
+def cmd_what_if(args: argparse.Namespace) -> int:
+    for kv in args.set:
+        if "=" not in kv:
+            print(f"ERR bad --set {kv!r} (expected KEY=VALUE)", file=sys.stderr)
+            return 2
+    reg = PackRegistry.from_env()
+    tax = TaxonomyLoader.from_env()
+    try:
+        scenarios = _what_if_scenarios(args, tax)
+    except ValueError as e:
+        print(f"ERR {e}", file=sys.stderr)
+        return 2
+    if args.packs == "all":
+        selected = [(p["domain"], p["pack_id"], p["versions"][-1]) for p in reg.list_packs()]
+    else:
+        selected = []
+        for spec in args.packs.split(","):
+            domain, _, rest = spec.strip().partition("/")
+            pack_id, _, version = rest.partition("@")
+            if not version:
+                versions = reg.list_pack_versions(domain, pack_id)
+                if not versions:
+                    print(f"ERR unknown pack {domain}/{pack_id}", file=sys.stderr)
+                    return 2
+                version = versions[-1]
+            selected.append((domain, pack_id, version))
+    packs = []
+    for domain, pack_id, version in selected:
+        pack = reg.load_pack(domain=domain, pack_id=pack_id, version=version)
+        if not pack:
+            print(f"ERR unknown pack {domain}/{pack_id}@{version}", file=sys.stderr)
+            return 2
+        packs.append(pack)
+
+    names: list[str] = []
+    contexts: list[dict[str, Any]] = []
+    for i, sc in enumerate(scenarios):
+        uc = tax.get_use_case(sc["use_case_id"])
+        if not uc:
+            print(f"ERR unknown use case {sc['use_case_id']}", file=sys.stderr)
+            return 2
+        names.append(str(sc.get("name") or f"scenario-{i + 1}"))
+        contexts.append(build_context(
+            project_name=names[-1],
+            industry_id=uc["industry"]["id"],
+            segment_id=uc["segment"]["id"],
+            use_case=uc,
+            scope_answers=sc["scope_answers"],
+        ))
+
+    try:
+        res = evaluate_batch(contexts, packs)
+    except RuntimeError as e:
+        if args.matrix_out:
+            print(f"ERR {e}", file=sys.stderr)
+            return 2
+        # Without numpy, fall back to the scalar engine and skip explanation text.
+        print(f"scenarios={len(contexts)} packs={len(packs)} (scalar fallback: {e})")
+        for name, ctx in zip(names, contexts):
+            print(f"{name}: items={len(generate_checklist(ctx, packs, explain='none')['items'])}")
+        return 0
+    counts = res.checklist_counts()
+    applicable = res.applicable_controls()
+    print(f"scenarios={len(contexts)} controls={len(res.controls)} packs={len(packs)}")
+    for name, n_items, n_ctrls in zip(names, counts, applicable):
+        print(f"{name}: items={int(n_items)} applicable_controls={int(n_ctrls)}")
+
+    if args.matrix_out:
+        with open(args.matrix_out, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["scenario", *["/".join(c) for c in res.controls]])
+            for name, row in zip(names, res.matrix):
+                w.writerow([name, *[int(v) for v in row]])
+    return 0
+
+def cmd_migrate_storage(args: argparse.Namespace) -> int:
+    if args.source == args.target:
+        print("ERR --from and --to must differ", file=sys.stderr)
+        return 2
+    source, target = get_storage(args.source), get_storage(args.target)
+    res = migrate_storage(source, target, project_ids=args.project or None)
+    for err in res.errors:
+        print(f"ERR {err}", file=sys.stderr)
+    print(f"OK  {args.source} -> {args.target}  projects={res.projects}  items={res.items}  audit_events={res.audit_events}")
+    return 2 if res.errors else 0
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="truststack-grc", description="TrustStack AI GRC Workbench CLI")
     sub = p.add_subparsers(dest="cmd", required=True)
@@ -57,6 +208,24 @@ def build_parser() -> argparse.ArgumentParser:
     sl = sub.add_parser("lint-packs", help="Validate pack manifests and control files")
     sl.add_argument("--root", default="../../registry/packs", help="Packs root folder")
     sl.set_defaults(func=cmd_lint_packs)
+
+    sb = sub.add_parser("build-snapshot", help="Validate the registry and write a memory-mappable snapshot")
+    sb.add_argument("--root", default=None, help="Registry root folder (defaults to TRUSTSTACK_CONFIG_ROOT)")
+    sb.add_argument("--out", default="registry.snapshot", help="Output file; point TRUSTSTACK_REGISTRY_SNAPSHOT at it")
+    sb.set_defaults(func=cmd_build_snapshot)
+
+    sw = sub.add_parser("what-if", help="Batch-evaluate applicability across many scenarios (requires numpy)")
+    sw.add_argument("--scenarios", default=None, help="YAML/JSON file with `scenarios: [{name, use_case_id, scope_answers}]`; defaults to every use case")
+    sw.add_argument("--packs", default="all", help="`all` (latest versions) or comma-separated domain/pack_id[@version]")
+    sw.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="Override a scope answer in every scenario, e.g. internet_exposed=true")
+    sw.add_argument("--matrix-out", default=None, help="Write the scenario x control applicability matrix as CSV")
+    sw.set_defaults(func=cmd_what_if)
+
+    sm = sub.add_parser("migrate-storage", help="Copy projects between storage backends (e.g. workspace directories into SQLite)")
+    sm.add_argument("--from", dest="source", default="filesystem", choices=["filesystem", "sqlite"])
+    sm.add_argument("--to", dest="target", default="sqlite", choices=["filesystem", "sqlite"])
+    sm.add_argument("--project", action="append", default=[], help="Only migrate this project id (repeatable)")
+    sm.set_defaults(func=cmd_migrate_storage)
     return p
 
 def main(argv: list[str] | None = None) -> int:
@@ -25,9 +25,40 @@ class Settings:
     # Config-first roots (override with env vars for containerized deployments)
     config_root: Path = Path(os.getenv("TRUSTSTACK_CONFIG_ROOT", str(DEFAULT_CONFIG_ROOT))).resolve()
     workspace_root: Path = Path(os.getenv("TRUSTSTACK_WORKSPACE_ROOT", str(DEFAULT_WORKSPACE_ROOT))).resolve()
+    # Derived, rebuildable state (hash sidecars, indexes); safe to delete at any time
+    cache_root: Path = Path(os.getenv("TRUSTSTACK_CACHE_ROOT", str(workspace_root / ".cache"))).resolve()
+
+    # Project storage backend: "filesystem" (YAML per project directory) or "sqlite"
+    storage_backend: str = os.getenv("TRUSTSTACK_STORAGE", "filesystem").lower()
+    sqlite_path: Path = Path(os.getenv("TRUSTSTACK_SQLITE_PATH", str(workspace_root / "truststack.sqlite3"))).resolve()
+
+    # Filesystem storage: fold a project's checklist journal into checklist.yaml once it reaches this size
+    journal_compact_bytes: int = int(os.getenv("TRUSTSTACK_JOURNAL_COMPACT_BYTES", str(256 * 1024)))
+
+    # Largest accepted evidence upload in bytes (0 = unlimited); larger uploads get 413.
+    evidence_max_bytes: int = int(os.getenv("TRUSTSTACK_EVIDENCE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+    # Filesystem storage: roll a project's audit log into a new segment past this size or age
+    audit_segment_bytes: int = int(os.getenv("TRUSTSTACK_AUDIT_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+    audit_segment_seconds: int = int(os.getenv("TRUSTSTACK_AUDIT_SEGMENT_SECONDS", str(7 * 24 * 3600)))
 
     # Stored in project metadata for reproducible checklist generation
     generator_version: str = "0.1.0"
 
+    # Max number of fully loaded packs kept in memory per process (0 disables caching)
+    pack_cache_size: int = int(os.getenv("TRUSTSTACK_PACK_CACHE_SIZE", "256"))
+
+    # In-memory budget (serialized bytes) for memoized checklists; 0 disables the memo.
+    checklist_memo_bytes: int = int(os.getenv("TRUSTSTACK_CHECKLIST_MEMO_BYTES", str(64 * 1024 * 1024)))
+    # Also persist memoized checklists under cache_root/checklists (shared across workers and restarts)
+    checklist_memo_persist: bool = os.getenv("TRUSTSTACK_CHECKLIST_MEMO_PERSIST", "0").lower() in {"1", "true", "yes"}
+
+    # Cache-Control max-age (seconds) for registry/taxonomy catalog responses; clients revalidate via ETag.
+    catalog_max_age: int = int(os.getenv("TRUSTSTACK_CATALOG_MAX_AGE", "60"))
+
+    # Optional prebuilt registry snapshot (see `truststack-grc build-snapshot`); when set,
+    # packs and taxonomy are served from it instead of walking the YAML tree.
+    snapshot_path: Path | None = Path(os.environ["TRUSTSTACK_REGISTRY_SNAPSHOT"]).resolve() if os.getenv("TRUSTSTACK_REGISTRY_SNAPSHOT") else None
+
 def get_settings() -> Settings:
     return Settings()
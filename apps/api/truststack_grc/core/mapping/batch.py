@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from truststack_grc.core.mapping.compiler import All, Always, AnyOf, CompiledRule, Not, leaf_paths, path_resolver
+from truststack_grc.core.packs.models import Pack
+
+if TYPE_CHECKING:
+    import numpy as np
+
+def _numpy():
+    # numpy is optional: only batch / what-if analysis needs it.
+    try:
+        import numpy
+    except ImportError as e:
+        raise RuntimeError("Batch applicability evaluation requires numpy (pip install numpy)") from e
+    return numpy
+
+def _freeze(v: Any) -> Any:
+    if isinstance(v, dict):
+        return ("dict", tuple(sorted((str(k), _freeze(x)) for k, x in v.items())))
+    if isinstance(v, (list, tuple, set)):
+        return (type(v).__name__, tuple(_freeze(x) for x in v))
+    # Keep the type so that e.g. 1 and True stay distinct categories.
+    return (type(v).__name__, v)
+
+class ContextColumns:
+    """Columnar, dictionary-encoded view of N contexts.
+
+    Every context path referenced by a rule becomes an integer code column over
+    the distinct values seen at that path. Leaf predicates are evaluated once per
+    distinct combination of their input codes (on a representative context, so
+    the semantics are exactly those of the scalar evaluator) and broadcast back
+    to all N rows.
+    """
+
+    def __init__(self, contexts: list[dict[str, Any]]):
+        self.np = _numpy()
+        self.contexts = contexts
+        self.n = len(contexts)
+        self._codes: dict[str, "np.ndarray"] = {}
+        self._leaves: dict[tuple[Any, ...], "np.ndarray"] = {}
+
+    def codes(self, path: str) -> "np.ndarray":
+        col = self._codes.get(path)
+        if col is None:
+            resolve = path_resolver(path)
+            categories: dict[Any, int] = {}
+            col = self.np.fromiter(
+                (categories.setdefault(_freeze(resolve(ctx)), len(categories)) for ctx in self.contexts),
+                dtype=self.np.int64,
+                count=self.n,
+            )
+            self._codes[path] = col
+        return col
+
+    def leaf(self, node: CompiledRule) -> "np.ndarray":
+        col = self._leaves.get(node.key)
+        if col is not None:
+            return col
+        np = self.np
+        paths = leaf_paths(node)
+        if not paths or self.n == 0:
+            value = node.matches(self.contexts[0]) if self.n else False
+            col = np.full(self.n, value, dtype=bool)
+        else:
+            stacked = np.stack([self.codes(p) for p in paths], axis=1)
+            _, first_rows, inverse = np.unique(stacked, axis=0, return_index=True, return_inverse=True)
+            truth = np.fromiter((node.matches(self.contexts[i]) for i in first_rows), dtype=bool, count=len(first_rows))
+            col = truth[inverse.reshape(-1)]
+        self._leaves[node.key] = col
+        return col
+
+    def evaluate(self, node: CompiledRule) -> "np.ndarray":
+        np = self.np
+        if isinstance(node, Always):
+            return np.ones(self.n, dtype=bool)
+        if isinstance(node, All):
+            out = np.ones(self.n, dtype=bool)
+            for child in node.children:
+                out &= self.evaluate(child)
+            return out
+        if isinstance(node, AnyOf):
+            out = np.zeros(self.n, dtype=bool)
+            for child in node.children:
+                out |= self.evaluate(child)
+            return out
+        if isinstance(node, Not):
+            return ~self.evaluate(node.child)
+        return self.leaf(node)
+
+@dataclass
+class BatchResult:
+    # One column per control, in pack order: (domain, pack_id, version, control_id)
+    controls: list[tuple[str, str, str, str]]
+    merge_keys: list[str]
+    # Boolean applicability matrix of shape (n_contexts, n_controls)
+    matrix: "np.ndarray"
+
+    def applicable_controls(self) -> "np.ndarray":
+        return self.matrix.sum(axis=1)
+
+    def checklist_counts(self) -> "np.ndarray":
+        """Per-context number of checklist items (distinct merge keys), as generate_checklist would produce."""
+        np = _numpy()
+        n = self.matrix.shape[0]
+        if not self.merge_keys:
+            return np.zeros(n, dtype=np.int64)
+        ids: dict[str, int] = {}
+        groups = np.fromiter((ids.setdefault(k, len(ids)) for k in self.merge_keys), dtype=np.int64, count=len(self.merge_keys))
+        order = np.argsort(groups, kind="stable")
+        starts = np.flatnonzero(np.r_[True, np.diff(groups[order]) != 0])
+        per_key = np.logical_or.reduceat(self.matrix[:, order], starts, axis=1)
+        return per_key.sum(axis=1)
+
+def evaluate_batch(contexts: list[dict[str, Any]], packs: list[Pack]) -> BatchResult:
+    """Evaluate every control of `packs` against every context at once."""
+    np = _numpy()
+    cols = ContextColumns(contexts)
+    controls: list[tuple[str, str, str, str]] = []
+    merge_keys: list[str] = []
+    columns: list["np.ndarray"] = []
+    for pack in packs:
+        for ctrl in pack.controls:
+            controls.append((pack.pack.domain, pack.pack.id, pack.pack.version, ctrl.id))
+            merge_keys.append(ctrl.canonical_id or f"{pack.pack.domain}/{pack.pack.id}/{ctrl.id}")
+            columns.append(cols.evaluate(ctrl.compiled_applicability))
+    matrix = np.stack(columns, axis=1) if columns else np.zeros((len(contexts), 0), dtype=bool)
+    return BatchResult(controls=controls, merge_keys=merge_keys, matrix=matrix)
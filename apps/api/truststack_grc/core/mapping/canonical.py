@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from typing import Any
+
+def jsonable_key(x: Any) -> str:
+    """Order-insensitive (for mappings) identity of a JSON-like value, used for de-duplication."""
+    if isinstance(x, dict):
+        return str(sorted((k, jsonable_key(v)) for k, v in x.items()))
+    if isinstance(x, list):
+        return str([jsonable_key(i) for i in x])
+    return repr(x)
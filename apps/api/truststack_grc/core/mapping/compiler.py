@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from truststack_grc.core.mapping.rules import Trace, TraceRecord, is_path_token
+
+# Compiled applicability rules. `compile_rule` validates a rule once and turns it
+# into a tree of small node objects with pre-split paths and pre-resolved
+# operands. `node.evaluate(context)` returns what `eval_rule` returns, with the
+# matched leaves kept as structured records until `Trace.matched` renders them;
+# `node.matches(context)` is the trace-free fast path.
+
+Resolver = Callable[[dict[str, Any]], Any]
+
+def path_resolver(path: str) -> Resolver:
+    parts = tuple(path.split("."))
+    if len(parts) == 1:
+        key = parts[0]
+        return lambda ctx: ctx.get(key) if isinstance(ctx, dict) else None
+
+    def resolve(ctx: dict[str, Any]) -> Any:
+        cur: Any = ctx
+        for part in parts:
+            if isinstance(cur, dict) and part in cur:
+                cur = cur[part]
+            else:
+                return None
+        return cur
+
+    return resolve
+
+def _operand(x: Any) -> Resolver:
+    if is_path_token(x):
+        return path_resolver(x)
+    return lambda _ctx: x
+
+def _pair(op: str, arg: Any) -> tuple[Any, Any]:
+    try:
+        a, b = arg
+    except (TypeError, ValueError):
+        raise ValueError(f"Operator '{op}' expects two operands, got: {arg!r}") from None
+    return a, b
+
+_NO_RULE = TraceRecord(("always", None, None, None, None))
+
+class CompiledRule:
+    __slots__ = ()
+    # Leaves carry a hashable identity so equal predicates across controls can share work.
+    key: tuple[Any, ...] | None = None
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        raise NotImplementedError
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return self.evaluate(context)[0]
+
+class Always(CompiledRule):
+    __slots__ = ()
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        return True, Trace([_NO_RULE])
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return True
+
+class All(CompiledRule):
+    __slots__ = ("children",)
+
+    def __init__(self, children: list[CompiledRule]):
+        self.children = tuple(children)
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        matched: list[Any] = []
+        for child in self.children:
+            ok, tr = child.evaluate(context)
+            if not ok:
+                return False, Trace(matched)
+            matched.extend(tr.records)
+        return True, Trace(matched)
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return all(child.matches(context) for child in self.children)
+
+class AnyOf(CompiledRule):
+    __slots__ = ("children",)
+
+    def __init__(self, children: list[CompiledRule]):
+        self.children = tuple(children)
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        for child in self.children:
+            ok, tr = child.evaluate(context)
+            if ok:
+                return True, Trace(list(tr.records))
+        return False, Trace([])
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return any(child.matches(context) for child in self.children)
+
+class Not(CompiledRule):
+    __slots__ = ("child",)
+
+    def __init__(self, child: CompiledRule):
+        self.child = child
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        ok, tr = self.child.evaluate(context)
+        return (not ok), Trace([] if ok else tr.records)
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return not self.child.matches(context)
+
+class Equals(CompiledRule):
+    __slots__ = ("a", "b", "ra", "rb", "key")
+
+    def __init__(self, a: Any, b: Any):
+        self.a, self.b = a, b
+        self.ra, self.rb = _operand(a), _operand(b)
+        self.key = ("equals", repr(a), repr(b))
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return self.ra(context) == self.rb(context)
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        va = self.ra(context)
+        vb = self.rb(context)
+        ok = va == vb
+        return ok, Trace([TraceRecord(("equals", self.a, self.b, va, vb))] if ok else [])
+
+def _member(item: Any, container: Any) -> bool:
+    if isinstance(container, (list, tuple, set)):
+        return item in container
+    if isinstance(container, str):
+        return str(item) in container
+    return False
+
+class In(CompiledRule):
+    __slots__ = ("needle", "haystack", "rneedle", "rhaystack", "key")
+
+    def __init__(self, needle: Any, haystack: Any):
+        self.needle, self.haystack = needle, haystack
+        self.rneedle, self.rhaystack = _operand(needle), _operand(haystack)
+        self.key = ("in", repr(needle), repr(haystack))
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return _member(self.rneedle(context), self.rhaystack(context))
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        vneedle = self.rneedle(context)
+        vhay = self.rhaystack(context)
+        ok = _member(vneedle, vhay)
+        return ok, Trace([TraceRecord(("in", self.needle, self.haystack, vneedle, vhay))] if ok else [])
+
+class Exists(CompiledRule):
+    __slots__ = ("path", "resolve", "key")
+
+    def __init__(self, path: Any):
+        self.path = path
+        self.resolve = path_resolver(path) if isinstance(path, str) else (lambda _ctx: None)
+        self.key = ("exists", repr(path))
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return self.resolve(context) is not None
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        ok = self.resolve(context) is not None
+        return ok, Trace([TraceRecord(("exists", self.path, None, None, None))] if ok else [])
+
+class Contains(CompiledRule):
+    __slots__ = ("container", "item", "rcontainer", "ritem", "key")
+
+    def __init__(self, container: Any, item: Any):
+        self.container, self.item = container, item
+        self.rcontainer, self.ritem = _operand(container), _operand(item)
+        self.key = ("contains", repr(container), repr(item))
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return _member(self.ritem(context), self.rcontainer(context))
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        vcontainer = self.rcontainer(context)
+        vitem = self.ritem(context)
+        ok = _member(vitem, vcontainer)
+        return ok, Trace([TraceRecord(("contains", self.container, self.item, None, None))] if ok else [])
+
+class HasTag(CompiledRule):
+    __slots__ = ("tag", "key")
+
+    def __init__(self, tag: Any):
+        self.tag = tag
+        self.key = ("has_tag", repr(tag))
+
+    def matches(self, context: dict[str, Any]) -> bool:
+        return self.tag in context.get("tags", [])
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, Trace]:
+        ok = self.tag in context.get("tags", [])
+        return ok, Trace([TraceRecord(("has_tag", self.tag, None, None, None))] if ok else [])
+
+def leaf_paths(node: CompiledRule) -> list[str]:
+    """Context paths a leaf predicate reads; its result depends on nothing else."""
+    if isinstance(node, HasTag):
+        return ["tags"]
+    if isinstance(node, Exists):
+        return [node.path] if isinstance(node.path, str) else []
+    if isinstance(node, Equals):
+        operands = [node.a, node.b]
+    elif isinstance(node, In):
+        operands = [node.needle, node.haystack]
+    elif isinstance(node, Contains):
+        operands = [node.container, node.item]
+    else:
+        return []
+    return [x for x in operands if is_path_token(x)]
+
+def referenced_paths(node: CompiledRule) -> set[str]:
+    if isinstance(node, (All, AnyOf)):
+        return set().union(*(referenced_paths(c) for c in node.children)) if node.children else set()
+    if isinstance(node, Not):
+        return referenced_paths(node.child)
+    return set(leaf_paths(node))
+
+def _children(op: str, arg: Any) -> list[CompiledRule]:
+    if arg is None:
+        return []
+    if not isinstance(arg, (list, tuple)):
+        raise ValueError(f"Operator '{op}' expects a list of rules, got: {arg!r}")
+    return [compile_rule(sub) for sub in arg]
+
+def compile_rule(rule: dict[str, Any] | None) -> CompiledRule:
+    """Validate `rule` and compile it; raises ValueError for malformed rules."""
+    if not rule:
+        return Always()
+    if not isinstance(rule, dict):
+        raise ValueError(f"Rule must be a mapping, got: {rule!r}")
+    if len(rule) != 1:
+        raise ValueError(f"Rule must have exactly one operator, got: {list(rule.keys())}")
+
+    op, arg = next(iter(rule.items()))
+    if op == "all":
+        return All(_children(op, arg))
+    if op == "any":
+        return AnyOf(_children(op, arg))
+    if op == "not":
+        return Not(compile_rule(arg))
+    if op == "equals":
+        return Equals(*_pair(op, arg))
+    if op == "in":
+        return In(*_pair(op, arg))
+    if op == "exists":
+        return Exists(arg)
+    if op == "contains":
+        return Contains(*_pair(op, arg))
+    if op == "has_tag":
+        return HasTag(arg)
+    raise ValueError(f"Unknown operator: {op}")
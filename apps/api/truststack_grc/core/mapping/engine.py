@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import hashlib
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Literal
 
-from truststack_grc.core.mapping.rules import eval_rule
+from truststack_grc.core.mapping.rules import Trace
 from truststack_grc.core.packs.models import Pack, ControlDefinition
 
 def stable_id(text: str) -> str:
@@ -18,88 +18,189 @@ class PackRef:
     control_id: str
     title: str | None = None
 
-def _uniq_list(items: list[Any]) -> list[Any]:
-    seen = set()
-    out = []
-    for x in items:
-        key = jsonable_key(x)
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(x)
-    return out
-
-def jsonable_key(x: Any) -> str:
-    if isinstance(x, dict):
-        return str(sorted((k, jsonable_key(v)) for k, v in x.items()))
-    if isinstance(x, list):
-        return str([jsonable_key(i) for i in x])
-    return repr(x)
-
-def generate_checklist(context: dict[str, Any], packs: list[Pack]) -> dict[str, Any]:
-    merged: dict[str, dict[str, Any]] = {}
+ExplainLevel = Literal["none", "summary", "full"]
+EXPLAIN_LEVELS = ("none", "summary", "full")
 
-    for pack in packs:
-        for ctrl in pack.controls:
-            ok, trace = eval_rule(ctrl.applicability, context)
-            if not ok:
-                continue
-
-            merge_key = ctrl.canonical_id or f"{pack.pack.domain}/{pack.pack.id}/{ctrl.id}"
-            instance_id = stable_id(merge_key)
-
-            ref = {
-                "domain": pack.pack.domain,
-                "pack_id": pack.pack.id,
-                "version": pack.pack.version,
-                "control_id": ctrl.id,
-                "source": pack.pack.source.model_dump(),
-                "pack_hash": pack.hash,
-            }
-
-            why_parts = []
-            if ctrl.why:
-                why_parts.append(ctrl.why)
-            if trace.matched:
-                why_parts.append("Triggered by: " + "; ".join(trace.matched))
-
-            if merge_key not in merged:
-                merged[merge_key] = {
-                    "item_id": instance_id,
-                    "merge_key": merge_key,
-                    "canonical_id": ctrl.canonical_id,
-                    "title": ctrl.title,
-                    "objective": ctrl.objective,
-                    "severity": ctrl.severity,
-                    "category": ctrl.category,
-                    "domain": pack.pack.domain,
-                    "pack_refs": [ref],
-                    "why_applies": "\n".join(why_parts).strip(),
-                    "evidence_required": list(ctrl.evidence_required or []),
-                    "test_procedures": list(ctrl.test_procedures or []),
-                    "status": "not_started",
-                    "owner": None,
-                    "notes": None,
-                    "evidence": [],
-                }
-            else:
-                merged[merge_key]["pack_refs"].append(ref)
-                merged[merge_key]["evidence_required"] = _uniq_list(merged[merge_key]["evidence_required"] + list(ctrl.evidence_required or []))
-                merged[merge_key]["test_procedures"] = _uniq_list(merged[merge_key]["test_procedures"] + list(ctrl.test_procedures or []))
-                # Prefer highest severity when merged
-                sev_rank = {"low": 0, "medium": 1, "high": 2, "critical": 3}
-                if sev_rank.get(ctrl.severity, 0) > sev_rank.get(merged[merge_key]["severity"], 0):
-                    merged[merge_key]["severity"] = ctrl.severity
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+def merge_key_for(pack: Pack, ctrl: ControlDefinition) -> str:
+    return ctrl.canonical_id or f"{pack.pack.domain}/{pack.pack.id}/{ctrl.id}"
+
+def _why_parts(ctrl: ControlDefinition, trace: Trace | None, explain: ExplainLevel) -> list[str]:
+    why_parts = []
+    if ctrl.why:
+        why_parts.append(ctrl.why)
+    if explain == "full" and trace is not None and trace.records:
+        why_parts.append("Triggered by: " + "; ".join(trace.matched))
+    return why_parts
+
+class _UniqueList:
+    """Order-preserving de-duplicated concatenation, fed with precomputed keys."""
+
+    __slots__ = ("items", "seen")
+
+    def __init__(self) -> None:
+        self.items: list[Any] = []
+        self.seen: set[str] = set()
+
+    def extend(self, values: list[Any], keys: tuple[str, ...]) -> None:
+        for value, key in zip(values, keys):
+            if key not in self.seen:
+                self.seen.add(key)
+                self.items.append(value)
+
+class _MergedItem:
+    __slots__ = ("first_pack", "first_ctrl", "refs", "severity", "contributors", "evidence", "procedures")
+
+    def __init__(self, pack: Pack, ctrl: ControlDefinition):
+        self.first_pack = pack
+        self.first_ctrl = ctrl
+        self.refs: list[tuple[Pack, ControlDefinition, Trace | None]] = []
+        self.severity = ctrl.severity
+        self.contributors = 0
+        self.evidence: _UniqueList | None = None
+        self.procedures: _UniqueList | None = None
+
+    def add(self, pack: Pack, ctrl: ControlDefinition, trace: Trace | None) -> None:
+        self.refs.append((pack, ctrl, trace))
+        self.contributors += 1
+        if self.contributors == 1:
+            return
+        if self.evidence is None:
+            # A single contributor keeps its lists verbatim; de-dup starts with the second.
+            self.evidence, self.procedures = _UniqueList(), _UniqueList()
+            ev_keys, tp_keys = self.first_ctrl.dedup_keys
+            self.evidence.extend(self.first_ctrl.evidence_required or [], ev_keys)
+            self.procedures.extend(self.first_ctrl.test_procedures or [], tp_keys)
+        ev_keys, tp_keys = ctrl.dedup_keys
+        self.evidence.extend(ctrl.evidence_required or [], ev_keys)
+        self.procedures.extend(ctrl.test_procedures or [], tp_keys)
+        # Prefer highest severity when merged
+        if SEVERITY_RANK.get(ctrl.severity, 0) > SEVERITY_RANK.get(self.severity, 0):
+            self.severity = ctrl.severity
+
+    def why_applies(self, explain: ExplainLevel) -> str:
+        if explain == "none":
+            return ""
+        text = ""
+        # Parts known to occur verbatim in `text` (which only ever grows), so
+        # repeats across contributors skip the substring scan.
+        present: set[str] = set()
+        for n, (_pack, ctrl, trace) in enumerate(self.refs):
+            why_parts = _why_parts(ctrl, trace, explain)
+            if n == 0:
+                text = "\n".join(why_parts).strip()
+            elif why_parts:
                 # Extend why if useful
-                if why_parts:
-                    existing = merged[merge_key].get("why_applies") or ""
-                    add = "\n".join([p for p in why_parts if p and p not in existing])
-                    merged[merge_key]["why_applies"] = (existing + ("\n" if existing and add else "") + add).strip()
+                add = "\n".join([p for p in why_parts if p and p not in present and p not in text])
+                text = (text + ("\n" if text and add else "") + add).strip()
+            # Only the outer whitespace of `text` is stripped, so a part without
+            # surrounding whitespace is guaranteed to be present verbatim.
+            present.update(p for p in why_parts if p == p.strip())
+        return text
 
-    items = list(merged.values())
+    def finalize(self, merge_key: str, explain: ExplainLevel, sources: dict[int, dict[str, Any]]) -> dict[str, Any]:
+        pack, ctrl = self.first_pack, self.first_ctrl
+        pack_refs = []
+        for ref_pack, ref_ctrl, _trace in self.refs:
+            pack_refs.append({
+                "domain": ref_pack.pack.domain,
+                "pack_id": ref_pack.pack.id,
+                "version": ref_pack.pack.version,
+                "control_id": ref_ctrl.id,
+                # Fresh dict per ref so YAML output never contains aliases.
+                "source": dict(sources[id(ref_pack)]),
+                "pack_hash": ref_pack.hash,
+            })
+        if self.evidence is None:
+            evidence_required = list(ctrl.evidence_required or [])
+            test_procedures = list(ctrl.test_procedures or [])
+        else:
+            evidence_required = self.evidence.items
+            test_procedures = self.procedures.items
+        return {
+            "item_id": stable_id(merge_key),
+            "merge_key": merge_key,
+            "canonical_id": ctrl.canonical_id,
+            "title": ctrl.title,
+            "objective": ctrl.objective,
+            "severity": self.severity,
+            "category": ctrl.category,
+            "domain": pack.pack.domain,
+            "pack_refs": pack_refs,
+            "why_applies": self.why_applies(explain),
+            "evidence_required": evidence_required,
+            "test_procedures": test_procedures,
+            "status": "not_started",
+            "owner": None,
+            "notes": None,
+            "evidence": [],
+        }
+
+class ChecklistAccumulator:
+    """Merges applicable controls into checklist items keyed by merge key.
+
+    Contributions are recorded as-is; de-duplication state is kept per merge key
+    and rendering (refs, rationale text) happens once in `finalize`.
+    """
+
+    def __init__(self, explain: ExplainLevel = "full"):
+        if explain not in EXPLAIN_LEVELS:
+            raise ValueError(f"Unknown explain level: {explain}")
+        self.explain = explain
+        self._merged: dict[str, _MergedItem] = {}
+        self._sources: dict[int, dict[str, Any]] = {}
+
+    def add(self, pack: Pack, ctrl: ControlDefinition, trace: Trace | None) -> None:
+        if id(pack) not in self._sources:
+            self._sources[id(pack)] = pack.pack.source.model_dump()
+        merge_key = merge_key_for(pack, ctrl)
+        entry = self._merged.get(merge_key)
+        if entry is None:
+            entry = self._merged[merge_key] = _MergedItem(pack, ctrl)
+        entry.add(pack, ctrl, trace)
+
+    def add_pack(self, pack: Pack, context: dict[str, Any], only: set[str] | None = None) -> None:
+        """Evaluate `pack` against `context`; `only` restricts it to the given merge keys."""
+        full = self.explain == "full"
+        if only is None:
+            # Only controls whose required predicates hold in this context can apply.
+            indices = pack.predicate_index.candidates(context)
+        else:
+            by_key = pack.controls_by_merge_key
+            indices = sorted(idx for key in only for idx in by_key.get(key, ()))
+        for idx in indices:
+            ctrl = pack.controls[idx]
+            trace: Trace | None = None
+            if full:
+                ok, trace = ctrl.compiled_applicability.evaluate(context)
+            else:
+                ok = ctrl.compiled_applicability.matches(context)
+            if ok:
+                self.add(pack, ctrl, trace)
+
+    def merge_keys(self) -> list[str]:
+        return list(self._merged)
+
+    def finalize(self) -> list[dict[str, Any]]:
+        return [entry.finalize(key, self.explain, self._sources) for key, entry in self._merged.items()]
+
+def sort_items(items: list[dict[str, Any]]) -> None:
     # deterministic ordering: domain, severity desc, title
-    sev_rank = {"critical": 3, "high": 2, "medium": 1, "low": 0}
-    items.sort(key=lambda x: (x["domain"], -sev_rank.get(x["severity"], 0), x["title"]))
+    items.sort(key=lambda x: (x["domain"], -SEVERITY_RANK.get(x["severity"], 0), x["title"]))
+
+def generate_checklist(context: dict[str, Any], packs: list[Pack], explain: ExplainLevel = "full") -> dict[str, Any]:
+    """Evaluate `packs` against `context` and merge applicable controls into checklist items.
+
+    `explain` controls `why_applies`: "full" (control rationale plus the matched
+    rule leaves), "summary" (rationale only) or "none" (empty; rules are then
+    evaluated without building traces at all).
+    """
+    acc = ChecklistAccumulator(explain)
+    for pack in packs:
+        acc.add_pack(pack, context)
+    items = acc.finalize()
+    sort_items(items)
     return {"items": items, "counts": summarize(items)}
 
 def summarize(items: list[dict[str, Any]]) -> dict[str, Any]:
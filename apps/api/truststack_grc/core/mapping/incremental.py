@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any
+
+from truststack_grc.core.mapping.engine import ChecklistAccumulator, ExplainLevel, sort_items, summarize
+from truststack_grc.core.mapping.memo import overlay_state
+from truststack_grc.core.packs.models import Pack
+
+PackIdent = tuple[str, str, str]
+
+def _ident(pack: Pack) -> PackIdent:
+    return (pack.pack.domain, pack.pack.id, pack.pack.version)
+
+def regenerate_checklist(
+    context: dict[str, Any],
+    old_packs: list[Pack],
+    new_packs: list[Pack],
+    prior_items: list[dict[str, Any]],
+    explain: ExplainLevel = "full",
+) -> dict[str, Any] | None:
+    """Turn `prior_items` (generated from `old_packs`) into the checklist for `new_packs`.
+
+    Only merge keys touched by added, removed or version-bumped packs are
+    re-merged, across all new packs in order; every other item is carried over
+    unchanged. The result equals a full `generate_checklist` with project state
+    overlaid. Returns None when the diff cannot be applied safely (duplicate
+    selections, or kept packs reordered), in which case callers regenerate fully.
+    """
+    old_ids = [_ident(p) for p in old_packs]
+    new_ids = [_ident(p) for p in new_packs]
+    if len(set(old_ids)) != len(old_ids) or len(set(new_ids)) != len(new_ids):
+        return None
+
+    old_hash = {ident: p.hash for ident, p in zip(old_ids, old_packs)}
+    kept = {ident for ident, p in zip(new_ids, new_packs) if old_hash.get(ident) == p.hash}
+    # Items untouched by the diff keep their pack_refs order only if kept packs keep theirs.
+    if [i for i in old_ids if i in kept] != [i for i in new_ids if i in kept]:
+        return None
+    removed = set(old_ids) - kept
+    added = [p for ident, p in zip(new_ids, new_packs) if ident not in kept]
+
+    affected: set[str] = set()
+    for item in prior_items:
+        if any((r.get("domain"), r.get("pack_id"), r.get("version")) in removed for r in item.get("pack_refs") or []):
+            affected.add(item["merge_key"])
+    probe = ChecklistAccumulator("none")
+    for pack in added:
+        probe.add_pack(pack, context)
+    affected.update(probe.merge_keys())
+
+    acc = ChecklistAccumulator(explain)
+    if affected:
+        for pack in new_packs:
+            acc.add_pack(pack, context, only=affected)
+    patched = acc.finalize()
+    overlay_state(patched, prior_items)
+    items = [it for it in prior_items if it["merge_key"] not in affected] + patched
+
+    # A full run emits items in order of first contribution (pack position,
+    # then control position) before the stable sort; restore that order so
+    # ties in the sort key come out identically.
+    pack_pos = {ident: n for n, ident in enumerate(new_ids)}
+    ctrl_pos: dict[PackIdent, dict[str, int]] = {}
+
+    def first_contribution(item: dict[str, Any]) -> tuple[int, int]:
+        ref = item["pack_refs"][0]
+        ident = (ref["domain"], ref["pack_id"], ref["version"])
+        positions = ctrl_pos.get(ident)
+        if positions is None:
+            positions = ctrl_pos[ident] = {}
+            for idx, ctrl in enumerate(new_packs[pack_pos[ident]].controls):
+                positions.setdefault(ctrl.id, idx)
+        return pack_pos[ident], positions[ref["control_id"]]
+
+    items.sort(key=first_contribution)
+    sort_items(items)
+    return {"items": items, "counts": summarize(items)}
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import Counter
+from itertools import product
+from typing import Any, Iterable
+
+from truststack_grc.core.mapping.compiler import All, Always, AnyOf, CompiledRule, Not
+
+# A control's requirements are a list of alternatives; each alternative is a set
+# of leaf predicates that must all hold for the rule to possibly match.
+# [frozenset()] means "unconstrained", [] means "can never match".
+Alternatives = list[frozenset[tuple[Any, ...]]]
+
+MAX_ALTERNATIVES = 32
+
+def _minimize(alts: Iterable[frozenset[tuple[Any, ...]]]) -> Alternatives:
+    unique = sorted(set(alts), key=len)
+    out: Alternatives = []
+    for alt in unique:
+        # An alternative implied by a smaller one adds nothing.
+        if not any(prev <= alt for prev in out):
+            out.append(alt)
+    return out
+
+def requirements(node: CompiledRule, leaves: dict[tuple[Any, ...], CompiledRule]) -> Alternatives:
+    """Necessary conditions for `node`, collecting the leaves they reference."""
+    if isinstance(node, Always) or isinstance(node, Not):
+        return [frozenset()]
+    if isinstance(node, AnyOf):
+        alts: Alternatives = []
+        for child in node.children:
+            child_alts = requirements(child, leaves)
+            if frozenset() in child_alts:
+                return [frozenset()]
+            alts.extend(child_alts)
+        return _minimize(alts)
+    if isinstance(node, All):
+        per_child = [requirements(child, leaves) for child in node.children]
+        if any(not alts for alts in per_child):
+            return []
+        constrained = [alts for alts in per_child if alts != [frozenset()]]
+        if not constrained:
+            return [frozenset()]
+        size = 1
+        for alts in constrained:
+            size *= len(alts)
+        if size <= MAX_ALTERNATIVES:
+            return _minimize(frozenset().union(*combo) for combo in product(*constrained))
+        # Too many combinations: any single child's requirements are still necessary.
+        return min(constrained, key=len)
+    if node.key is None:
+        return [frozenset()]
+    leaves.setdefault(node.key, node)
+    return [frozenset([node.key])]
+
+class PredicateIndex:
+    """Inverted index from leaf predicates to the controls that depend on them.
+
+    Each constrained alternative is filed under its least common predicate.
+    `candidates(context)` evaluates every distinct predicate at most once and
+    returns, in pack order, the controls whose rule can possibly match; every
+    other control is guaranteed not to apply.
+    """
+
+    def __init__(self, rules: list[CompiledRule]):
+        self._leaves: dict[tuple[Any, ...], CompiledRule] = {}
+        per_control = [requirements(rule, self._leaves) for rule in rules]
+
+        freq: Counter[tuple[Any, ...]] = Counter()
+        for alts in per_control:
+            for alt in alts:
+                freq.update(alt)
+
+        self.always: list[int] = []
+        self.by_fact: dict[tuple[Any, ...], list[tuple[int, frozenset[tuple[Any, ...]]]]] = {}
+        for idx, alts in enumerate(per_control):
+            if frozenset() in alts:
+                self.always.append(idx)
+                continue
+            for alt in alts:
+                anchor = min(alt, key=lambda k: (freq[k], k))
+                self.by_fact.setdefault(anchor, []).append((idx, alt - {anchor}))
+
+    def candidates(self, context: dict[str, Any]) -> list[int]:
+        truth: dict[tuple[Any, ...], bool] = {}
+
+        def holds(key: tuple[Any, ...]) -> bool:
+            v = truth.get(key)
+            if v is None:
+                try:
+                    v = self._leaves[key].matches(context)
+                except Exception:
+                    # Let the full evaluation decide (and raise) exactly as it would unindexed.
+                    v = True
+                truth[key] = v
+            return v
+
+        hits = set(self.always)
+        for anchor, entries in self.by_fact.items():
+            if not holds(anchor):
+                continue
+            for idx, rest in entries:
+                if idx not in hits and all(holds(k) for k in rest):
+                    hits.add(idx)
+        return sorted(hits)
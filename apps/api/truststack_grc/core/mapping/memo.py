@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.mapping.compiler import path_resolver
+from truststack_grc.core.mapping.engine import generate_checklist
+from truststack_grc.core.packs.models import Pack
+
+STATE_FIELDS = ("status", "owner", "notes", "evidence")
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+def _serialize(result: dict[str, Any]) -> bytes:
+    # Unlike the key, templates keep their key order so items read back exactly as generated.
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def checklist_key(context: dict[str, Any], packs: list[Pack], explain: str = "full") -> str:
+    """Content address of generate_checklist(context, packs, explain).
+
+    The checklist depends on the context only through the paths the packs'
+    rules read, so the key hashes that projection rather than the whole
+    context (which also carries e.g. the project name).
+    """
+    paths = sorted(frozenset().union(*(p.context_paths for p in packs))) if packs else []
+    doc = {
+        "generator_version": get_settings().generator_version,
+        "explain": explain,
+        "context": [[path, path_resolver(path)(context)] for path in paths],
+        "packs": [[p.pack.domain, p.pack.id, p.pack.version, p.hash] for p in packs],
+    }
+    return hashlib.sha256(_canonical(doc)).hexdigest()
+
+class ChecklistMemo:
+    """LRU of generated checklists keyed by `checklist_key`.
+
+    Results are kept as serialized JSON (the immutable template); every lookup
+    returns a fresh copy that callers may overlay project state onto. The
+    in-memory budget is in serialized bytes. With `persist_dir` set, templates
+    are also written there so other workers and restarts can reuse them.
+    """
+
+    def __init__(self, max_bytes: int, persist_dir: Path | None = None):
+        self.max_bytes = max_bytes
+        self.persist_dir = persist_dir
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        assert self.persist_dir is not None
+        return self.persist_dir / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = blob
+            self._size += len(blob)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(blob)
+        if self.persist_dir is not None:
+            try:
+                blob = self._path(key).read_bytes()
+            except OSError:
+                blob = None
+            if blob is not None:
+                try:
+                    result = json.loads(blob)
+                except ValueError:
+                    result = None
+                if result is not None:
+                    self._remember(key, blob)
+                    with self._lock:
+                        self.disk_hits += 1
+                    return result
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, result: dict[str, Any]) -> bytes:
+        """Store `result` and return its serialized template; raises TypeError for non-JSON values."""
+        blob = _serialize(result)
+        self._remember(key, blob)
+        if self.persist_dir is None:
+            return blob
+        path = self._path(key)
+        if path.exists():
+            return blob
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+        except OSError:
+            # Persistence is best effort; the in-memory entry is already in place.
+            pass
+        return blob
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+def _default_memo() -> ChecklistMemo:
+    settings = get_settings()
+    persist = settings.cache_root / "checklists" if settings.checklist_memo_persist else None
+    return ChecklistMemo(max_bytes=settings.checklist_memo_bytes, persist_dir=persist)
+
+checklist_memo = _default_memo()
+
+def memoized_checklist(context: dict[str, Any], packs: list[Pack], memo: ChecklistMemo | None = None) -> dict[str, Any]:
+    """generate_checklist(context, packs) served from the memo; the result is a private copy."""
+    memo = memo or checklist_memo
+    if memo.max_bytes <= 0 and memo.persist_dir is None:
+        return generate_checklist(context=context, packs=packs)
+    key = checklist_key(context, packs)
+    result = memo.get(key)
+    if result is None:
+        result = generate_checklist(context=context, packs=packs)
+        try:
+            blob = memo.put(key, result)
+        except (TypeError, ValueError):
+            # Pack data that is not plain JSON (e.g. YAML dates) is served unmemoized.
+            return result
+        # Hand back the same normalized form a hit would, never the cached object.
+        result = json.loads(blob)
+    return result
+
+def overlay_state(items: list[dict[str, Any]], prior_items: list[dict[str, Any]]) -> None:
+    """Carry project state from `prior_items` onto template `items` with the same item_id."""
+    prior = {it.get("item_id"): it for it in prior_items}
+    for item in items:
+        previous = prior.get(item.get("item_id"))
+        if not previous:
+            continue
+        for k in STATE_FIELDS:
+            item[k] = previous.get(k)
@@ -1,13 +1,42 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Any
 
 ROOT_KEYS = {"industry", "segment", "use_case", "tags", "pattern", "data", "deployment", "jurisdiction", "model", "system"}
 
-@dataclass
+class TraceRecord(tuple):
+    """Structured record of one matched leaf; rendered to text only on demand.
+
+    Layout: (op, operand_a, operand_b, resolved_a, resolved_b).
+    """
+
+    __slots__ = ()
+
+    def text(self) -> str:
+        op, a, b, va, vb = self
+        if op == "equals":
+            return f"{a} == {b} (resolved {va!r} == {vb!r})"
+        if op == "in":
+            return f"{a} in {b} (resolved {va!r} in {vb!r})"
+        if op == "contains":
+            return f"{a} contains {b}"
+        if op == "exists":
+            return f"exists({a})"
+        if op == "has_tag":
+            return f"has_tag({a})"
+        return "(no applicability rule)"
+
 class Trace:
-    matched: list[str]
+    """Matched leaves of a rule evaluation, as plain strings or `TraceRecord`s."""
+
+    __slots__ = ("records",)
+
+    def __init__(self, matched: list[Any] | None = None):
+        self.records: list[Any] = matched if matched is not None else []
+
+    @property
+    def matched(self) -> list[str]:
+        return [r if isinstance(r, str) else r.text() for r in self.records]
 
 def get_path(obj: dict[str, Any], path: str) -> Any:
     cur: Any = obj
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.packs.models import Pack
+from truststack_grc.core.util.fingerprint import TreeSignature, tree_signature
+
+PackKey = tuple[str, str, str, str]
+
+class PackCache:
+    """Process-wide LRU of fully loaded packs.
+
+    Entries are keyed by (packs root, domain, pack_id, version) and remember the
+    stat signature of the pack folder they were loaded from; a lookup whose
+    signature no longer matches reloads the pack. Cached packs are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[PackKey, tuple[TreeSignature, Pack]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: PackKey, base: Path, load: Callable[[], Pack | None]) -> Pack | None:
+        sig = tree_signature(base)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == sig:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+
+        # Load outside the lock; the signature taken above is stored with the
+        # result so a concurrent edit simply triggers another reload later.
+        pack = load()
+        if pack is None or self.maxsize <= 0:
+            return pack
+        with self._lock:
+            self._entries[key] = (sig, pack)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return pack
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+pack_cache = PackCache(maxsize=get_settings().pack_cache_size)
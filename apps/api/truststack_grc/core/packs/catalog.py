@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.packs.models import PackSource
+from truststack_grc.core.storage.merkle import directory_hasher, merkle_root
+from truststack_grc.core.util.fingerprint import TreeSignature, tree_signature
+from truststack_grc.core.util.yamlio import read_yaml
+
+if TYPE_CHECKING:
+    from truststack_grc.core.packs.loader import PackRegistry
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    signature: TreeSignature
+    manifest: dict[str, Any] | None
+    control_count: int | None
+    hash: str | None
+
+class PackCatalog:
+    """Manifest-level index of pack versions used for listings.
+
+    Entries are built from `pack.yaml`, a count of the controls files and the
+    directory hasher's cached digest, never by loading the pack. Each one is
+    persisted as a small JSON file under `index_dir` against the Merkle root
+    of its version folder (from the hasher's per-file digests, which re-read
+    only files whose stat changed), together with the control count of every
+    controls file by digest. An unchanged version is thus listed without
+    reading pack files, also in a fresh process, and an edit re-parses only
+    the controls files it touched.
+    """
+
+    def __init__(self, index_dir: Path | None = None) -> None:
+        self.index_dir = index_dir
+        self._entries: dict[tuple[str, str, str, str], CatalogEntry] = {}
+        self._lock = threading.Lock()
+
+    def _index_path(self, base: Path) -> Path | None:
+        if self.index_dir is None:
+            return None
+        return self.index_dir / f"{hashlib.sha256(str(base.resolve()).encode('utf-8')).hexdigest()[:32]}.json"
+
+    def _load_index(self, base: Path) -> dict[str, Any]:
+        path = self._index_path(base)
+        if path is None:
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _store_index(self, base: Path, index: dict[str, Any]) -> None:
+        path = self._index_path(base)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            # The index is an optimization; a read-only cache dir must not break listings.
+            pass
+
+    def _build(self, reg: "PackRegistry", base: Path, digests: dict[str, str], counts: dict[str, list[Any]]) -> dict[str, Any]:
+        raw = read_yaml(base / "pack.yaml")
+        reg._manifest_validator.validate(raw)
+        info = raw["pack"]
+        manifest: dict[str, Any] = {
+            "name": info["name"],
+            "description": info.get("description"),
+            "source": PackSource(**info["source"]).model_dump(),
+        }
+        if info.get("order") is not None:
+            manifest["order"] = info["order"]
+        fresh_counts: dict[str, list[Any]] = {}
+        for f in sorted((base / "controls").glob("*.yaml")):
+            rel = str(f.relative_to(base))
+            prev = counts.get(rel)
+            if prev is not None and prev[0] == digests.get(rel):
+                fresh_counts[rel] = prev
+            else:
+                fresh_counts[rel] = [digests.get(rel), len(read_yaml(f).get("controls") or [])]
+        return {
+            "manifest": manifest,
+            "control_count": sum(n for _, n in fresh_counts.values()),
+            "hash": directory_hasher().legacy_digest(base),
+            "counts": fresh_counts,
+        }
+
+    def entry(self, reg: "PackRegistry", domain: str, pack_id: str, version: str) -> CatalogEntry:
+        key = (str(reg.paths.packs_dir), domain, pack_id, version)
+        base = reg.paths.packs_dir / domain / pack_id / version
+        sig = tree_signature(base)
+        with self._lock:
+            current = self._entries.get(key)
+        if current is not None and current.signature == sig:
+            return current
+
+        try:
+            digests = directory_hasher().file_digests(base, sig)
+            root = merkle_root(digests)
+            index = self._load_index(base)
+            if index.get("merkle") != root:
+                index = {**self._build(reg, base, digests, index.get("counts") or {}), "merkle": root}
+                self._store_index(base, index)
+            fresh = CatalogEntry(signature=sig, manifest=index["manifest"], control_count=index["control_count"], hash=index["hash"])
+        except Exception:
+            # Best-effort metadata for listing; keep folder discovery resilient.
+            fresh = CatalogEntry(signature=sig, manifest=None, control_count=None, hash=None)
+        with self._lock:
+            self._entries[key] = fresh
+        return fresh
+
+    def list_packs(self, reg: "PackRegistry") -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        root = reg.paths.packs_dir
+        if not root.exists():
+            return out
+        live: set[tuple[str, str, str, str]] = set()
+        for domain_dir in sorted([d for d in root.iterdir() if d.is_dir()], key=lambda p: p.name):
+            domain = domain_dir.name
+            for pack_dir in sorted([d for d in domain_dir.iterdir() if d.is_dir()], key=lambda p: p.name):
+                versions = reg.list_pack_versions(domain=domain, pack_id=pack_dir.name)
+                if not versions:
+                    continue
+                live.update((str(root), domain, pack_dir.name, v) for v in versions)
+                entry: dict[str, Any] = {"domain": domain, "pack_id": pack_dir.name, "versions": versions}
+                latest = self.entry(reg, domain, pack_dir.name, versions[-1])
+                if latest.manifest is not None:
+                    entry.update(latest.manifest)
+                    entry["control_count"] = latest.control_count
+                    entry["hash"] = latest.hash
+                out.append(entry)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == str(root) and k not in live]:
+                del self._entries[key]
+        return out
+
+pack_catalog = PackCatalog(get_settings().cache_root / "catalog")
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import hashlib
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -10,32 +10,37 @@ from jsonschema import Draft202012Validator
 
 from truststack_grc.config import get_settings
 from truststack_grc.core.util.yamlio import read_yaml
+from truststack_grc.core.packs.cache import PackCache, pack_cache
+from truststack_grc.core.packs.catalog import pack_catalog
 from truststack_grc.core.packs.models import Pack, PackInfo, PackSource, ControlDefinition
+from truststack_grc.core.snapshot.artifact import RegistrySnapshot, open_snapshot
+from truststack_grc.core.storage.merkle import directory_hasher
+from truststack_grc.core.util.fingerprint import file_signature, tree_signature
 
 @dataclass(frozen=True)
 class PackPaths:
     root: Path
     packs_dir: Path
 
-def _sha256_bytes(b: bytes) -> str:
-    return hashlib.sha256(b).hexdigest()
-
 def _hash_dir(path: Path) -> str:
-    h = hashlib.sha256()
-    files = [p for p in path.rglob("*") if p.is_file()]
-    for f in sorted(files, key=lambda p: str(p)):
-        h.update(str(f.relative_to(path)).encode("utf-8"))
-        h.update(b"\x00")
-        h.update(f.read_bytes())
-        h.update(b"\x00")
-    return h.hexdigest()
+    return directory_hasher().legacy_digest(path)
+
+@lru_cache(maxsize=16)
+def _validator(schema_path: str, mtime_ns: int) -> Draft202012Validator:
+    return Draft202012Validator(json.loads(Path(schema_path).read_text(encoding="utf-8")))
+
+def load_validator(schema_path: Path) -> Draft202012Validator:
+    # Compiled validators are shared per process; editing a schema file picks up a fresh one.
+    return _validator(str(schema_path), schema_path.stat().st_mtime_ns)
 
 class PackRegistry:
-    def __init__(self, paths: PackPaths, schema_dir: Path):
+    def __init__(self, paths: PackPaths, schema_dir: Path, cache: PackCache | None = pack_cache, snapshot: RegistrySnapshot | None = None):
         self.paths = paths
         self.schema_dir = schema_dir
-        self._manifest_validator = Draft202012Validator(json.loads((schema_dir / "pack_manifest.schema.json").read_text(encoding="utf-8")))
-        self._controls_validator = Draft202012Validator(json.loads((schema_dir / "controls.schema.json").read_text(encoding="utf-8")))
+        self.cache = cache
+        self.snapshot = snapshot
+        self._manifest_validator = load_validator(schema_dir / "pack_manifest.schema.json")
+        self._controls_validator = load_validator(schema_dir / "controls.schema.json")
 
     @classmethod
     def from_env(cls) -> "PackRegistry":
@@ -44,42 +49,38 @@ class PackRegistry:
         return cls(
             paths=PackPaths(root=root, packs_dir=root),
             schema_dir=(settings.config_root.parent / "schemas"),
+            snapshot=open_snapshot(settings.snapshot_path) if settings.snapshot_path else None,
         )
 
+    def source_signature(self, *parts: str) -> Any:
+        """Stat signature of the files behind the whole registry or one pack folder; reads nothing."""
+        if self.snapshot is not None:
+            return ("snapshot", str(self.snapshot.path), file_signature(self.snapshot.path))
+        return tree_signature(self.paths.packs_dir.joinpath(*parts))
+
     def list_packs(self) -> list[dict[str, Any]]:
-        out: list[dict[str, Any]] = []
-        if not self.paths.packs_dir.exists():
-            return out
-        for domain_dir in sorted([d for d in self.paths.packs_dir.iterdir() if d.is_dir()], key=lambda p: p.name):
-            domain = domain_dir.name
-            for pack_dir in sorted([d for d in domain_dir.iterdir() if d.is_dir()], key=lambda p: p.name):
-                versions = self.list_pack_versions(domain=domain, pack_id=pack_dir.name)
-                if not versions:
-                    continue
-                entry: dict[str, Any] = {"domain": domain, "pack_id": pack_dir.name, "versions": versions}
-                try:
-                    latest = versions[-1]
-                    loaded = self.load_pack(domain=domain, pack_id=pack_dir.name, version=latest)
-                    if loaded:
-                        entry["name"] = loaded.pack.name
-                        entry["description"] = loaded.pack.description
-                        entry["source"] = loaded.pack.source.model_dump()
-                        if loaded.pack.extra.get("order") is not None:
-                            entry["order"] = loaded.pack.extra.get("order")
-                except Exception:
-                    # Best-effort metadata for listing; keep folder discovery resilient.
-                    pass
-                out.append(entry)
-        return out
+        if self.snapshot is not None:
+            return self.snapshot.get("packs:list", [])
+        return pack_catalog.list_packs(self)
 
     def list_pack_versions(self, domain: str, pack_id: str) -> list[str]:
+        if self.snapshot is not None:
+            return self.snapshot.pack_versions(domain, pack_id)
         base = self.paths.packs_dir / domain / pack_id
         if not base.exists():
             return []
         return sorted([d.name for d in base.iterdir() if d.is_dir()])
 
     def load_pack(self, domain: str, pack_id: str, version: str) -> Pack | None:
+        if self.snapshot is not None:
+            return self.snapshot.pack(domain, pack_id, version)
         base = self.paths.packs_dir / domain / pack_id / version
+        if self.cache is None:
+            return self._load_pack_uncached(base)
+        key = (str(self.paths.packs_dir), domain, pack_id, version)
+        return self.cache.get_or_load(key, base, lambda: self._load_pack_uncached(base))
+
+    def _load_pack_uncached(self, base: Path) -> Pack | None:
         manifest_path = base / "pack.yaml"
         if not manifest_path.exists():
             return None
@@ -107,7 +108,12 @@ class PackRegistry:
                 cdoc = read_yaml(f)
                 self._controls_validator.validate(cdoc)
                 for c in cdoc.get("controls", []):
-                    controls.append(ControlDefinition(**c))
+                    ctrl = ControlDefinition(**c)
+                    try:
+                        ctrl.compiled_applicability
+                    except ValueError as e:
+                        raise ValueError(f"{f.name}: control {ctrl.id}: invalid applicability rule: {e}") from None
+                    controls.append(ctrl)
         pack_hash = _hash_dir(base)
 
         return Pack(pack=pack_info, controls=controls, path=str(base), hash=pack_hash)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from typing import Any, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from truststack_grc.core.mapping.canonical import jsonable_key
+from truststack_grc.core.mapping.compiler import CompiledRule, compile_rule, referenced_paths
+from truststack_grc.core.mapping.index import PredicateIndex
 
 Domain = Literal["security", "safety", "governance"]
 PackType = Literal["control_catalog", "threat_catalog", "suggestion_catalog"]
@@ -55,8 +59,67 @@ class ControlDefinition(BaseModel):
     suggestions: list[dict[str, Any]] = Field(default_factory=list)
     extra: dict[str, Any] = Field(default_factory=dict)
 
+    _compiled: CompiledRule | None = PrivateAttr(default=None)
+    _dedup_keys: tuple[tuple[str, ...], tuple[str, ...]] | None = PrivateAttr(default=None)
+
+    # These run per control on every checklist generation; read the private
+    # storage directly instead of going through BaseModel.__getattr__.
+    @property
+    def compiled_applicability(self) -> CompiledRule:
+        # Compiled once per control; pack loading triggers it so malformed rules fail early.
+        private = self.__pydantic_private__
+        compiled = private["_compiled"]
+        if compiled is None:
+            compiled = private["_compiled"] = compile_rule(self.applicability)
+        return compiled
+
+    @property
+    def dedup_keys(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """Canonical keys of (evidence_required, test_procedures) entries, computed once per control."""
+        private = self.__pydantic_private__
+        keys = private["_dedup_keys"]
+        if keys is None:
+            keys = private["_dedup_keys"] = (
+                tuple(jsonable_key(x) for x in self.evidence_required or []),
+                tuple(jsonable_key(x) for x in self.test_procedures or []),
+            )
+        return keys
+
 class Pack(BaseModel):
     pack: PackInfo
     controls: list[ControlDefinition]
     path: str
     hash: str
+
+    _predicate_index: PredicateIndex | None = PrivateAttr(default=None)
+    _context_paths: frozenset[str] | None = PrivateAttr(default=None)
+    _by_merge_key: dict[str, list[int]] | None = PrivateAttr(default=None)
+
+    @property
+    def predicate_index(self) -> PredicateIndex:
+        private = self.__pydantic_private__
+        index = private["_predicate_index"]
+        if index is None:
+            index = private["_predicate_index"] = PredicateIndex([c.compiled_applicability for c in self.controls])
+        return index
+
+    @property
+    def context_paths(self) -> frozenset[str]:
+        """Every context path read by this pack's applicability rules."""
+        private = self.__pydantic_private__
+        paths = private["_context_paths"]
+        if paths is None:
+            paths = private["_context_paths"] = frozenset().union(*(referenced_paths(c.compiled_applicability) for c in self.controls))
+        return paths
+
+    @property
+    def controls_by_merge_key(self) -> dict[str, list[int]]:
+        """Control indices per checklist merge key (as computed by engine.merge_key_for)."""
+        private = self.__pydantic_private__
+        index = private["_by_merge_key"]
+        if index is None:
+            index = {}
+            for idx, ctrl in enumerate(self.controls):
+                index.setdefault(ctrl.canonical_id or f"{self.pack.domain}/{self.pack.id}/{ctrl.id}", []).append(idx)
+            private["_by_merge_key"] = index
+        return index
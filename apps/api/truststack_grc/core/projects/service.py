@@ -1,18 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import re
 from datetime import datetime, timezone
 from typing import Any
 
 from truststack_grc.config import get_settings
-from truststack_grc.core.mapping.engine import generate_checklist, summarize
+from truststack_grc.core.mapping.engine import summarize
+from truststack_grc.core.mapping.incremental import regenerate_checklist
+from truststack_grc.core.mapping.memo import memoized_checklist, overlay_state
 from truststack_grc.core.packs.loader import PackRegistry
-from truststack_grc.core.storage.filesystem import FileSystemStorage
+from truststack_grc.core.reporting.cache import report_cache
+from truststack_grc.core.storage.auditlog import AuditEvent
+from truststack_grc.core.storage.base import ChangeSet, RevisionConflict, Storage
 from truststack_grc.core.storage.hashing import sha256_text
+from truststack_grc.core.storage.writes import write_coordinator
 from truststack_grc.core.taxonomy.loader import TaxonomyLoader
 from truststack_grc.core.projects.context import build_context
 
 ALLOWED_DEPLOYMENT_ENVIRONMENTS = {"AWS Native", "GCP Native", "Azure Native", "Custom Stack"}
+REGENERATE_ATTEMPTS = 3
+ITEM_FIELDS = ["status", "owner", "notes"]
 
 def _slug(s: str) -> str:
     s = s.strip().lower()
@@ -39,6 +47,9 @@ def _normalize_selected_llms(selected_llms: list[Any] | None) -> list[str]:
         normalized.append(text)
     return normalized
 
+def _packs_hash(packs: list[Any]) -> str:
+    return sha256_text("|".join([f"{p.pack.domain}:{p.pack.id}:{p.pack.version}:{p.hash}" for p in packs]))
+
 def _normalize_deployment_environment(value: Any) -> str | None:
     if value is None:
         return None
@@ -50,7 +61,7 @@ def _normalize_deployment_environment(value: Any) -> str | None:
     return text
 
 class ProjectService:
-    def __init__(self, storage: FileSystemStorage):
+    def __init__(self, storage: Storage):
         self.storage = storage
         self.settings = get_settings()
 
@@ -78,13 +89,13 @@ class ProjectService:
         if not deployment_environment:
             raise ValueError("deployment_environment is required")
 
-        checklist = generate_checklist(context=context, packs=packs)
+        checklist = memoized_checklist(context, packs)
 
         ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
         project_id = f"{_slug(req['name'])}-{ts}"
 
-        taxonomy_hash = sha256_text(str(taxonomy.list_industries()))
-        packs_hash = sha256_text("|".join([f"{p.pack.domain}:{p.pack.id}:{p.pack.version}:{p.hash}" for p in packs]))
+        taxonomy_hash = taxonomy.model().tree_hash
+        packs_hash = _packs_hash(packs)
         checklist_hash = sha256_text(str([(i["merge_key"], i["severity"], i["title"]) for i in checklist["items"]]))
 
         project_doc = {
@@ -120,7 +131,7 @@ class ProjectService:
             "counts": checklist["counts"],
         }
 
-        self.storage.write_project(project_id, project_doc)
+        self.storage.write_project(project_id, project_doc, create=True)
         self.storage.write_checklist(project_id, checklist_doc)
         self.storage.append_audit(project_id, "project.created", actor, {"project": {"id": project_id, "name": req["name"]}})
 
@@ -143,32 +154,107 @@ class ProjectService:
             normalized.append(entry)
         return loaded, normalized
 
-    def update_checklist_item(self, project_id: str, item_id: str, patch: dict[str, Any], actor: str) -> dict[str, Any] | None:
+    def _regenerate_checklist(self, proj: dict[str, Any], context: dict[str, Any], packs: list[Any], prior_items: list[dict[str, Any]]) -> dict[str, Any]:
+        # Patch the stored checklist when it provably came from the previous
+        # selection as it is on disk now; otherwise rebuild it from scratch.
+        generated = proj.get("generated", {})
+        if prior_items and generated.get("generator_version") == self.settings.generator_version:
+            try:
+                old_packs, _ = self._load_packs(proj.get("inputs", {}).get("selected_packs", []))
+            except ValueError:
+                old_packs = None
+            if old_packs is not None and _packs_hash(old_packs) == generated.get("packs_hash"):
+                regenerated = regenerate_checklist(context, old_packs, packs, prior_items)
+                if regenerated is not None:
+                    return regenerated
+
+        regenerated = memoized_checklist(context, packs)
+        overlay_state(regenerated["items"], prior_items)
+        regenerated["counts"] = summarize(regenerated["items"])
+        return regenerated
+
+    def _change_items(self, project_id: str, changeset: ChangeSet) -> bool:
+        # Concurrent changes to one project are group-committed as one write.
+        if not write_coordinator.submit(self.storage, project_id, changeset, utc_now()):
+            return False
+        if changeset.conflict:
+            raise RevisionConflict(changeset.revision or 0)
+        return True
+
+    def update_checklist_item(
+        self, project_id: str, item_id: str, patch: dict[str, Any], actor: str, expected_revision: int | tuple[int, ...] | None = None
+    ) -> tuple[dict[str, Any], int] | None:
+        """Returns the updated item and the checklist revision it is part of."""
         proj = self.storage.read_project(project_id)
-        checklist = self.storage.read_checklist(project_id)
-        if not proj or not checklist:
+        if not proj:
             return None
 
-        items = checklist.get("items", [])
-        found = None
-        for it in items:
-            if it.get("item_id") == item_id:
-                found = it
-                break
+        before: dict[str, Any] = {}
+
+        def apply(item: dict[str, Any]) -> None:
+            before.update({k: item.get(k) for k in ITEM_FIELDS})
+            for k in ITEM_FIELDS:
+                if k in patch:
+                    item[k] = patch[k]
+
+        changeset = ChangeSet([(item_id, apply)], expected_revision=expected_revision)
+        if not self._change_items(project_id, changeset):
+            return None
+        found = changeset.items[0]
         if not found:
             return None
+        after = {k: found.get(k) for k in ITEM_FIELDS}
 
-        before = {k: found.get(k) for k in ["status", "owner", "notes"]}
-        for k in ["status", "owner", "notes"]:
-            if k in patch:
-                found[k] = patch[k]
-        after = {k: found.get(k) for k in ["status", "owner", "notes"]}
-
-        proj["project"]["updated_at"] = utc_now()
-        self.storage.write_project(project_id, proj)
-        self.storage.write_checklist(project_id, checklist)
         self.storage.append_audit(project_id, "checklist.item.updated", actor, {"item_id": item_id, "before": before, "after": after})
-        return found
+        return found, changeset.revision or 0
+
+    def update_checklist_items(
+        self, project_id: str, patches: list[dict[str, Any]], actor: str, expected_revision: int | tuple[int, ...] | None = None
+    ) -> dict[str, Any] | None:
+        """Apply several item patches (each with `item_id`) as one checklist revision.
+
+        All patches are applied in memory and persisted with one write; the
+        audit events go out as one batch. Unknown items are reported per item.
+        """
+        proj = self.storage.read_project(project_id)
+        if not proj:
+            return None
+
+        befores: list[dict[str, Any]] = []
+        updates = []
+        for patch in patches:
+            before: dict[str, Any] = {}
+            befores.append(before)
+
+            def apply(item: dict[str, Any], patch: dict[str, Any] = patch, before: dict[str, Any] = before) -> None:
+                before.update({k: item.get(k) for k in ITEM_FIELDS})
+                for k in ITEM_FIELDS:
+                    if k in patch:
+                        item[k] = patch[k]
+
+            updates.append((patch["item_id"], apply))
+
+        changeset = ChangeSet(updates, expected_revision=expected_revision)
+        if not self._change_items(project_id, changeset):
+            return None
+
+        results: list[dict[str, Any]] = []
+        events: list[AuditEvent] = []
+        for patch, before, found in zip(patches, befores, changeset.items):
+            item_id = patch["item_id"]
+            if found is None:
+                results.append({"item_id": item_id, "ok": False, "error": "Item not found"})
+                continue
+            after = {k: found.get(k) for k in ITEM_FIELDS}
+            results.append({"item_id": item_id, "ok": True, "item": found})
+            events.append(AuditEvent("checklist.item.updated", actor, {"item_id": item_id, "before": before, "after": after}))
+        self.storage.append_audit_events(project_id, events)
+        return {
+            "revision": changeset.revision or 0,
+            "updated": len(events),
+            "failed": len(results) - len(events),
+            "results": results,
+        }
 
     def update_project(self, project_id: str, patch: dict[str, Any], actor: str) -> dict[str, Any] | None:
         proj = self.storage.read_project(project_id)
@@ -200,36 +286,31 @@ class ProjectService:
             selected_packs = patch.get("selected_packs") or []
             packs, normalized_selected_packs = self._load_packs(selected_packs)
             context = proj.get("context", {})
-            regenerated = generate_checklist(context=context, packs=packs)
-
-            prior = self.storage.read_checklist(project_id) or {}
-            prior_items = {it.get("item_id"): it for it in prior.get("items", [])}
-            for item in regenerated["items"]:
-                previous = prior_items.get(item.get("item_id"))
-                if not previous:
-                    continue
-                for k in ["status", "owner", "notes", "evidence"]:
-                    item[k] = previous.get(k)
-
-            regenerated["counts"] = summarize(regenerated["items"])
+            # Item edits that land while we regenerate bump the revision; redo with them included.
+            for attempt in range(REGENERATE_ATTEMPTS):
+                prior = self.storage.read_checklist(project_id) or {}
+                regenerated = self._regenerate_checklist(proj, context, packs, prior.get("items", []))
+                checklist_doc = {
+                    "project_id": project_id,
+                    "generated_at": utc_now(),
+                    "items": regenerated["items"],
+                    "counts": regenerated["counts"],
+                }
+                try:
+                    self.storage.write_checklist(project_id, checklist_doc, expected_revision=prior.get("revision"))
+                    break
+                except RevisionConflict:
+                    if attempt == REGENERATE_ATTEMPTS - 1:
+                        raise
 
             proj.setdefault("inputs", {})["selected_packs"] = normalized_selected_packs
             taxonomy = TaxonomyLoader.from_env()
-            proj.setdefault("generated", {})["taxonomy_hash"] = sha256_text(str(taxonomy.list_industries()))
-            proj["generated"]["packs_hash"] = sha256_text(
-                "|".join([f"{p.pack.domain}:{p.pack.id}:{p.pack.version}:{p.hash}" for p in packs])
-            )
+            proj.setdefault("generated", {})["generator_version"] = self.settings.generator_version
+            proj["generated"]["taxonomy_hash"] = taxonomy.model().tree_hash
+            proj["generated"]["packs_hash"] = _packs_hash(packs)
             proj["generated"]["checklist_hash"] = sha256_text(
                 str([(i["merge_key"], i["severity"], i["title"]) for i in regenerated["items"]])
             )
-
-            checklist_doc = {
-                "project_id": project_id,
-                "generated_at": utc_now(),
-                "items": regenerated["items"],
-                "counts": regenerated["counts"],
-            }
-            self.storage.write_checklist(project_id, checklist_doc)
             checklist_changed = True
 
         proj["project"]["updated_at"] = utc_now()
@@ -263,32 +344,23 @@ class ProjectService:
         deleted = self.storage.delete_project(project_id)
         if not deleted:
             return None
+        report_cache.discard(project_id)
         return summary
 
     async def add_evidence(self, project_id: str, item_id: str, upload_file, actor: str) -> dict[str, Any] | None:
-        proj = self.storage.read_project(project_id)
-        checklist = self.storage.read_checklist(project_id)
-        if not proj or not checklist:
-            return None
-        items = checklist.get("items", [])
-        found = None
-        for it in items:
-            if it.get("item_id") == item_id:
-                found = it
-                break
-        if not found:
+        # Storage calls block (file locks, fsync, group commit waits); keep them off the event loop.
+        proj = await asyncio.to_thread(self.storage.read_project, project_id)
+        if not proj or not await asyncio.to_thread(self.storage.read_checklist_item, project_id, item_id):
             return None
 
-        content = await upload_file.read()
-        meta = self.storage.save_evidence_file(project_id, item_id, upload_file.filename or "upload.bin", content)
+        meta = await self.storage.save_evidence_upload(project_id, item_id, upload_file, self.settings.evidence_max_bytes)
         meta.update({
             "content_type": upload_file.content_type,
             "uploaded_at": utc_now(),
         })
-        found.setdefault("evidence", []).append(meta)
+        changeset = ChangeSet([(item_id, lambda item: item.setdefault("evidence", []).append(meta))])
+        if not await asyncio.to_thread(self._change_items, project_id, changeset) or not changeset.items[0]:
+            return None
 
-        proj["project"]["updated_at"] = utc_now()
-        self.storage.write_project(project_id, proj)
-        self.storage.write_checklist(project_id, checklist)
-        self.storage.append_audit(project_id, "evidence.uploaded", actor, {"item_id": item_id, "file": meta})
+        await asyncio.to_thread(self.storage.append_audit, project_id, "evidence.uploaded", actor, {"item_id": item_id, "file": meta})
         return meta
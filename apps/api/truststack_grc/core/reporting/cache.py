@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from truststack_grc.config import get_settings
+
+def artifact_key(fmt: str, template_version: str, project: dict[str, Any], checklist_header: dict[str, Any]) -> str:
+    """Content address of a report artifact.
+
+    The checklist enters through its header: every item change bumps its
+    `revision` and a regeneration changes `generated_at`, so hashing the
+    items themselves would add nothing but read cost.
+    """
+    doc = {
+        "format": fmt,
+        "template": template_version,
+        "generator_version": get_settings().generator_version,
+        "project": project,
+        "checklist": checklist_header,
+    }
+    raw = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+class ReportArtifactCache:
+    """Rendered report files under `root/<project_id>/<format>-<key>`.
+
+    A changed project simply misses (its key changes); storing the new
+    artifact removes the ones of the same format that existed when it was
+    started. Files are published with an atomic rename, so workers sharing
+    `root` never see a partial artifact.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, project_id: str, fmt: str, key: str) -> Path:
+        return self.root / project_id / f"{fmt}-{key}"
+
+    def get(self, project_id: str, fmt: str, key: str) -> Path | None:
+        path = self.path(project_id, fmt, key)
+        found = path.exists()
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return path if found else None
+
+    def _begin(self, project_id: str, fmt: str) -> tuple[Path, list[Path]]:
+        # A staging file, and the artifacts that exist now: only these are superseded
+        # by the one being produced, not any published while it is in progress.
+        directory = self.root / project_id
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f".{fmt}.{uuid.uuid4().hex}.tmp", list(directory.glob(f"{fmt}-*"))
+
+    def _publish(self, staged: Path, superseded: list[Path], project_id: str, fmt: str, key: str) -> Path:
+        target = self.path(project_id, fmt, key)
+        os.replace(staged, target)
+        for old in superseded:
+            if old != target:
+                old.unlink(missing_ok=True)
+        return target
+
+    def store(self, project_id: str, fmt: str, key: str, write: Callable[[Path], None]) -> Path:
+        """Run `write(path)` to produce the artifact and cache it; returns its cached path."""
+        staged, superseded = self._begin(project_id, fmt)
+        try:
+            write(staged)
+        except BaseException:
+            staged.unlink(missing_ok=True)
+            raise
+        return self._publish(staged, superseded, project_id, fmt, key)
+
+    def tee(self, project_id: str, fmt: str, key: str, chunks: Iterator[str], still_current: Callable[[], bool] | None = None) -> Iterator[bytes]:
+        """Pass `chunks` through encoded, caching the artifact once they have all been sent.
+
+        `key` is computed before the content is read; `still_current` re-checks it at
+        the end so an artifact of a project that changed meanwhile is not published.
+        """
+        staged, superseded = self._begin(project_id, fmt)
+        try:
+            with staged.open("wb") as f:
+                for chunk in chunks:
+                    data = chunk.encode("utf-8")
+                    f.write(data)
+                    yield data
+        except BaseException:
+            # Client went away or rendering failed: nothing complete to keep.
+            staged.unlink(missing_ok=True)
+            raise
+        if still_current is not None and not still_current():
+            staged.unlink(missing_ok=True)
+            return
+        self._publish(staged, superseded, project_id, fmt, key)
+
+    def discard(self, project_id: str) -> None:
+        shutil.rmtree(self.root / project_id, ignore_errors=True)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+report_cache = ReportArtifactCache(get_settings().cache_root / "reports")
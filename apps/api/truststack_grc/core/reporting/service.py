@@ -1,22 +1,91 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
-from truststack_grc.core.storage.filesystem import FileSystemStorage
+from truststack_grc.config import get_settings
+from truststack_grc.core.reporting.cache import artifact_key, report_cache
+from truststack_grc.core.storage.base import Storage
+from truststack_grc.core.storage.checklist_query import ChecklistQuery
+
+CSV_COLUMNS = ["item_id", "domain", "severity", "status", "title", "objective", "owner", "evidence_count", "pack_refs"]
+# Items fetched per storage read by the streaming exports; bounds their memory use.
+STREAM_PAGE = 200
+# Times a streaming export re-reads the header when the checklist changes before its first page.
+SNAPSHOT_ATTEMPTS = 3
+
+class ChecklistChanged(Exception):
+    """The checklist moved to another revision while an export was reading it."""
+
+def _csv_row(item: dict[str, Any]) -> list[Any]:
+    refs = ";".join([f'{r["pack_id"]}@{r["version"]}:{r["control_id"]}' for r in item.get("pack_refs", [])])
+    return [
+        item.get("item_id"),
+        item.get("domain"),
+        item.get("severity"),
+        item.get("status"),
+        item.get("title"),
+        item.get("objective"),
+        item.get("owner") or "",
+        len(item.get("evidence") or []),
+        refs,
+    ]
+
+def _buffered(chunks: Iterator[str], size: int = 64 * 1024) -> Iterator[str]:
+    # Template.generate yields every text fragment separately; send them in larger pieces.
+    buf: list[str] = []
+    pending = 0
+    for chunk in chunks:
+        buf.append(chunk)
+        pending += len(chunk)
+        if pending >= size:
+            yield "".join(buf)
+            buf, pending = [], 0
+    if buf:
+        yield "".join(buf)
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+# Bump when the csv columns or the pdf layout change; html is versioned by its template source.
+CSV_VERSION = "1"
+PDF_VERSION = "1"
+
+def _environment() -> Environment:
+    bytecode_dir = get_settings().cache_root / "jinja"
+    bytecode_dir.mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(str(TEMPLATES_DIR)),
+        autoescape=select_autoescape(["html", "xml"]),
+        bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir)),
+    )
+
+# One environment per process, so each template is compiled once (or loaded from
+# the bytecode cache that workers share) instead of on every report.
+report_env = _environment()
+
+def precompile_templates() -> list[str]:
+    names = report_env.list_templates()
+    for name in names:
+        report_env.get_template(name)
+    return names
+
+def template_version(fmt: str) -> str:
+    if fmt == "html":
+        return hashlib.sha256((TEMPLATES_DIR / "report.html.j2").read_bytes()).hexdigest()
+    return {"csv": CSV_VERSION, "pdf": PDF_VERSION}[fmt]
 
 class ReportingService:
-    def __init__(self, storage: FileSystemStorage):
+    def __init__(self, storage: Storage):
         self.storage = storage
-        tmpl_dir = Path(__file__).parent / "templates"
-        self.env = Environment(
-            loader=FileSystemLoader(str(tmpl_dir)),
-            autoescape=select_autoescape(["html", "xml"]),
-        )
+        self.env = report_env
 
     def _load(self, project_id: str) -> tuple[dict[str, Any], dict[str, Any]] | None:
         project = self.storage.read_project(project_id)
@@ -51,24 +120,141 @@ class ReportingService:
 
         with path.open("w", newline="", encoding="utf-8") as f:
             w = csv.writer(f)
-            w.writerow(["item_id","domain","severity","status","title","objective","owner","evidence_count","pack_refs"])
+            w.writerow(CSV_COLUMNS)
             for item in checklist.get("items", []):
-                refs = ";".join([f'{r["pack_id"]}@{r["version"]}:{r["control_id"]}' for r in item.get("pack_refs", [])])
-                w.writerow([
-                    item.get("item_id"),
-                    item.get("domain"),
-                    item.get("severity"),
-                    item.get("status"),
-                    item.get("title"),
-                    item.get("objective"),
-                    item.get("owner") or "",
-                    len(item.get("evidence") or []),
-                    refs,
-                ])
+                w.writerow(_csv_row(item))
         return str(path)
 
+    # Streaming exports: None if the project has no checklist, otherwise a generator
+    # that reads items a page at a time as the client consumes the response. They
+    # raise ChecklistChanged rather than mix items of different revisions.
+
+    def _header(self, project_id: str) -> tuple[dict[str, Any], dict[str, Any]] | None:
+        project = self.storage.read_project(project_id)
+        header = self.storage.read_checklist_header(project_id)
+        if not project or not header:
+            return None
+        return project, header
+
+    def iter_items(self, project_id: str, revision: int | None = None, first: dict[str, Any] | None = None) -> Iterator[dict[str, Any]]:
+        """Checklist items, read a page at a time starting with `first` if given.
+
+        Pages are separate reads; with `revision` set, ChecklistChanged is raised
+        as soon as one comes from another revision (or the checklist is gone),
+        so an export never mixes revisions.
+        """
+        page, cursor = first, None
+        while True:
+            if page is None:
+                page = self.storage.query_checklist(project_id, ChecklistQuery(limit=STREAM_PAGE, cursor=cursor))
+            if page is None or (revision is not None and page["revision"] != revision):
+                if revision is None:
+                    return
+                raise ChecklistChanged(f"Checklist of {project_id} changed from revision {revision} during the export")
+            yield from page["items"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+            page = None
+
+    def _snapshot(self, project_id: str) -> tuple[dict[str, Any], dict[str, Any], Iterator[dict[str, Any]]] | None:
+        """Project, checklist header and the items of the header's revision.
+
+        Retries when the checklist changes between the header and the first page;
+        later changes make the item iterator raise ChecklistChanged.
+        """
+        for _ in range(SNAPSHOT_ATTEMPTS):
+            loaded = self._header(project_id)
+            if not loaded:
+                return None
+            project, header = loaded
+            first = self.storage.query_checklist(project_id, ChecklistQuery(limit=STREAM_PAGE))
+            if first is None:
+                return None
+            if first["revision"] == header.get("revision", 0):
+                return project, header, self.iter_items(project_id, first["revision"], first)
+        raise ChecklistChanged(f"Checklist of {project_id} keeps changing; retry the export")
+
+    def stream_csv(self, project_id: str) -> Iterator[str] | None:
+        snapshot = self._snapshot(project_id)
+        if snapshot is None:
+            return None
+        items = snapshot[2]
+
+        def rows() -> Iterator[str]:
+            buf = io.StringIO()
+            w = csv.writer(buf)
+            w.writerow(CSV_COLUMNS)
+            for n, item in enumerate(items, 1):
+                w.writerow(_csv_row(item))
+                if n % STREAM_PAGE == 0:
+                    yield buf.getvalue()
+                    buf.seek(0)
+                    buf.truncate()
+            yield buf.getvalue()
+
+        return rows()
+
+    def stream_ndjson(self, project_id: str) -> Iterator[str] | None:
+        snapshot = self._snapshot(project_id)
+        if snapshot is None:
+            return None
+        return (_dumps(item) + "\n" for item in snapshot[2])
+
+    def stream_json(self, project_id: str) -> Iterator[str] | None:
+        """The `export_json` document, serialized item by item."""
+        snapshot = self._snapshot(project_id)
+        if snapshot is None:
+            return None
+        project, header, items = snapshot
+
+        def chunks() -> Iterator[str]:
+            yield '{"project": ' + _dumps(project) + ', "checklist": {'
+            for key, value in header.items():
+                yield _dumps(key) + ": " + _dumps(value) + ", "
+            yield '"items": ['
+            for n, item in enumerate(items):
+                yield ("" if n == 0 else ", ") + _dumps(item)
+            yield "]}}"
+
+        return chunks()
+
+    # Cached artifacts (html, csv, pdf): `artifact_key` is cheap to compute and
+    # doubles as the ETag; the artifact is only rendered when the key is new.
+
+    def stream_html(self, project_id: str) -> Iterator[str] | None:
+        """`render_html`, generated chunk by chunk while items are read a page at a time."""
+        snapshot = self._snapshot(project_id)
+        if snapshot is None:
+            return None
+        project, header, items = snapshot
+        # Pinned to the header's revision, so `counts` and the items always agree.
+        checklist = {**header, "items": items}
+        return _buffered(self.env.get_template("report.html.j2").generate(project=project, checklist=checklist))
+
+    def artifact_key(self, project_id: str, fmt: str) -> str | None:
+        loaded = self._header(project_id)
+        if not loaded:
+            return None
+        project, header = loaded
+        return artifact_key(fmt, template_version(fmt), project, header)
+
+    def build_artifact(self, project_id: str, fmt: str) -> tuple[str, Path] | None:
+        """Render the pdf report into the artifact cache; returns its key and path (html
+        and csv are streamed into the cache instead, see `ReportArtifactCache.tee`).
+
+        The key is computed from the documents rendered, which may be newer than
+        those of an `artifact_key` call made before.
+        """
+        loaded = self._load(project_id)
+        if not loaded:
+            return None
+        project, checklist = loaded
+        header = {k: v for k, v in checklist.items() if k != "items"}
+        key = artifact_key(fmt, template_version(fmt), project, header)
+        return key, report_cache.store(project_id, fmt, key, lambda path: self._write_pdf(project, checklist, path))
+
     def export_pdf(self, project_id: str) -> str | None:
-        # Minimal scaffold PDF export. Replace with your enterprise template.
         loaded = self._load(project_id)
         if not loaded:
             return None
@@ -76,7 +262,11 @@ class ReportingService:
         exports = self.storage.project_dir(project_id) / "exports"
         exports.mkdir(parents=True, exist_ok=True)
         path = exports / f"{project_id}.pdf"
+        self._write_pdf(project, checklist, path)
+        return str(path)
 
+    def _write_pdf(self, project: dict[str, Any], checklist: dict[str, Any], path: Path) -> None:
+        # Minimal scaffold PDF export. Replace with your enterprise template.
         from reportlab.lib.pagesizes import letter
         from reportlab.pdfgen import canvas
 
@@ -110,4 +300,3 @@ class ReportingService:
             y -= 14
 
         c.save()
-        return str(path)
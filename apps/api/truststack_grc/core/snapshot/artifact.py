@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator
+
+from truststack_grc.core.packs.models import Pack
+
+# Layout (little endian):
+#   header  = magic[8] | format_version u32 | index_len u64
+#   index   = JSON {"meta": {...}, "entries": {key: [offset, length]}}
+#   payload = concatenated compact JSON documents; offsets are relative to the payload start
+MAGIC = b"TSGRCSNP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIQ")
+
+class SnapshotError(ValueError):
+    pass
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=False).encode("utf-8")
+
+def write_snapshot(path: Path, entries: dict[str, Any], meta: dict[str, Any]) -> None:
+    payload = bytearray()
+    index: dict[str, list[int]] = {}
+    for key, value in entries.items():
+        blob = _dumps(value)
+        index[key] = [len(payload), len(blob)]
+        payload += blob
+    index_blob = _dumps({"meta": {**meta, "format_version": FORMAT_VERSION}, "entries": index})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(index_blob)))
+        f.write(index_blob)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    # Replace atomically: workers that already mapped the old file keep a valid view of it.
+    os.replace(tmp, path)
+
+class RegistrySnapshot:
+    """Read-only, memory-mapped view of a registry snapshot built by `build-snapshot`.
+
+    Documents are decoded on access, so each worker only pays for what it
+    actually serves while the raw bytes stay shared in the OS page cache.
+    `get` decodes afresh on every call and callers own the result; only
+    `pack` memoizes, and its Pack models are shared read-only like the
+    pack cache's.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            raise SnapshotError(f"Not a registry snapshot: {path}")
+        magic, version, index_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"Not a registry snapshot: {path}")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot format {version} (expected {FORMAT_VERSION}): {path}")
+        index = json.loads(self._mm[_HEADER.size:_HEADER.size + index_len])
+        self.meta: dict[str, Any] = index["meta"]
+        self._entries: dict[str, list[int]] = index["entries"]
+        self._base = _HEADER.size + index_len
+        self._packs: dict[tuple[str, str, str], Pack] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        return (k for k in self._entries if k.startswith(prefix))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        loc = self._entries.get(key)
+        if loc is None:
+            return default
+        off, length = loc
+        return json.loads(self._mm[self._base + off:self._base + off + length])
+
+    def pack(self, domain: str, pack_id: str, version: str) -> Pack | None:
+        ident = (domain, pack_id, version)
+        cached = self._packs.get(ident)
+        if cached is not None:
+            return cached
+        raw = self.get(f"pack:{domain}/{pack_id}/{version}")
+        if raw is None:
+            return None
+        pack = Pack.model_validate(raw)
+        with self._lock:
+            return self._packs.setdefault(ident, pack)
+
+    def pack_versions(self, domain: str, pack_id: str) -> list[str]:
+        return list(self.get("packs:versions", {}).get(f"{domain}/{pack_id}", []))
+
+@lru_cache(maxsize=4)
+def _open(path: str, size: int, mtime_ns: int, ino: int) -> RegistrySnapshot:
+    return RegistrySnapshot(Path(path))
+
+def open_snapshot(path: Path) -> RegistrySnapshot:
+    """Open (once per process) the snapshot at `path`; a rebuilt file is picked up on the next call."""
+    st = path.stat()
+    return _open(str(path), st.st_size, st.st_mtime_ns, st.st_ino)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.packs.loader import PackPaths, PackRegistry
+from truststack_grc.core.snapshot.artifact import write_snapshot
+from truststack_grc.core.taxonomy.loader import TaxonomyLoader, TaxonomyPaths
+
+@dataclass
+class SnapshotBuildResult:
+    entries: int = 0
+    packs: int = 0
+    errors: list[str] = field(default_factory=list)
+
+def build_registry_snapshot(config_root: Path, schema_dir: Path, out: Path) -> SnapshotBuildResult:
+    """Validate the whole registry tree and write it to `out` as one snapshot artifact.
+
+    Nothing is written if any pack or use case fails to load.
+    """
+    result = SnapshotBuildResult()
+    entries: dict[str, Any] = {}
+
+    packs_root = config_root / "packs"
+    reg = PackRegistry(paths=PackPaths(root=packs_root, packs_dir=packs_root), schema_dir=schema_dir, cache=None)
+    versions_index: dict[str, list[str]] = {}
+    if packs_root.exists():
+        for domain_dir in sorted([d for d in packs_root.iterdir() if d.is_dir()], key=lambda p: p.name):
+            for pack_dir in sorted([d for d in domain_dir.iterdir() if d.is_dir()], key=lambda p: p.name):
+                domain, pack_id = domain_dir.name, pack_dir.name
+                versions = reg.list_pack_versions(domain=domain, pack_id=pack_id)
+                if versions:
+                    versions_index[f"{domain}/{pack_id}"] = versions
+                for version in versions:
+                    try:
+                        pack = reg.load_pack(domain=domain, pack_id=pack_id, version=version)
+                    except Exception as e:
+                        result.errors.append(f"pack {domain}/{pack_id}/{version}: {e}")
+                        continue
+                    if pack is None:
+                        continue
+                    entries[f"pack:{domain}/{pack_id}/{version}"] = pack.model_dump()
+                    result.packs += 1
+    entries["packs:versions"] = versions_index
+    entries["packs:list"] = reg.list_packs()
+
+    taxonomy_root = config_root / "taxonomy"
+    taxonomy = TaxonomyLoader(paths=TaxonomyPaths(root=taxonomy_root, industries_dir=taxonomy_root / "industries"), schema_dir=schema_dir)
+    try:
+        entries["taxonomy:industries"] = taxonomy.list_industries()
+    except Exception as e:
+        result.errors.append(f"taxonomy: {e}")
+
+    result.entries = len(entries)
+    if result.errors:
+        return result
+
+    write_snapshot(out, entries, meta={
+        "generator_version": get_settings().generator_version,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "config_root": str(config_root),
+    })
+    return result
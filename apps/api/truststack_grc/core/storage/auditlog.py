@@ -1,27 +1,286 @@
 from __future__ import annotations
 
+import bisect
 import json
+import os
+import re
+import shutil
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from truststack_grc.config import get_settings
+from truststack_grc.core.storage.catalog import InvalidCursor
+from truststack_grc.core.storage.groupcommit import GroupCommit
+from truststack_grc.core.storage.locks import file_lock
+
+# A project's audit log is a directory of append-only NDJSON segments:
+#   audit/00000001.ndjson, audit/00000002.ndjson, ...   rolled by size or age
+#   audit/<seq>.idx                                     sparse "ts<TAB>offset" lines
+# The pre-segment `auditlog.ndjson` next to it is read as segment 0. Timestamps
+# are stamped by the writer under the log lock and never decrease, so segments
+# and index entries are ordered by time and range queries can seek.
+INDEX_INTERVAL = 64 * 1024
+_SEGMENT = re.compile(r"^(\d{8})\.ndjson$")
+
 @dataclass
 class AuditEvent:
     event_type: str
     actor: str
     details: dict[str, Any]
 
+@dataclass(frozen=True)
+class AuditQuery:
+    since: str | None = None
+    until: str | None = None
+    event_types: tuple[str, ...] = ()
+    limit: int = 500
+    cursor: str | None = None
+
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-def append_event(path: Path, event: AuditEvent) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    record = {
-        "ts": utc_now_iso(),
-        "event_type": event.event_type,
-        "actor": event.actor,
-        "details": event.details,
-    }
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+def normalize_ts(value: str) -> str:
+    """Any ISO-8601 timestamp as the UTC form the log stores (naive means UTC)."""
+    dt = datetime.fromisoformat(value.strip())
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+def _record(e: AuditEvent, ts: str) -> dict[str, Any]:
+    return {"ts": ts, "event_type": e.event_type, "actor": e.actor, "details": e.details}
+
+def _last_record(path: Path) -> dict[str, Any] | None:
+    try:
+        with path.open("rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            pos, tail = end, b""
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+                lines = tail.splitlines()
+                # The first line may be cut unless we reached the file start.
+                for line in reversed(lines if pos == 0 else lines[1:]):
+                    try:
+                        return json.loads(line)
+                    except ValueError:
+                        continue
+    except FileNotFoundError:
+        pass
+    return None
+
+_commits: GroupCommit[list[dict[str, Any]], None] = GroupCommit()
+
+class AuditLog:
+    """Segmented, indexed audit trail of one project.
+
+    `append` group-commits: events appended concurrently are written with
+    one write and one fsync per segment touched.
+    """
+
+    def __init__(self, directory: Path, legacy: Path | None = None):
+        self.directory = directory
+        self.legacy = legacy
+        settings = get_settings()
+        self.segment_bytes = settings.audit_segment_bytes
+        self.segment_age = timedelta(seconds=settings.audit_segment_seconds)
+
+    def _segment(self, seq: int) -> Path:
+        if seq == 0 and self.legacy is not None:
+            return self.legacy
+        return self.directory / f"{seq:08d}.ndjson"
+
+    def _index_path(self, seq: int) -> Path:
+        return self.directory / f"{seq:08d}.idx"
+
+    def _segments(self) -> list[int]:
+        try:
+            seqs = sorted(int(m.group(1)) for name in os.listdir(self.directory) if (m := _SEGMENT.match(name)))
+        except FileNotFoundError:
+            seqs = []
+        if self.legacy is not None and self.legacy.exists():
+            seqs.insert(0, 0)
+        return seqs
+
+    # -- writing -----------------------------------------------------------
+
+    def append(self, events: list[AuditEvent]) -> None:
+        if not events:
+            return
+        _commits.submit(str(self.directory), [_record(e, "") for e in events], self._flush)
+
+    def _flush(self, batch: list[list[dict[str, Any]]]) -> list[None]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.directory / ".lock"):
+            seqs = self._segments()
+            last = _last_record(self._segment(seqs[-1])) if seqs else None
+            last_ts = (last or {}).get("ts") or ""
+            now = utc_now_iso()
+            records = []
+            for records_of_caller in batch:
+                for r in records_of_caller:
+                    last_ts = max(now, last_ts)
+                    records.append({**r, "ts": last_ts})
+            self._write(records, seqs)
+        return [None] * len(batch)
+
+    def _write(self, records: list[dict[str, Any]], seqs: list[int]) -> None:
+        # Caller holds the log lock. Records carry their final, non-decreasing timestamps.
+        seq = max(seqs[-1] if seqs else 1, 1)
+        path = self._segment(seq)
+        size = path.stat().st_size if path.exists() else 0
+        index = self._read_index(seq)
+        buf = bytearray()
+        if size:
+            with path.open("rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    buf += b"\n"  # seal a torn tail left by a crash
+        added: list[tuple[str, int]] = []
+
+        for r in records:
+            line = (json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8")
+            offset = size + len(buf)
+            first = index[0][0] if index else (added[0][0] if added else None)
+            too_old = first is not None and datetime.fromisoformat(r["ts"]) - datetime.fromisoformat(first) >= self.segment_age
+            if offset and (offset + len(line) > self.segment_bytes or too_old):
+                self._commit(path, buf, seq, added)
+                seq, size, index, buf, added = seq + 1, 0, [], bytearray(), []
+                path, offset = self._segment(seq), 0
+            last_indexed = added[-1][1] if added else (index[-1][1] if index else None)
+            if last_indexed is None or offset - last_indexed >= INDEX_INTERVAL:
+                added.append((r["ts"], offset))
+            buf += line
+        self._commit(path, buf, seq, added)
+
+    def _commit(self, path: Path, buf: bytearray, seq: int, added: list[tuple[str, int]]) -> None:
+        if buf:
+            with path.open("ab") as f:
+                f.write(buf)
+                f.flush()
+                os.fsync(f.fileno())
+        if added:
+            # Derived data: a missing tail only makes the index sparser.
+            with self._index_path(seq).open("a", encoding="utf-8") as f:
+                f.write("".join(f"{ts}\t{offset}\n" for ts, offset in added))
+
+    def replace(self, records: list[dict[str, Any]]) -> None:
+        """Overwrite the whole log with already-stamped records (used by migrations)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.directory / ".lock"):
+            if self.legacy is not None:
+                self.legacy.unlink(missing_ok=True)
+            for entry in os.scandir(self.directory):
+                if entry.is_dir():
+                    shutil.rmtree(entry.path)
+                elif entry.name != ".lock":
+                    os.unlink(entry.path)
+            stamped, last_ts = [], ""
+            for r in records:
+                last_ts = max(r.get("ts") or last_ts, last_ts)
+                stamped.append({"ts": last_ts, "event_type": r.get("event_type") or "", "actor": r.get("actor"), "details": r.get("details") or {}})
+            self._write(stamped, [])
+
+    # -- reading -----------------------------------------------------------
+
+    def _read_index(self, seq: int) -> list[tuple[str, int]]:
+        path, idx = self._segment(seq), self._index_path(seq)
+        entries: list[tuple[str, int]] = []
+        try:
+            with idx.open("r", encoding="utf-8") as f:
+                for line in f:
+                    ts, _, offset = line.rstrip("\n").partition("\t")
+                    if offset.isdigit():
+                        entries.append((ts, int(offset)))
+        except FileNotFoundError:
+            pass
+        if entries or not path.exists() or path.stat().st_size == 0:
+            return entries
+        # Segment 0, or an index lost in a crash: rebuild it with one scan.
+        offset = 0
+        with path.open("rb") as f:
+            for line in f:
+                if not entries or offset - entries[-1][1] >= INDEX_INTERVAL:
+                    try:
+                        entries.append((json.loads(line)["ts"], offset))
+                    except (ValueError, KeyError):
+                        pass
+                offset += len(line)
+        if entries and self.directory.exists():
+            tmp = idx.with_name(f".{idx.name}.{os.getpid()}.tmp")
+            tmp.write_text("".join(f"{ts}\t{off}\n" for ts, off in entries), encoding="utf-8")
+            os.replace(tmp, idx)
+        return entries
+
+    def _parse_cursor(self, cursor: str | None) -> tuple[int, int] | None:
+        if not cursor:
+            return None
+        seq, _, offset = cursor.partition(":")
+        if not (seq.isdigit() and offset.isdigit()):
+            raise InvalidCursor("Malformed cursor")
+        return int(seq), int(offset)
+
+    def query(self, q: AuditQuery) -> tuple[list[dict[str, Any]], str | None]:
+        """Events matching `q` in log order, and the cursor to continue from (None when exhausted)."""
+        start = self._parse_cursor(q.cursor)
+        seqs = [s for s in self._segments() if start is None or s >= start[0]]
+        indexes = {s: self._read_index(s) for s in seqs}
+        out: list[dict[str, Any]] = []
+        for n, seq in enumerate(seqs):
+            index = indexes[seq]
+            if not index:
+                continue
+            if q.until and index[0][0] > q.until:
+                break
+            # Every event of this segment is at or before the next segment's first one.
+            following = next((indexes[s][0][0] for s in seqs[n + 1:] if indexes[s]), None)
+            if q.since and following is not None and following < q.since:
+                continue
+            offset = 0
+            if q.since:
+                pos = bisect.bisect_left([ts for ts, _ in index], q.since)
+                offset = index[pos - 1][1] if pos else 0
+            if start is not None and seq == start[0]:
+                offset = max(offset, start[1])
+            with self._segment(seq).open("rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # being written right now
+                    offset += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    ts = record.get("ts") or ""
+                    if q.since and ts < q.since:
+                        continue
+                    if q.until and ts > q.until:
+                        return out, None
+                    if q.event_types and record.get("event_type") not in q.event_types:
+                        continue
+                    out.append(record)
+                    if len(out) >= q.limit:
+                        return out, f"{seq}:{offset}"
+        return out, None
+
+    def read_all(self) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        for seq in self._segments():
+            try:
+                raw = self._segment(seq).read_bytes()
+            except FileNotFoundError:
+                continue
+            for line in raw.splitlines():
+                if line.strip():
+                    try:
+                        out.append(json.loads(line))
+                    except ValueError:
+                        continue
+        return out
+
+def audit_stats() -> dict[str, Any]:
+    return _commits.stats()
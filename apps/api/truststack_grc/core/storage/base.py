@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from truststack_grc.core.storage.auditlog import AuditEvent, AuditQuery
+from truststack_grc.core.storage.blobs import BlobStore
+from truststack_grc.core.storage.catalog import ProjectQuery
+from truststack_grc.core.storage.checklist_query import INDEXED_FIELDS, ChecklistQuery, project, select
+from truststack_grc.core.storage.uploads import stage_upload
+
+def safe_filename(name: str) -> str:
+    name = name.strip().replace("\\", "_").replace("/", "_")
+    name = "".join(ch for ch in name if ch.isalnum() or ch in {"-", "_", ".", " "}).strip()
+    return name[:120] or "upload.bin"
+
+@dataclass(frozen=True)
+class StoragePaths:
+    workspace_root: Path
+
+class RevisionConflict(Exception):
+    """The checklist is no longer at the revision the caller based its change on."""
+
+    def __init__(self, revision: int):
+        super().__init__(f"Checklist is at revision {revision}")
+        self.revision = revision
+
+class ProjectNotFound(Exception):
+    """The project does not exist, e.g. it was deleted while a write was on its way."""
+
+ItemUpdate = Callable[[dict[str, Any]], None]
+
+@dataclass
+class ChangeSet:
+    """Item updates applied together as one checklist revision.
+
+    `expected_revision` makes the change conditional (optimistic concurrency);
+    a tuple accepts any of the listed revisions.
+    `items` (updated copies, None for unknown ids), `revision` and `conflict`
+    are filled in by `Storage.apply_changes`.
+    """
+
+    updates: list[tuple[str, ItemUpdate]]
+    expected_revision: int | tuple[int, ...] | None = None
+    items: list[dict[str, Any] | None] = field(default_factory=list)
+    revision: int | None = None
+    conflict: bool = False
+
+    @property
+    def applied(self) -> bool:
+        return not self.conflict and any(it is not None for it in self.items)
+
+def revision_matches(expected: int | tuple[int, ...] | None, revision: int) -> bool:
+    if expected is None:
+        return True
+    return revision in expected if isinstance(expected, tuple) else revision == expected
+
+def apply_changesets(index: dict[str, dict[str, Any]], changesets: list[ChangeSet], revision: int) -> tuple[int, list[tuple[str, dict[str, Any], int]]]:
+    """Apply `changesets` in order to the items in `index` (mutated in place).
+
+    Returns the resulting revision and (item_id, changed fields, revision) for
+    every item change, which is what backends persist.
+    """
+    changes: list[tuple[str, dict[str, Any], int]] = []
+    for cs in changesets:
+        if not revision_matches(cs.expected_revision, revision):
+            cs.conflict, cs.revision = True, revision
+            continue
+        pending: list[tuple[str, dict[str, Any]]] = []
+        for item_id, update in cs.updates:
+            item = index.get(item_id)
+            if item is None:
+                cs.items.append(None)
+                continue
+            before = copy.deepcopy(item)
+            update(item)
+            fields = {k: copy.deepcopy(v) for k, v in item.items() if k not in before or before[k] != v}
+            if fields:
+                pending.append((item_id, fields))
+            cs.items.append(copy.deepcopy(item))
+        if pending:
+            revision += 1
+            changes.extend((item_id, fields, revision) for item_id, fields in pending)
+        cs.revision = revision
+    return revision, changes
+
+class Storage(ABC):
+    """Project persistence backend.
+
+    Backends own project documents, checklists and audit events. Evidence
+    bytes live in the workspace's content-addressed `blobs` store (older
+    evidence under `project_dir`), report exports under `project_dir`.
+    Item-level operations have generic read-modify-write defaults that
+    backends with finer-grained storage override.
+    """
+
+    def __init__(self, paths: StoragePaths):
+        self.paths = paths
+        self.paths.workspace_root.mkdir(parents=True, exist_ok=True)
+        self.blobs = BlobStore(self.paths.workspace_root / ".blobs")
+
+    def project_dir(self, project_id: str) -> Path:
+        return self.paths.workspace_root / project_id
+
+    @abstractmethod
+    def list_projects(self) -> list[dict[str, Any]]: ...
+
+    @abstractmethod
+    def query_projects(self, query: ProjectQuery) -> tuple[list[dict[str, Any]], str | None]:
+        """A page of project catalog entries and the cursor of the next page (raises InvalidCursor)."""
+
+    @abstractmethod
+    def read_project(self, project_id: str) -> dict[str, Any] | None: ...
+
+    @abstractmethod
+    def write_project(self, project_id: str, data: dict[str, Any], create: bool = False) -> None:
+        """Store the project document; raises ProjectNotFound if the project does not exist,
+        unless `create`."""
+
+    @abstractmethod
+    def read_checklist(self, project_id: str) -> dict[str, Any] | None: ...
+
+    @abstractmethod
+    def write_checklist(self, project_id: str, data: dict[str, Any], expected_revision: int | None = None) -> int:
+        """Replace the checklist as a new revision and return it; raises RevisionConflict if
+        `expected_revision` is given and no longer current, ProjectNotFound if the project
+        does not exist."""
+
+    @abstractmethod
+    def apply_changes(self, project_id: str, changesets: list[ChangeSet], updated_at: str | None = None) -> bool:
+        """Apply `changesets` with a single persistence step, touching the project with
+        `updated_at` if anything applied; returns False if the project has no checklist."""
+
+    @abstractmethod
+    def delete_project(self, project_id: str) -> bool:
+        """Remove the project and its directory, releasing its evidence blob references."""
+
+    @abstractmethod
+    def append_audit(self, project_id: str, event_type: str, actor: str, details: dict[str, Any]) -> None: ...
+
+    def append_audit_events(self, project_id: str, events: list[AuditEvent]) -> None:
+        for e in events:
+            self.append_audit(project_id, e.event_type, e.actor, e.details)
+
+    @abstractmethod
+    def read_audit(self, project_id: str) -> list[dict[str, Any]]: ...
+
+    @abstractmethod
+    def query_audit(self, project_id: str, query: AuditQuery) -> tuple[list[dict[str, Any]], str | None]:
+        """Audit events in `query`'s time range and types, oldest first, and the cursor of the
+        next page (raises InvalidCursor)."""
+
+    @abstractmethod
+    def replace_audit(self, project_id: str, records: list[dict[str, Any]]) -> None:
+        """Overwrite the project's audit trail with already-stamped records (used by migrations)."""
+
+    def touch_project(self, project_id: str, updated_at: str) -> None:
+        proj = self.read_project(project_id)
+        if proj is None:
+            return
+        proj.setdefault("project", {})["updated_at"] = updated_at
+        self.write_project(project_id, proj)
+
+    def read_checklist_item(self, project_id: str, item_id: str) -> dict[str, Any] | None:
+        checklist = self.read_checklist(project_id)
+        if not checklist:
+            return None
+        for it in checklist.get("items", []):
+            if it.get("item_id") == item_id:
+                return it
+        return None
+
+    def read_checklist_header(self, project_id: str) -> dict[str, Any] | None:
+        """The checklist document without its items (use `query_checklist` to page through them)."""
+        checklist = self.read_checklist(project_id)
+        if checklist is None:
+            return None
+        return {k: v for k, v in checklist.items() if k != "items"}
+
+    def query_checklist(self, project_id: str, query: ChecklistQuery) -> dict[str, Any] | None:
+        """A page of checklist items: {revision, total, items, next_cursor}, `total` counting
+        every item that matches the filters (raises InvalidCursor)."""
+        checklist = self.read_checklist(project_id)
+        if checklist is None:
+            return None
+        items = checklist.get("items", [])
+        rows = [{**{k: it.get(k) for k in INDEXED_FIELDS}, "position": n} for n, it in enumerate(items)]
+        page, total, next_cursor = select(rows, query)
+        return {
+            "revision": checklist.get("revision", 0),
+            "total": total,
+            "items": [project(items[r["position"]], query.fields) for r in page],
+            "next_cursor": next_cursor,
+        }
+
+    def update_checklist_item(self, project_id: str, item_id: str, update: ItemUpdate) -> dict[str, Any] | None:
+        """Apply `update` to one checklist item, persist it and return the updated item."""
+        cs = ChangeSet([(item_id, update)])
+        if not self.apply_changes(project_id, [cs]):
+            return None
+        return cs.items[0]
+
+    async def save_evidence_upload(self, project_id: str, item_id: str, upload: Any, max_bytes: int = 0) -> dict[str, Any]:
+        """Stream `upload` into the blob store and reference it from the project.
+
+        Raises UploadTooLarge past `max_bytes`. Content that is already stored
+        is not written again.
+        """
+        staged = await stage_upload(upload, self.blobs.staging_dir, max_bytes)
+        await asyncio.to_thread(self.blobs.put_file, staged.path, staged.sha256, project_id)
+        return {
+            "file_name": safe_filename(getattr(upload, "filename", None) or "upload.bin"),
+            "blob": staged.sha256,
+            "sha256": staged.sha256,
+            "bytes": staged.size,
+        }
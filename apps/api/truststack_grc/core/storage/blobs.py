@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import glob
+import os
+import shutil
+from pathlib import Path
+
+from truststack_grc.core.storage.locks import file_lock
+
+class BlobStore:
+    """Content-addressed evidence files shared by all projects of a workspace.
+
+    Layout under `root`:
+        sha256/<2>/<digest>            the bytes, written once
+        refs/<2>/<digest>/<owner>      one empty marker per referencing project
+        tmp/                           uploads being received
+    A blob is deleted when its last reference is released. Reference changes
+    and blob creation/removal for a shard happen under the shard's lock.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    @property
+    def staging_dir(self) -> Path:
+        return self.root / "tmp"
+
+    def path(self, digest: str) -> Path:
+        return self.root / "sha256" / digest[:2] / digest
+
+    def _refs(self, digest: str) -> Path:
+        return self.root / "refs" / digest[:2] / digest
+
+    def _lock(self, digest: str):
+        shard = self.root / "refs" / digest[:2]
+        shard.mkdir(parents=True, exist_ok=True)
+        return file_lock(shard / ".lock")
+
+    def put_file(self, staged: Path, digest: str, owner: str) -> bool:
+        """Adopt `staged` (same filesystem) as blob `digest` referenced by `owner`.
+
+        Returns False when the blob already existed; `staged` is then discarded
+        and nothing is rewritten.
+        """
+        with self._lock(digest):
+            self._add_ref(digest, owner)
+            target = self.path(digest)
+            if target.exists():
+                staged.unlink(missing_ok=True)
+                return False
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, target)
+            return True
+
+    def add_ref(self, digest: str, owner: str) -> bool:
+        """Reference an existing blob; returns False if there is no such blob."""
+        with self._lock(digest):
+            if not self.path(digest).exists():
+                return False
+            self._add_ref(digest, owner)
+            return True
+
+    def copy_from(self, other: "BlobStore", digest: str, owner: str) -> None:
+        """Reference blob `digest` from `other` (another workspace), copying the bytes if missing here."""
+        if self.add_ref(digest, owner):
+            return
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        staged = self.staging_dir / f".copy.{digest}.{os.getpid()}"
+        shutil.copyfile(other.path(digest), staged)
+        self.put_file(staged, digest, owner)
+
+    def _add_ref(self, digest: str, owner: str) -> None:
+        refs = self._refs(digest)
+        refs.mkdir(parents=True, exist_ok=True)
+        (refs / owner).touch()
+
+    def refcount(self, digest: str) -> int:
+        try:
+            return sum(1 for _ in self._refs(digest).iterdir())
+        except FileNotFoundError:
+            return 0
+
+    def release(self, owner: str) -> list[str]:
+        """Drop every reference held by `owner`; returns the digests whose blobs were deleted."""
+        removed: list[str] = []
+        for marker in self.root.glob(f"refs/*/*/{glob.escape(owner)}"):
+            digest = marker.parent.name
+            with self._lock(digest):
+                marker.unlink(missing_ok=True)
+                try:
+                    marker.parent.rmdir()
+                except OSError:
+                    continue  # still referenced
+                self.path(digest).unlink(missing_ok=True)
+                removed.append(digest)
+        return removed
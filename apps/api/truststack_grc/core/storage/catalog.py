@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from truststack_grc.core.storage.db import connect, dumps, read_transaction, write_transaction
+
+# One row per project with just what project lists show and filter on.
+# Storage backends keep it current on every project/checklist write.
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS project_catalog (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    description TEXT,
+    industry_id TEXT,
+    segment_id TEXT,
+    use_case_id TEXT,
+    deployment_environment TEXT,
+    created_at TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT '',
+    items_total INTEGER NOT NULL DEFAULT 0,
+    counts TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS project_catalog_updated ON project_catalog(updated_at, id);
+CREATE INDEX IF NOT EXISTS project_catalog_created ON project_catalog(created_at, id);
+CREATE INDEX IF NOT EXISTS project_catalog_name ON project_catalog(name, id);
+"""
+
+SortField = Literal["updated_at", "created_at", "name", "items_total"]
+FILTER_FIELDS = ("industry_id", "segment_id", "use_case_id", "deployment_environment")
+
+class InvalidCursor(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class ProjectQuery:
+    q: str | None = None
+    industry_id: str | None = None
+    segment_id: str | None = None
+    use_case_id: str | None = None
+    deployment_environment: str | None = None
+    sort: SortField = "updated_at"
+    order: Literal["asc", "desc"] = "desc"
+    limit: int = 100
+    cursor: str | None = None
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+def upsert(conn: sqlite3.Connection, project_id: str, data: dict[str, Any]) -> None:
+    """Index a project document; checklist counts are kept, updated_at only moves forward."""
+    project = data.get("project") or {}
+    inputs = data.get("inputs") or {}
+    conn.execute(
+        "INSERT INTO project_catalog (id, name, description, industry_id, segment_id, use_case_id, deployment_environment, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET name = excluded.name, description = excluded.description, "
+        "industry_id = excluded.industry_id, segment_id = excluded.segment_id, use_case_id = excluded.use_case_id, "
+        "deployment_environment = excluded.deployment_environment, created_at = excluded.created_at, "
+        "updated_at = MAX(project_catalog.updated_at, excluded.updated_at)",
+        (
+            project_id, _text(project.get("name")), project.get("description"), inputs.get("industry_id"), inputs.get("segment_id"),
+            inputs.get("use_case_id"), inputs.get("deployment_environment"), _text(project.get("created_at")), _text(project.get("updated_at")),
+        ),
+    )
+
+def set_counts(conn: sqlite3.Connection, project_id: str, counts: dict[str, Any]) -> None:
+    conn.execute(
+        "UPDATE project_catalog SET items_total = ?, counts = ? WHERE id = ?",
+        (int(counts.get("total") or 0), dumps(counts), project_id),
+    )
+
+def touch(conn: sqlite3.Connection, project_id: str, updated_at: str) -> None:
+    conn.execute("UPDATE project_catalog SET updated_at = MAX(updated_at, ?) WHERE id = ?", (updated_at, project_id))
+
+def remove(conn: sqlite3.Connection, project_id: str) -> None:
+    conn.execute("DELETE FROM project_catalog WHERE id = ?", (project_id,))
+
+def contains(conn: sqlite3.Connection, project_id: str) -> bool:
+    return conn.execute("SELECT 1 FROM project_catalog WHERE id = ?", (project_id,)).fetchone() is not None
+
+def indexed_ids(conn: sqlite3.Connection) -> set[str]:
+    return {row[0] for row in conn.execute("SELECT id FROM project_catalog")}
+
+_COLUMNS = ("id", "name", "description", "industry_id", "segment_id", "use_case_id", "deployment_environment", "created_at", "updated_at", "counts")
+
+def _encode_cursor(query: ProjectQuery, value: Any, project_id: str) -> str:
+    raw = json.dumps([query.sort, query.order, value, project_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode_cursor(query: ProjectQuery) -> tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(query.cursor + "=" * (-len(query.cursor) % 4))  # type: ignore[operator]
+        sort, order, value, project_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if (sort, order) != (query.sort, query.order):
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    return value, project_id
+
+def search(conn: sqlite3.Connection, query: ProjectQuery) -> tuple[list[dict[str, Any]], str | None]:
+    """One page of catalog entries and the cursor of the next page (None on the last page)."""
+    if query.sort not in SortField.__args__:  # type: ignore[attr-defined]
+        raise ValueError(f"Unsupported sort field: {query.sort}")
+    direction = "DESC" if query.order == "desc" else "ASC"
+    where: list[str] = []
+    params: list[Any] = []
+    for name in FILTER_FIELDS:
+        value = getattr(query, name)
+        if value is not None:
+            where.append(f"{name} = ?")
+            params.append(value)
+    if query.q:
+        pattern = "%" + query.q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        where.append("(name LIKE ? ESCAPE '\\' OR id LIKE ? ESCAPE '\\')")
+        params += [pattern, pattern]
+    if query.cursor:
+        value, after_id = _decode_cursor(query)
+        where.append(f"({query.sort}, id) {'<' if direction == 'DESC' else '>'} (?, ?)")
+        params += [value, after_id]
+    sql = f"SELECT {', '.join(_COLUMNS)}, {query.sort} FROM project_catalog"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {query.sort} {direction}, id {direction} LIMIT ?"
+    rows = conn.execute(sql, params + [query.limit + 1]).fetchall()
+
+    entries = []
+    for row in rows[:query.limit]:
+        entry = dict(zip(_COLUMNS, row))
+        entry["counts"] = json.loads(entry["counts"])
+        entries.append(entry)
+    next_cursor = None
+    if len(rows) > query.limit:
+        last = rows[query.limit - 1]
+        next_cursor = _encode_cursor(query, last[-1], last[0])
+    return entries, next_cursor
+
+class ProjectCatalog:
+    """Standalone catalog database, for backends that do not keep one of their own."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def conn(self) -> sqlite3.Connection:
+        return connect(self.path, CATALOG_SCHEMA, derived=True)
+
+    def write(self):
+        return write_transaction(self.conn())
+
+    def read(self):
+        return read_transaction(self.conn())
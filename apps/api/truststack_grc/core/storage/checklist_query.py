@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from truststack_grc.core.mapping.engine import SEVERITY_RANK
+from truststack_grc.core.storage.catalog import InvalidCursor
+
+ChecklistSort = Literal["position", "severity", "status", "domain", "title", "owner"]
+FILTER_FIELDS = ("status", "domain", "severity", "category", "owner")
+# Item fields an item index must carry to filter and sort without reading items.
+INDEXED_FIELDS = ("status", "domain", "severity", "category", "owner", "title")
+
+@dataclass(frozen=True)
+class ChecklistQuery:
+    """A page of checklist items. Filters match any of their values; empty `fields` returns whole items."""
+
+    status: tuple[str, ...] = ()
+    domain: tuple[str, ...] = ()
+    severity: tuple[str, ...] = ()
+    category: tuple[str, ...] = ()
+    owner: tuple[str, ...] = ()
+    fields: tuple[str, ...] = ()
+    sort: ChecklistSort = "position"
+    order: Literal["asc", "desc"] = "asc"
+    limit: int = 100
+    cursor: str | None = None
+
+def sort_value(sort: str, row: dict[str, Any]) -> Any:
+    if sort == "position":
+        return row["position"]
+    if sort == "severity":
+        return SEVERITY_RANK.get(row.get("severity"), 0)
+    value = row.get(sort)
+    return "" if value is None else str(value)
+
+def encode_cursor(query: ChecklistQuery, value: Any, position: int) -> str:
+    raw = json.dumps([query.sort, query.order, value, position], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(query: ChecklistQuery) -> tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(query.cursor + "=" * (-len(query.cursor) % 4))  # type: ignore[operator]
+        sort, order, value, position = json.loads(raw)
+        position = int(position)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if (sort, order) != (query.sort, query.order):
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    if not isinstance(value, int if sort in ("position", "severity") else str):
+        raise InvalidCursor("Malformed cursor")
+    return value, position
+
+def select(rows: list[dict[str, Any]], query: ChecklistQuery) -> tuple[list[dict[str, Any]], int, str | None]:
+    """Filter, sort and page index rows (indexed fields plus `position`).
+
+    Returns the page, the number of rows matching the filters and the cursor
+    of the next page (None on the last page).
+    """
+    if query.sort not in ChecklistSort.__args__:  # type: ignore[attr-defined]
+        raise ValueError(f"Unsupported sort field: {query.sort}")
+    wanted = {name: set(getattr(query, name)) for name in FILTER_FIELDS if getattr(query, name)}
+    matching = [r for r in rows if all(r.get(name) in values for name, values in wanted.items())]
+    desc = query.order == "desc"
+
+    def key(r: dict[str, Any]) -> tuple[Any, int]:
+        return sort_value(query.sort, r), r["position"]
+
+    matching.sort(key=key, reverse=desc)
+    total = len(matching)
+    if query.cursor:
+        after = decode_cursor(query)
+        matching = [r for r in matching if (key(r) < after if desc else key(r) > after)]
+    page = matching[:query.limit]
+    next_cursor = None
+    if len(matching) > query.limit:
+        last = page[-1]
+        next_cursor = encode_cursor(query, sort_value(query.sort, last), last["position"])
+    return page, total, next_cursor
+
+def project(item: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+    """`item` reduced to `fields` (item_id is always kept)."""
+    if not fields:
+        return item
+    return {k: v for k, v in item.items() if k == "item_id" or k in fields}
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+_local = threading.local()
+_migrated: set[str] = set()
+# Inode of each primary database when this process first opened it.
+_opened: dict[str, int | None] = {}
+_init_lock = threading.Lock()
+
+class DatabaseReplaced(Exception):
+    """A primary database file was deleted or replaced while the process was using it."""
+
+def _inode(path: Path) -> int | None:
+    try:
+        return path.stat().st_ino
+    except FileNotFoundError:
+        return None
+
+def connect(path: Path, schema: str, migrate: Callable[[sqlite3.Connection], None] | None = None, derived: bool = False) -> sqlite3.Connection:
+    """Per-thread autocommit connection to `path` in WAL mode.
+
+    `schema` (idempotent DDL) runs on every new connection, `migrate` once per
+    process. For a `derived` database (rebuildable from other data) a
+    connection whose file was deleted or replaced is reopened, so it can be
+    removed while the process runs; for any other database that raises
+    DatabaseReplaced instead of silently starting over with an empty one.
+    """
+    # One connection per thread and database; FastAPI runs sync endpoints in a thread pool.
+    conns: dict[str, tuple[sqlite3.Connection, int | None]] = _local.__dict__.setdefault("conns", {})
+    key = str(path)
+    inode = _inode(path)
+    cached = conns.get(key)
+    if cached is not None and cached[1] is not None and cached[1] == inode:
+        return cached[0]
+    if not derived and key in _opened and _opened[key] != inode:
+        raise DatabaseReplaced(f"Database {path} was deleted or replaced while in use")
+    if cached is not None:
+        cached[0].close()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(key, isolation_level=None, timeout=30.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _init_lock:
+        conn.executescript(schema)
+        if migrate is not None and key not in _migrated:
+            migrate(conn)
+            _migrated.add(key)
+        if not derived:
+            _opened.setdefault(key, _inode(path))
+    conns[key] = (conn, _inode(path))
+    return conn
+
+@contextmanager
+def write_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    # Take the write lock up front so concurrent writers queue instead of failing to upgrade.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+@contextmanager
+def read_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    # Several SELECTs from one snapshot.
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.execute("COMMIT")
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.storage.base import Storage
+
+def get_storage(backend: str | None = None) -> Storage:
+    """Storage backend selected by TRUSTSTACK_STORAGE (or `backend`)."""
+    backend = backend or get_settings().storage_backend
+    if backend == "filesystem":
+        from truststack_grc.core.storage.filesystem import FileSystemStorage
+        return FileSystemStorage.from_env()
+    if backend == "sqlite":
+        from truststack_grc.core.storage.sqlite import SQLiteStorage
+        return SQLiteStorage.from_env()
+    raise ValueError(f"Unknown storage backend: {backend}")
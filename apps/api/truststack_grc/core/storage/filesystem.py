@@ -1,36 +1,144 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from pathlib import Path
+import copy
+import json
+import os
+import pickle
 import shutil
-from typing import Any
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Iterator
 
 from truststack_grc.config import get_settings
+from truststack_grc.core.util.fingerprint import file_signature
 from truststack_grc.core.util.yamlio import read_yaml, write_yaml
-from truststack_grc.core.storage.auditlog import append_event, AuditEvent
-from truststack_grc.core.storage.hashing import sha256_file
+from truststack_grc.core.mapping.engine import summarize
+from truststack_grc.core.storage import catalog, itemindex
+from truststack_grc.core.storage.auditlog import AuditEvent, AuditLog, AuditQuery
+from truststack_grc.core.storage.base import ChangeSet, ProjectNotFound, RevisionConflict, Storage, StoragePaths, apply_changesets, safe_filename  # noqa: F401 (re-exported)
+from truststack_grc.core.storage.checklist_query import ChecklistQuery, project, select
+from truststack_grc.core.storage.locks import file_lock
+
+# Checklist mutations are appended to a per-project journal instead of
+# rewriting checklist.yaml; reads replay it over the base document.
+#   {"op": "set", "item_id": ..., "fields": {...}, "rev": n}   new values of changed item fields
+#   {"op": "touch", "updated_at": ...}               project.updated_at (max wins)
+# Compaction renames the journal to *.compacting, folds it into the base off
+# the lock, and swaps the result in atomically. Every record is idempotent, so
+# replaying a journal that was already folded in (after a crash) is harmless.
+JOURNAL = "checklist.journal.ndjson"
+COMPACTING = "checklist.journal.compacting"
+LOCK = ".lock"
+
+_PARSED_MAX = 128
+_parsed: OrderedDict[str, tuple[Any, bytes]] = OrderedDict()
+_parsed_lock = threading.Lock()
+
+_compactions: set[str] = set()
+_compactions_lock = threading.Lock()
+
+def _read_yaml_cached(path: Path) -> dict[str, Any] | None:
+    """read_yaml memoized by file signature; always returns a private copy."""
+    sig = file_signature(path)
+    if sig is None:
+        return None
+    key = str(path)
+    with _parsed_lock:
+        hit = _parsed.get(key)
+        if hit is not None and hit[0] == sig:
+            _parsed.move_to_end(key)
+            return pickle.loads(hit[1])
+    data = read_yaml(path)
+    with _parsed_lock:
+        _parsed[key] = (sig, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        _parsed.move_to_end(key)
+        while len(_parsed) > _PARSED_MAX:
+            _parsed.popitem(last=False)
+    return data
 
-def safe_filename(name: str) -> str:
-    name = name.strip().replace("\\", "_").replace("/", "_")
-    name = "".join(ch for ch in name if ch.isalnum() or ch in {"-", "_", ".", " "}).strip()
-    return name[:120] or "upload.bin"
+def _read_records(path: Path) -> list[dict[str, Any]]:
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return []
+    out = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            out.append(json.loads(line))
+        except ValueError:
+            # Torn write from a killed worker; the record was never acknowledged.
+            continue
+    return out
 
-@dataclass(frozen=True)
-class StoragePaths:
-    workspace_root: Path
+def _latest_touch(records: list[dict[str, Any]]) -> str | None:
+    touches = [r["updated_at"] for r in records if r.get("op") == "touch" and r.get("updated_at")]
+    return max(touches) if touches else None
 
-class FileSystemStorage:
+def _replay(checklist: dict[str, Any], records: list[dict[str, Any]]) -> dict[str, Any]:
+    index = {it.get("item_id"): it for it in checklist.get("items", [])}
+    revision = int(checklist.get("revision") or 0)
+    for r in records:
+        if r.get("op") == "set":
+            item = index.get(r.get("item_id"))
+            if item is not None:
+                item.update(r.get("fields") or {})
+            revision = max(revision, int(r.get("rev") or 0))
+    checklist["revision"] = revision
+    return checklist
+
+def _item_changes(records: list[dict[str, Any]], revision: int) -> tuple[dict[str, dict[str, Any]], int]:
+    # Latest journaled value of every changed field, per item, and the resulting revision.
+    changes: dict[str, dict[str, Any]] = {}
+    for r in records:
+        if r.get("op") == "set":
+            changes.setdefault(r.get("item_id"), {}).update(r.get("fields") or {})
+            revision = max(revision, int(r.get("rev") or 0))
+    return changes, revision
+
+class FileSystemStorage(Storage):
     def __init__(self, paths: StoragePaths):
-        self.paths = paths
-        self.paths.workspace_root.mkdir(parents=True, exist_ok=True)
+        super().__init__(paths)
+        # Derived from the project directories and rebuilt from them if deleted.
+        self.catalog = catalog.ProjectCatalog(paths.workspace_root / ".catalog.sqlite3")
 
     @classmethod
     def from_env(cls) -> "FileSystemStorage":
         settings = get_settings()
         return cls(paths=StoragePaths(workspace_root=settings.workspace_root))
 
-    def project_dir(self, project_id: str) -> Path:
-        return self.paths.workspace_root / project_id
+    def _lock(self, project_id: str, shared: bool = False):
+        return file_lock(self.project_dir(project_id) / LOCK, shared=shared)
+
+    @contextmanager
+    def _write_lock(self, project_id: str, create: bool = False) -> Iterator[None]:
+        # Exclusive lock for a full document write. The lock file lives in the project
+        # directory, so a project deleted meanwhile (renamed away under this lock) is
+        # reported instead of being brought back with just the file being written.
+        if create:
+            self.project_dir(project_id).mkdir(parents=True, exist_ok=True)
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(self._lock(project_id))
+            except FileNotFoundError:
+                raise ProjectNotFound(project_id) from None
+            yield
+
+    def _journals(self, project_id: str) -> list[dict[str, Any]]:
+        d = self.project_dir(project_id)
+        return _read_records(d / COMPACTING) + _read_records(d / JOURNAL)
+
+    def _with_touch(self, project_id: str, data: dict[str, Any]) -> dict[str, Any]:
+        # Touch records only ever raise updated_at, so they can be read without the lock.
+        touched = _latest_touch(self._journals(project_id))
+        project = data.get("project")
+        if touched and isinstance(project, dict) and touched > str(project.get("updated_at") or ""):
+            project["updated_at"] = touched
+        return data
 
     def list_projects(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
@@ -38,63 +146,300 @@ class FileSystemStorage:
             proj_path = d / "project.yaml"
             if proj_path.exists():
                 try:
-                    data = read_yaml(proj_path)
-                    out.append(data.get("project", {"id": d.name}))
+                    data = _read_yaml_cached(proj_path)
+                    if data is None:
+                        continue
+                    out.append(self._with_touch(d.name, data).get("project", {"id": d.name}))
                 except Exception:
                     out.append({"id": d.name, "name": d.name})
         return out
 
+    def query_projects(self, query: catalog.ProjectQuery) -> tuple[list[dict[str, Any]], str | None]:
+        self._sync_catalog()
+        with self.catalog.read() as conn:
+            return catalog.search(conn, query)
+
+    def _sync_catalog(self) -> None:
+        # Pick up project directories the catalog has not seen (existing workspaces,
+        # a deleted catalog file) and forget removed ones. Costs one directory scan.
+        on_disk = {e.name for e in os.scandir(self.paths.workspace_root) if e.is_dir() and not e.name.startswith(".")}
+        with self.catalog.read() as conn:
+            indexed = catalog.indexed_ids(conn)
+        for project_id in sorted(on_disk - indexed):
+            data = self.read_project(project_id)
+            if data is None:
+                continue
+            checklist = self.read_checklist(project_id)
+            with self.catalog.write() as conn:
+                if catalog.contains(conn, project_id):
+                    continue  # indexed by a concurrent write meanwhile
+                catalog.upsert(conn, project_id, data)
+                if checklist is not None:
+                    catalog.set_counts(conn, project_id, summarize(checklist.get("items", [])))
+        if indexed - on_disk:
+            with self.catalog.write() as conn:
+                for project_id in indexed - on_disk:
+                    catalog.remove(conn, project_id)
+
     def read_project(self, project_id: str) -> dict[str, Any] | None:
         path = self.project_dir(project_id) / "project.yaml"
-        if not path.exists():
+        # Journals first: compaction folds touches into project.yaml before dropping them.
+        touched = _latest_touch(self._journals(project_id))
+        data = _read_yaml_cached(path)
+        if data is None:
             return None
-        return read_yaml(path)
+        project = data.get("project")
+        if touched and isinstance(project, dict) and touched > str(project.get("updated_at") or ""):
+            project["updated_at"] = touched
+        return data
+
+    def write_project(self, project_id: str, data: dict[str, Any], create: bool = False) -> None:
+        with self._write_lock(project_id, create):
+            write_yaml(self.project_dir(project_id) / "project.yaml", data)
+            with self.catalog.write() as conn:
+                catalog.upsert(conn, project_id, data)
 
-    def write_project(self, project_id: str, data: dict[str, Any]) -> None:
-        write_yaml(self.project_dir(project_id) / "project.yaml", data)
+    def _materialize(self, project_id: str) -> dict[str, Any] | None:
+        # Caller holds the project lock (shared or exclusive).
+        checklist = _read_yaml_cached(self.project_dir(project_id) / "checklist.yaml")
+        if checklist is None:
+            return None
+        return _replay(checklist, self._journals(project_id))
 
     def read_checklist(self, project_id: str) -> dict[str, Any] | None:
-        path = self.project_dir(project_id) / "checklist.yaml"
-        if not path.exists():
+        if not (self.project_dir(project_id) / "checklist.yaml").exists():
+            return None
+        try:
+            with self._lock(project_id, shared=True):
+                return self._materialize(project_id)
+        except FileNotFoundError:
             return None
-        return read_yaml(path)
 
-    def write_checklist(self, project_id: str, data: dict[str, Any]) -> None:
-        write_yaml(self.project_dir(project_id) / "checklist.yaml", data)
+    def _item_index(self, project_id: str) -> dict[str, Any] | None:
+        # Caller holds the project lock (shared or exclusive).
+        d = self.project_dir(project_id)
+        base_sig = file_signature(d / "checklist.yaml")
+        if base_sig is None:
+            return None
+        index = itemindex.load(d / itemindex.ITEM_INDEX, base_sig)
+        if index is None:
+            checklist = _read_yaml_cached(d / "checklist.yaml")
+            if checklist is None:
+                return None
+            index = itemindex.build(d / itemindex.ITEM_INDEX, checklist, base_sig)
+        return index
+
+    def read_checklist_header(self, project_id: str) -> dict[str, Any] | None:
+        if not (self.project_dir(project_id) / "checklist.yaml").exists():
+            return None
+        try:
+            with self._lock(project_id, shared=True):
+                index = self._item_index(project_id)
+                if index is None:
+                    return None
+                header = copy.deepcopy(index["header"])
+                _, header["revision"] = _item_changes(self._journals(project_id), int(header.get("revision") or 0))
+        except FileNotFoundError:
+            return None
+        return header
+
+    def query_checklist(self, project_id: str, query: ChecklistQuery) -> dict[str, Any] | None:
+        d = self.project_dir(project_id)
+        if not (d / "checklist.yaml").exists():
+            return None
+        try:
+            with self._lock(project_id, shared=True):
+                index = self._item_index(project_id)
+                if index is None:
+                    return None
+                overlay, revision = _item_changes(self._journals(project_id), int(index["header"].get("revision") or 0))
+                page, total, next_cursor = select(itemindex.rows(index, overlay), query)
+                items = itemindex.read_items(d / itemindex.ITEM_INDEX, index, page)
+        except FileNotFoundError:
+            return None
+        return {
+            "revision": revision,
+            "total": total,
+            "items": [project({**it, **overlay.get(it.get("item_id"), {})}, query.fields) for it in items],
+            "next_cursor": next_cursor,
+        }
+
+    def write_checklist(self, project_id: str, data: dict[str, Any], expected_revision: int | None = None) -> int:
+        d = self.project_dir(project_id)
+        with self._write_lock(project_id):
+            current = self._materialize(project_id)
+            revision = current["revision"] if current is not None else 0
+            if expected_revision is not None and expected_revision != revision:
+                raise RevisionConflict(revision)
+            touched = _latest_touch(self._journals(project_id))
+            write_yaml(d / "checklist.yaml", {**data, "revision": revision + 1})
+            with self.catalog.write() as conn:
+                catalog.set_counts(conn, project_id, summarize(data.get("items", [])))
+            # The new document supersedes every journaled item change; keep only the latest touch.
+            if touched:
+                self._write_journal(d / JOURNAL, [{"op": "touch", "updated_at": touched}])
+            else:
+                (d / JOURNAL).unlink(missing_ok=True)
+            (d / COMPACTING).unlink(missing_ok=True)
+        return revision + 1
+
+    @staticmethod
+    def _write_journal(path: Path, records: list[dict[str, Any]]) -> None:
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _append(self, project_id: str, records: list[dict[str, Any]]) -> None:
+        # Caller holds the exclusive project lock. One write and fsync per batch.
+        path = self.project_dir(project_id) / JOURNAL
+        line = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+        with path.open("ab+") as f:
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Seal a torn record left by a crash so it cannot swallow this one.
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        if size >= get_settings().journal_compact_bytes:
+            self._schedule_compaction(project_id)
+
+    def touch_project(self, project_id: str, updated_at: str) -> None:
+        if not (self.project_dir(project_id) / "project.yaml").exists():
+            return
+        try:
+            with self._lock(project_id):
+                self._append(project_id, [{"op": "touch", "updated_at": updated_at}])
+                with self.catalog.write() as conn:
+                    catalog.touch(conn, project_id, updated_at)
+        except FileNotFoundError:
+            return
+
+    def apply_changes(self, project_id: str, changesets: list[ChangeSet], updated_at: str | None = None) -> bool:
+        if not (self.project_dir(project_id) / "checklist.yaml").exists():
+            return False
+        try:
+            with self._lock(project_id):
+                checklist = self._materialize(project_id)
+                if checklist is None:
+                    return False
+                index = {it.get("item_id"): it for it in checklist.get("items", [])}
+                _, changes = apply_changesets(index, changesets, checklist["revision"])
+                records = [{"op": "set", "item_id": item_id, "fields": fields, "rev": rev} for item_id, fields, rev in changes]
+                touched = bool(updated_at) and any(cs.applied for cs in changesets)
+                if touched:
+                    records.append({"op": "touch", "updated_at": updated_at})
+                if records:
+                    self._append(project_id, records)
+                    with self.catalog.write() as conn:
+                        if changes:
+                            catalog.set_counts(conn, project_id, summarize(checklist.get("items", [])))
+                        if touched:
+                            catalog.touch(conn, project_id, updated_at)
+                return True
+        except FileNotFoundError:
+            return False
+
+    def _schedule_compaction(self, project_id: str) -> None:
+        key = str(self.project_dir(project_id))
+        with _compactions_lock:
+            if key in _compactions:
+                return
+            _compactions.add(key)
+
+        def run() -> None:
+            try:
+                self.compact_checklist(project_id)
+            except Exception:
+                # Best effort: the journal stays valid and the next append retries.
+                pass
+            finally:
+                with _compactions_lock:
+                    _compactions.discard(key)
+
+        threading.Thread(target=run, name=f"compact-{project_id}", daemon=True).start()
+
+    def compact_checklist(self, project_id: str) -> bool:
+        """Fold the journal into checklist.yaml / project.yaml; returns False if there was nothing to do."""
+        d = self.project_dir(project_id)
+        base, compacting = d / "checklist.yaml", d / COMPACTING
+        try:
+            with self._lock(project_id):
+                if not compacting.exists():
+                    if not (d / JOURNAL).exists():
+                        return False
+                    # New writes go to a fresh journal while we fold this one in.
+                    os.replace(d / JOURNAL, compacting)
+                base_sig = file_signature(base)
+                checklist = _read_yaml_cached(base)
+                records = _read_records(compacting)
+
+            staged: Path | None = None
+            if checklist is not None:
+                staged = d / f".checklist.yaml.{uuid.uuid4().hex}.compact"
+                # Off the lock: must not recreate the directory of a project deleted meanwhile.
+                write_yaml(staged, _replay(checklist, records), mkdir=False)
+
+            with self._lock(project_id):
+                if file_signature(base) != base_sig or not compacting.exists():
+                    # A full checklist rewrite superseded this journal meanwhile.
+                    if staged is not None:
+                        staged.unlink(missing_ok=True)
+                    return False
+                if staged is not None:
+                    os.replace(staged, base)
+                touched = _latest_touch(records)
+                proj = _read_yaml_cached(d / "project.yaml")
+                if touched and proj and isinstance(proj.get("project"), dict) and touched > str(proj["project"].get("updated_at") or ""):
+                    proj["project"]["updated_at"] = touched
+                    write_yaml(d / "project.yaml", proj)
+                compacting.unlink()
+                if staged is not None:
+                    # Index the new base while its items are at hand.
+                    itemindex.build(d / itemindex.ITEM_INDEX, checklist, file_signature(base))  # type: ignore[arg-type]
+            return True
+        except FileNotFoundError:
+            return False
 
     def delete_project(self, project_id: str) -> bool:
         proj_dir = self.project_dir(project_id)
-        if not proj_dir.exists() or not proj_dir.is_dir():
+        if not proj_dir.is_dir():
             return False
-        shutil.rmtree(proj_dir)
+        # Move the directory aside under the project lock: writers waiting for the lock then
+        # find the project gone, and none can add files while it is being removed.
+        tombstone = proj_dir.with_name(f".{proj_dir.name}.deleted-{uuid.uuid4().hex}")
+        try:
+            with self._lock(project_id):
+                os.rename(proj_dir, tombstone)
+        except FileNotFoundError:
+            return False  # deleted concurrently
+        shutil.rmtree(tombstone, ignore_errors=True)
+        with self.catalog.write() as conn:
+            catalog.remove(conn, project_id)
+        self.blobs.release(project_id)
         return True
 
-    def audit_path(self, project_id: str) -> Path:
-        return self.project_dir(project_id) / "auditlog.ndjson"
+    def audit_log(self, project_id: str) -> AuditLog:
+        d = self.project_dir(project_id)
+        return AuditLog(d / "audit", legacy=d / "auditlog.ndjson")
 
     def append_audit(self, project_id: str, event_type: str, actor: str, details: dict[str, Any]) -> None:
-        append_event(self.audit_path(project_id), AuditEvent(event_type=event_type, actor=actor, details=details))
+        self.audit_log(project_id).append([AuditEvent(event_type=event_type, actor=actor, details=details)])
 
-    def save_evidence_file(self, project_id: str, item_id: str, filename: str, content: bytes) -> dict[str, Any]:
-        proj_dir = self.project_dir(project_id)
-        evidence_dir = proj_dir / "evidence" / item_id
-        evidence_dir.mkdir(parents=True, exist_ok=True)
-        safe = safe_filename(filename)
-        target = evidence_dir / safe
-        # Avoid overwriting: add suffix
-        if target.exists():
-            stem, dot, ext = safe.partition(".")
-            i = 2
-            while True:
-                candidate = evidence_dir / f"{stem}_{i}{dot}{ext}" if dot else evidence_dir / f"{stem}_{i}"
-                if not candidate.exists():
-                    target = candidate
-                    break
-                i += 1
-        target.write_bytes(content)
-        return {
-            "file_name": target.name,
-            "relative_path": str(target.relative_to(proj_dir)),
-            "sha256": sha256_file(target),
-            "bytes": len(content),
-        }
+    def append_audit_events(self, project_id: str, events: list[AuditEvent]) -> None:
+        self.audit_log(project_id).append(events)
+
+    def read_audit(self, project_id: str) -> list[dict[str, Any]]:
+        return self.audit_log(project_id).read_all()
+
+    def query_audit(self, project_id: str, query: AuditQuery) -> tuple[list[dict[str, Any]], str | None]:
+        return self.audit_log(project_id).query(query)
+
+    def replace_audit(self, project_id: str, records: list[dict[str, Any]]) -> None:
+        self.audit_log(project_id).replace(records)
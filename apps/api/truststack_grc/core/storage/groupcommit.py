@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+class _Pending(Generic[T, R]):
+    __slots__ = ("item", "wake", "finished", "result", "error")
+
+    def __init__(self, item: T):
+        self.item = item
+        self.wake = threading.Event()
+        self.finished = False
+        self.result: R | None = None
+        self.error: BaseException | None = None
+
+class GroupCommit(Generic[T, R]):
+    """Leader/follower batching of writes to one resource.
+
+    Concurrent submitters for a key queue up; whoever finds the key idle
+    becomes the leader and hands everything queued so far to `flush` in one
+    call, then passes leadership to the oldest waiter. Items are flushed in
+    submission order. All submitters of a key must pass an equivalent `flush`.
+    """
+
+    def __init__(self, max_batch: int = 256):
+        self.max_batch = max_batch
+        self._queues: dict[Hashable, list[_Pending[T, R]]] = {}
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, key: Hashable, item: T, flush: Callable[[list[T]], list[R]]) -> R:
+        """Wait until `item` has been flushed and return its result (or raise the batch's error)."""
+        pending: _Pending[T, R] = _Pending(item)
+        with self._lock:
+            queue = self._queues.get(key)
+            lead = queue is None
+            if lead:
+                queue = self._queues[key] = []
+            queue.append(pending)
+        if not lead:
+            pending.wake.wait()
+        if not pending.finished:
+            self._lead(key, flush)
+        if pending.error is not None:
+            raise pending.error
+        return pending.result  # type: ignore[return-value]
+
+    def _lead(self, key: Hashable, flush: Callable[[list[T]], list[R]]) -> None:
+        with self._lock:
+            queue = self._queues[key]
+            batch, queue[:] = queue[:self.max_batch], queue[self.max_batch:]
+        try:
+            results = flush([p.item for p in batch])
+        except BaseException as e:
+            for p in batch:
+                p.error = e
+        else:
+            for p, result in zip(batch, results):
+                p.result = result
+        with self._lock:
+            self.batches += 1
+            self.items += len(batch)
+            if queue:
+                # Hand over to the oldest waiter; it drains whatever queued up meanwhile.
+                queue[0].wake.set()
+            else:
+                del self._queues[key]
+        for p in batch:
+            p.finished = True
+            p.wake.set()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"batches": self.batches, "items": self.items}
@@ -2,15 +2,19 @@ from __future__ import annotations
 
 import hashlib
 from pathlib import Path
+from typing import Any
 
 def sha256_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
+def _update_from_file(h: Any, path: Path) -> None:
     with path.open("rb") as f:
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    _update_from_file(h, path)
     return h.hexdigest()
 
 def sha256_text(text: str) -> str:
@@ -22,6 +26,6 @@ def sha256_dir(path: Path) -> str:
     for f in sorted(files, key=lambda p: str(p)):
         h.update(str(f.relative_to(path)).encode("utf-8"))
         h.update(b"\x00")
-        h.update(f.read_bytes())
+        _update_from_file(h, f)
         h.update(b"\x00")
     return h.hexdigest()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from truststack_grc.core.storage.checklist_query import INDEXED_FIELDS
+from truststack_grc.core.util.fingerprint import file_signature
+
+# Per-project item index, a sidecar of checklist.yaml that lets filtered reads
+# skip the items they do not return:
+#   line 1  {"base": <signature of checklist.yaml>, "header": {document keys but items},
+#            "rows": [[item_id, offset, length, <INDEXED_FIELDS values>...], ...]}
+#   then    one JSON line per item, `offset` bytes after the end of line 1
+# Derived data: it is rebuilt whenever checklist.yaml no longer matches `base`,
+# and journaled item changes are applied over it on read.
+ITEM_INDEX = "checklist.items.idx"
+
+_LOADED_MAX = 128
+_loaded: OrderedDict[str, tuple[Any, dict[str, Any]]] = OrderedDict()
+_loaded_lock = threading.Lock()
+
+def build(path: Path, checklist: dict[str, Any], base_sig: tuple[int, int, int]) -> dict[str, Any]:
+    body = bytearray()
+    rows = []
+    for item in checklist.get("items", []):
+        line = (json.dumps(item, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        rows.append([item.get("item_id"), len(body), len(line), *(item.get(name) for name in INDEXED_FIELDS)])
+        body += line
+    header = {k: v for k, v in checklist.items() if k != "items"}
+    first = (json.dumps({"base": list(base_sig), "header": header, "rows": rows}, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with tmp.open("wb") as f:
+        f.write(first)
+        f.write(body)
+    os.replace(tmp, path)
+    return {"base": list(base_sig), "header": header, "rows": rows, "start": len(first)}
+
+def load(path: Path, base_sig: tuple[int, int, int]) -> dict[str, Any] | None:
+    """The index at `path` if it was built from the checklist.yaml with signature `base_sig`."""
+    sig = file_signature(path)
+    if sig is None:
+        return None
+    key = str(path)
+    with _loaded_lock:
+        hit = _loaded.get(key)
+    if hit is not None and hit[0] == sig:
+        index = hit[1]
+    else:
+        try:
+            with path.open("rb") as f:
+                first = f.readline()
+            index = {**json.loads(first), "start": len(first)}
+        except (FileNotFoundError, ValueError):
+            return None  # replaced meanwhile or torn by a crash: rebuild
+        with _loaded_lock:
+            _loaded[key] = (sig, index)
+            _loaded.move_to_end(key)
+            while len(_loaded) > _LOADED_MAX:
+                _loaded.popitem(last=False)
+    return index if index.get("base") == list(base_sig) else None
+
+def rows(index: dict[str, Any], overlay: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    """Index rows as dicts for `checklist_query.select`, with journaled field values applied."""
+    out = []
+    for position, (item_id, offset, length, *values) in enumerate(index["rows"]):
+        row = dict(zip(INDEXED_FIELDS, values))
+        changed = overlay.get(item_id)
+        if changed:
+            row.update({name: changed[name] for name in INDEXED_FIELDS if name in changed})
+        row.update(item_id=item_id, position=position, offset=offset, length=length)
+        out.append(row)
+    return out
+
+def read_items(path: Path, index: dict[str, Any], selected: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Deserialize just the `selected` rows' items."""
+    if not selected:
+        return []
+    out = []
+    with path.open("rb") as f:
+        for row in selected:
+            f.seek(index["start"] + row["offset"])
+            out.append(json.loads(f.read(row["length"])))
+    return out
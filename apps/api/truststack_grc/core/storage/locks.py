@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None  # type: ignore[assignment]
+
+_thread_locks: dict[str, threading.RLock] = {}
+_thread_locks_guard = threading.Lock()
+
+def _thread_lock(path: Path) -> threading.RLock:
+    with _thread_locks_guard:
+        lock = _thread_locks.get(str(path))
+        if lock is None:
+            lock = _thread_locks[str(path)] = threading.RLock()
+        return lock
+
+@contextmanager
+def file_lock(path: Path, shared: bool = False) -> Iterator[None]:
+    """Advisory lock on `path` across processes (flock) and threads.
+
+    The lock file is created if needed but its directory must exist
+    (FileNotFoundError otherwise). If the file is removed and recreated while
+    we wait, the stale lock is dropped and the new file locked instead.
+    """
+    if fcntl is None:
+        with _thread_lock(path):
+            yield
+        return
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                current = os.stat(path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current != os.fstat(fd).st_ino:
+                continue
+            yield
+            return
+        finally:
+            os.close(fd)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.util.fingerprint import TreeSignature, tree_signature
+
+CHUNK_SIZE = 1024 * 1024
+SIDECAR_VERSION = 1
+
+def _merkle_node(children: list[tuple[str, str, str]]) -> str:
+    h = hashlib.sha256()
+    for name, kind, digest in sorted(children):
+        h.update(f"{name}\x00{kind}\x00{digest}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def merkle_root(file_digests: dict[str, str]) -> str:
+    """Combine per-file digests into a root digest, one node per directory level."""
+    tree: dict[str, Any] = {}
+    for rel, digest in file_digests.items():
+        parts = rel.split(os.sep)
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = digest
+
+    def walk(node: dict[str, Any]) -> str:
+        return _merkle_node([
+            (name, "tree", walk(child)) if isinstance(child, dict) else (name, "blob", child)
+            for name, child in node.items()
+        ])
+
+    return walk(tree)
+
+class DirectoryHasher:
+    """Directory hashing with a persistent per-file digest cache.
+
+    Per-file SHA-256 digests are cached in a JSON sidecar keyed by
+    (relative path, size, mtime_ns, inode) and combined into a Merkle root, so
+    only changed files are re-read. The legacy directory digest
+    (`sha256_dir`, used for `pack_hash`) is a single SHA-256 over every file's
+    bytes and cannot be composed from per-file digests; it is cached against
+    the Merkle root of the tree it was computed from. A tree whose stat
+    signature changed but whose content did not (touched, copied or checked
+    out again) keeps its digest after re-reading only the files that look
+    changed; otherwise it is recomputed in one streaming pass.
+    """
+
+    def __init__(self, sidecar_dir: Path | None):
+        self.sidecar_dir = sidecar_dir
+        self._lock = threading.Lock()
+        self._memory: dict[str, dict[str, Any]] = {}
+
+    def _sidecar_path(self, path: Path) -> Path | None:
+        if self.sidecar_dir is None:
+            return None
+        key = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:32]
+        return self.sidecar_dir / f"{key}.json"
+
+    def _load(self, path: Path) -> dict[str, Any]:
+        key = str(path.resolve())
+        with self._lock:
+            state = self._memory.get(key)
+        if state is not None:
+            return state
+        state = {"version": SIDECAR_VERSION, "root": key, "files": {}, "tree": None}
+        sidecar = self._sidecar_path(path)
+        if sidecar is not None and sidecar.exists():
+            try:
+                data = json.loads(sidecar.read_text(encoding="utf-8"))
+                if data.get("version") == SIDECAR_VERSION and data.get("root") == key:
+                    state = data
+            except (OSError, ValueError):
+                pass
+        return state
+
+    def _store(self, path: Path, state: dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[state["root"]] = state
+        sidecar = self._sidecar_path(path)
+        if sidecar is None:
+            return
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(state, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, sidecar)
+        except OSError:
+            # The cache is an optimization; a read-only cache dir must not break hashing.
+            pass
+
+    @staticmethod
+    def _signature_key(sig: TreeSignature) -> str:
+        return hashlib.sha256(repr(sig).encode("utf-8")).hexdigest()
+
+    def file_digests(self, path: Path, sig: TreeSignature | None = None) -> dict[str, str]:
+        """Digest of every file under `path` by relative path; `sig` is its tree signature if already taken."""
+        sig = tree_signature(path) if sig is None else sig
+        state = self._load(path)
+        cached: dict[str, list[Any]] = state["files"]
+        files: dict[str, list[Any]] = {}
+        changed = False
+        for rel, size, mtime_ns, ino in sig:
+            prev = cached.get(rel)
+            if prev is not None and prev[:3] == [size, mtime_ns, ino]:
+                files[rel] = prev
+                continue
+            h = hashlib.sha256()
+            with (path / rel).open("rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    h.update(chunk)
+            files[rel] = [size, mtime_ns, ino, h.hexdigest()]
+            changed = True
+        if changed or len(files) != len(cached):
+            state = {**state, "files": files}
+            self._store(path, state)
+        return {rel: entry[3] for rel, entry in files.items()}
+
+    def merkle_root(self, path: Path, sig: TreeSignature | None = None) -> str:
+        return merkle_root(self.file_digests(path, sig))
+
+    def legacy_digest(self, path: Path) -> str:
+        """Byte-identical to `sha256_dir(path)`, recomputed only when the tree changes."""
+        sig = tree_signature(path)
+        sig_key = self._signature_key(sig)
+        state = self._load(path)
+        tree = state.get("tree")
+        if tree and tree.get("signature") == sig_key:
+            return tree["legacy"]
+        if tree:
+            root = merkle_root(self.file_digests(path, sig))
+            if root == tree.get("merkle"):
+                state = self._load(path)
+                self._store(path, {**state, "tree": {**tree, "signature": sig_key}})
+                return tree["legacy"]
+
+        h = hashlib.sha256()
+        files: dict[str, list[Any]] = {}
+        for rel, size, mtime_ns, ino in sig:
+            fh = hashlib.sha256()
+            h.update(rel.encode("utf-8"))
+            h.update(b"\x00")
+            with (path / rel).open("rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    h.update(chunk)
+                    fh.update(chunk)
+            h.update(b"\x00")
+            files[rel] = [size, mtime_ns, ino, fh.hexdigest()]
+        legacy = h.hexdigest()
+        self._store(path, {
+            **state,
+            "files": files,
+            "tree": {"signature": sig_key, "legacy": legacy, "merkle": merkle_root({k: v[3] for k, v in files.items()})},
+        })
+        return legacy
+
+@lru_cache(maxsize=1)
+def directory_hasher() -> DirectoryHasher:
+    return DirectoryHasher(sidecar_dir=get_settings().cache_root / "hashes")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import shutil
+from dataclasses import dataclass, field
+from typing import Any
+
+from truststack_grc.core.storage.base import Storage
+
+@dataclass
+class MigrationResult:
+    projects: int = 0
+    items: int = 0
+    audit_events: int = 0
+    errors: list[str] = field(default_factory=list)
+
+def _blob_digests(checklist: dict[str, Any]) -> set[str]:
+    return {
+        e["blob"]
+        for item in checklist.get("items", [])
+        for e in item.get("evidence") or []
+        if isinstance(e, dict) and e.get("blob")
+    }
+
+def migrate_storage(source: Storage, target: Storage, project_ids: list[str] | None = None) -> MigrationResult:
+    """Copy projects, checklists and audit trails from `source` into `target`.
+
+    Re-running is idempotent: documents are upserted and each project's audit
+    trail is replaced. Evidence files and blobs are copied only when the two
+    backends use different workspace roots.
+    """
+    res = MigrationResult()
+    ids = project_ids if project_ids is not None else [p.get("id") for p in source.list_projects()]
+    for project_id in ids:
+        try:
+            proj = source.read_project(project_id)
+            if proj is None:
+                raise ValueError("project document not found")
+            checklist = source.read_checklist(project_id)
+            events = source.read_audit(project_id)
+
+            src_dir, dst_dir = source.project_dir(project_id), target.project_dir(project_id)
+            if src_dir.resolve() != dst_dir.resolve() and (src_dir / "evidence").is_dir():
+                shutil.copytree(src_dir / "evidence", dst_dir / "evidence", dirs_exist_ok=True)
+            if checklist is not None and source.blobs.root.resolve() != target.blobs.root.resolve():
+                for digest in _blob_digests(checklist):
+                    target.blobs.copy_from(source.blobs, digest, project_id)
+
+            target.write_project(project_id, proj, create=True)
+            if checklist is not None:
+                target.write_checklist(project_id, checklist)
+                res.items += len(checklist.get("items", []))
+            target.replace_audit(project_id, events)
+            res.audit_events += len(events)
+            res.projects += 1
+        except Exception as e:
+            res.errors.append(f"{project_id}: {e}")
+    return res
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+from truststack_grc.config import get_settings
+from truststack_grc.core.mapping.engine import SEVERITY_RANK, summarize
+from truststack_grc.core.storage import catalog
+from truststack_grc.core.storage.auditlog import AuditEvent, AuditQuery, utc_now_iso
+from truststack_grc.core.storage.db import connect, dumps, read_transaction, write_transaction
+from truststack_grc.core.storage.base import ChangeSet, ProjectNotFound, RevisionConflict, Storage, StoragePaths, apply_changesets
+from truststack_grc.core.storage.checklist_query import FILTER_FIELDS, ChecklistQuery, decode_cursor, encode_cursor, project
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    summary TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checklists (
+    project_id TEXT PRIMARY KEY,
+    generated_at TEXT,
+    revision INTEGER NOT NULL DEFAULT 0,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checklist_items (
+    project_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    domain TEXT,
+    severity TEXT,
+    status TEXT,
+    owner TEXT,
+    doc TEXT NOT NULL,
+    PRIMARY KEY (project_id, item_id)
+);
+CREATE INDEX IF NOT EXISTS checklist_items_position ON checklist_items(project_id, position);
+CREATE INDEX IF NOT EXISTS checklist_items_status ON checklist_items(project_id, status);
+CREATE TABLE IF NOT EXISTS evidence (
+    id INTEGER PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    sha256 TEXT,
+    meta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS evidence_item ON evidence(project_id, item_id, position);
+CREATE TABLE IF NOT EXISTS audit_events (
+    id INTEGER PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    actor TEXT,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audit_events_project ON audit_events(project_id, id);
+CREATE INDEX IF NOT EXISTS audit_events_ts ON audit_events(project_id, ts);
+""" + catalog.CATALOG_SCHEMA
+
+# SQL for the value `checklist_query.sort_value` computes, per sort and filter field.
+_ITEM_EXPR = {
+    "position": "position",
+    "severity": "CASE severity " + " ".join(f"WHEN '{name}' THEN {rank}" for name, rank in SEVERITY_RANK.items()) + " ELSE 0 END",
+    "status": "COALESCE(status, '')",
+    "domain": "COALESCE(domain, '')",
+    "title": "COALESCE(json_extract(doc, '$.title'), '')",
+    "owner": "COALESCE(owner, '')",
+}
+_FILTER_COLUMN = {"status": "status", "domain": "domain", "severity": "severity", "category": "json_extract(doc, '$.category')", "owner": "owner"}
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(checklists)")}
+    if "revision" not in columns:
+        conn.execute("ALTER TABLE checklists ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+    # Databases from before the project catalog: index their projects once.
+    with write_transaction(conn):
+        for project_id, doc in conn.execute("SELECT id, doc FROM projects WHERE id NOT IN (SELECT id FROM project_catalog)").fetchall():
+            catalog.upsert(conn, project_id, json.loads(doc))
+            catalog.set_counts(conn, project_id, _item_counts(conn, project_id))
+
+def _item_counts(conn: sqlite3.Connection, project_id: str) -> dict[str, Any]:
+    rows = conn.execute("SELECT domain, status FROM checklist_items WHERE project_id = ? ORDER BY position", (project_id,))
+    return summarize([{"domain": domain, "status": status} for domain, status in rows])
+
+class SQLiteStorage(Storage):
+    """Projects, checklist items, evidence metadata and audit events in one SQLite database.
+
+    Documents are stored as JSON next to the columns used for indexing and
+    filtering; checklist items and evidence are rows of their own so item
+    updates touch a single row. Evidence files stay on disk under `project_dir`.
+    """
+
+    def __init__(self, paths: StoragePaths, db_path: Path):
+        super().__init__(paths)
+        self.db_path = db_path
+
+    @classmethod
+    def from_env(cls) -> "SQLiteStorage":
+        settings = get_settings()
+        return cls(paths=StoragePaths(workspace_root=settings.workspace_root), db_path=settings.sqlite_path)
+
+    def _conn(self) -> sqlite3.Connection:
+        return connect(self.db_path, SCHEMA, _migrate)
+
+    def _write(self):
+        return write_transaction(self._conn())
+
+    def list_projects(self) -> list[dict[str, Any]]:
+        rows = self._conn().execute("SELECT summary FROM projects ORDER BY id").fetchall()
+        return [json.loads(summary) for (summary,) in rows]
+
+    def query_projects(self, query: catalog.ProjectQuery) -> tuple[list[dict[str, Any]], str | None]:
+        return catalog.search(self._conn(), query)
+
+    def read_project(self, project_id: str) -> dict[str, Any] | None:
+        row = self._conn().execute("SELECT doc FROM projects WHERE id = ?", (project_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def write_project(self, project_id: str, data: dict[str, Any], create: bool = False) -> None:
+        project = data.get("project", {"id": project_id})
+        with self._write() as conn:
+            if not create:
+                self._require_project(conn, project_id)
+            conn.execute(
+                "INSERT INTO projects (id, name, created_at, updated_at, summary, doc) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET name = excluded.name, created_at = excluded.created_at, "
+                "updated_at = excluded.updated_at, summary = excluded.summary, doc = excluded.doc",
+                (project_id, project.get("name"), project.get("created_at"), project.get("updated_at"), dumps(project), dumps(data)),
+            )
+            catalog.upsert(conn, project_id, data)
+
+    @staticmethod
+    def _require_project(conn: sqlite3.Connection, project_id: str) -> None:
+        if conn.execute("SELECT 1 FROM projects WHERE id = ?", (project_id,)).fetchone() is None:
+            raise ProjectNotFound(project_id)
+
+    def touch_project(self, project_id: str, updated_at: str) -> None:
+        with self._write() as conn:
+            self._touch(conn, project_id, updated_at)
+
+    @staticmethod
+    def _touch(conn: sqlite3.Connection, project_id: str, updated_at: str) -> None:
+        row = conn.execute("SELECT doc FROM projects WHERE id = ?", (project_id,)).fetchone()
+        if not row:
+            return
+        data = json.loads(row[0])
+        project = data.setdefault("project", {})
+        if str(project.get("updated_at") or "") >= updated_at:
+            # Same rule as the filesystem journal: the latest stamp wins whatever the commit order.
+            return
+        project["updated_at"] = updated_at
+        conn.execute(
+            "UPDATE projects SET updated_at = ?, summary = ?, doc = ? WHERE id = ?",
+            (updated_at, dumps(data["project"]), dumps(data), project_id),
+        )
+        catalog.touch(conn, project_id, updated_at)
+
+    def _evidence(self, conn: sqlite3.Connection, project_id: str, item_id: str | None = None) -> dict[str, list[dict[str, Any]]]:
+        if item_id is None:
+            rows = conn.execute("SELECT item_id, meta FROM evidence WHERE project_id = ? ORDER BY item_id, position", (project_id,))
+        else:
+            rows = conn.execute("SELECT item_id, meta FROM evidence WHERE project_id = ? AND item_id = ? ORDER BY position", (project_id, item_id))
+        out: dict[str, list[dict[str, Any]]] = {}
+        for iid, meta in rows:
+            out.setdefault(iid, []).append(json.loads(meta))
+        return out
+
+    @staticmethod
+    def _item(doc: str, evidence: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+        item = json.loads(doc)
+        # `evidence` is kept as a placeholder in the stored doc so key order survives.
+        if isinstance(item.get("evidence"), list):
+            item["evidence"] = evidence.get(item.get("item_id"), [])
+        return item
+
+    def read_checklist(self, project_id: str) -> dict[str, Any] | None:
+        # One read transaction so items and evidence come from the same snapshot.
+        with read_transaction(self._conn()) as conn:
+            row = conn.execute("SELECT doc, revision FROM checklists WHERE project_id = ?", (project_id,)).fetchone()
+            if not row:
+                return None
+            checklist = json.loads(row[0])
+            checklist["revision"] = row[1]
+            evidence = self._evidence(conn, project_id)
+            rows = conn.execute("SELECT doc FROM checklist_items WHERE project_id = ? ORDER BY position", (project_id,)).fetchall()
+        checklist["items"] = [self._item(doc, evidence) for (doc,) in rows]
+        return checklist
+
+    def read_checklist_header(self, project_id: str) -> dict[str, Any] | None:
+        row = self._conn().execute("SELECT doc, revision FROM checklists WHERE project_id = ?", (project_id,)).fetchone()
+        if not row:
+            return None
+        header = {k: v for k, v in json.loads(row[0]).items() if k != "items"}
+        header["revision"] = row[1]
+        return header
+
+    def query_checklist(self, project_id: str, query: ChecklistQuery) -> dict[str, Any] | None:
+        if query.sort not in _ITEM_EXPR:
+            raise ValueError(f"Unsupported sort field: {query.sort}")
+        where, params = ["project_id = ?"], [project_id]
+        for name in FILTER_FIELDS:
+            values = getattr(query, name)
+            if values:
+                where.append(f"{_FILTER_COLUMN[name]} IN ({', '.join('?' * len(values))})")
+                params += list(values)
+        expr, direction = _ITEM_EXPR[query.sort], "DESC" if query.order == "desc" else "ASC"
+        page_where, page_params = list(where), list(params)
+        if query.cursor:
+            value, position = decode_cursor(query)
+            page_where.append(f"({expr}, position) {'<' if direction == 'DESC' else '>'} (?, ?)")
+            page_params += [value, position]
+        with read_transaction(self._conn()) as conn:
+            row = conn.execute("SELECT revision FROM checklists WHERE project_id = ?", (project_id,)).fetchone()
+            if not row:
+                return None
+            total = conn.execute(f"SELECT COUNT(*) FROM checklist_items WHERE {' AND '.join(where)}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT item_id, doc, {expr}, position FROM checklist_items WHERE {' AND '.join(page_where)} "
+                f"ORDER BY {expr} {direction}, position {direction} LIMIT ?",
+                page_params + [query.limit + 1],
+            ).fetchall()
+            page = rows[:query.limit]
+            evidence: dict[str, list[dict[str, Any]]] = {}
+            if not query.fields or "evidence" in query.fields:
+                for item_id, _, _, _ in page:
+                    evidence.update(self._evidence(conn, project_id, item_id))
+        next_cursor = encode_cursor(query, page[-1][2], page[-1][3]) if len(rows) > query.limit else None
+        return {
+            "revision": row[0],
+            "total": total,
+            "items": [project(self._item(doc, evidence), query.fields) for _, doc, _, _ in page],
+            "next_cursor": next_cursor,
+        }
+
+    def _insert_evidence(self, conn: sqlite3.Connection, project_id: str, item_id: str, evidence: list[dict[str, Any]], start: int = 0) -> None:
+        conn.executemany(
+            "INSERT INTO evidence (project_id, item_id, position, sha256, meta) VALUES (?, ?, ?, ?, ?)",
+            [(project_id, item_id, start + n, (meta or {}).get("sha256"), dumps(meta)) for n, meta in enumerate(evidence)],
+        )
+
+    def _item_row(self, project_id: str, position: int, item: dict[str, Any]) -> tuple[Any, ...]:
+        doc = dict(item)
+        if isinstance(doc.get("evidence"), list):
+            doc["evidence"] = []
+        return (project_id, item.get("item_id"), position, item.get("domain"), item.get("severity"), item.get("status"), item.get("owner"), dumps(doc))
+
+    def write_checklist(self, project_id: str, data: dict[str, Any], expected_revision: int | None = None) -> int:
+        # Keep the position of `items` among the document keys.
+        header = {k: (None if k == "items" else v) for k, v in data.items()}
+        items = data.get("items", [])
+        with self._write() as conn:
+            self._require_project(conn, project_id)
+            row = conn.execute("SELECT revision FROM checklists WHERE project_id = ?", (project_id,)).fetchone()
+            revision = row[0] if row else 0
+            if expected_revision is not None and expected_revision != revision:
+                raise RevisionConflict(revision)
+            header["revision"] = revision = revision + 1
+            conn.execute(
+                "INSERT INTO checklists (project_id, generated_at, revision, doc) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(project_id) DO UPDATE SET generated_at = excluded.generated_at, revision = excluded.revision, doc = excluded.doc",
+                (project_id, data.get("generated_at"), revision, dumps(header)),
+            )
+            conn.execute("DELETE FROM checklist_items WHERE project_id = ?", (project_id,))
+            conn.execute("DELETE FROM evidence WHERE project_id = ?", (project_id,))
+            conn.executemany(
+                "INSERT INTO checklist_items (project_id, item_id, position, domain, severity, status, owner, doc) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._item_row(project_id, n, item) for n, item in enumerate(items)],
+            )
+            for item in items:
+                if isinstance(item.get("evidence"), list) and item["evidence"]:
+                    self._insert_evidence(conn, project_id, item.get("item_id"), item["evidence"])
+            catalog.set_counts(conn, project_id, summarize(items))
+        return revision
+
+    def read_checklist_item(self, project_id: str, item_id: str) -> dict[str, Any] | None:
+        conn = self._conn()
+        row = conn.execute("SELECT doc FROM checklist_items WHERE project_id = ? AND item_id = ?", (project_id, item_id)).fetchone()
+        if not row:
+            return None
+        return self._item(row[0], self._evidence(conn, project_id, item_id))
+
+    def apply_changes(self, project_id: str, changesets: list[ChangeSet], updated_at: str | None = None) -> bool:
+        with self._write() as conn:
+            row = conn.execute("SELECT revision FROM checklists WHERE project_id = ?", (project_id,)).fetchone()
+            if not row:
+                return False
+            index: dict[str, dict[str, Any]] = {}
+            positions: dict[str, int] = {}
+            for item_id in {item_id for cs in changesets for item_id, _ in cs.updates}:
+                found = conn.execute("SELECT position, doc FROM checklist_items WHERE project_id = ? AND item_id = ?", (project_id, item_id)).fetchone()
+                if found:
+                    positions[item_id] = found[0]
+                    index[item_id] = self._item(found[1], self._evidence(conn, project_id, item_id))
+            before = {item_id: list(item.get("evidence") or []) for item_id, item in index.items()}
+            revision, changes = apply_changesets(index, changesets, row[0])
+            for item_id in dict.fromkeys(item_id for item_id, _, _ in changes):
+                item = index[item_id]
+                conn.execute(
+                    "UPDATE checklist_items SET domain = ?, severity = ?, status = ?, owner = ?, doc = ? WHERE project_id = ? AND item_id = ?",
+                    self._item_row(project_id, positions[item_id], item)[3:] + (project_id, item_id),
+                )
+                after = list(item.get("evidence") or [])
+                if after[:len(before[item_id])] == before[item_id]:
+                    # Usual case: evidence was appended.
+                    self._insert_evidence(conn, project_id, item_id, after[len(before[item_id]):], start=len(before[item_id]))
+                else:
+                    conn.execute("DELETE FROM evidence WHERE project_id = ? AND item_id = ?", (project_id, item_id))
+                    self._insert_evidence(conn, project_id, item_id, after)
+            if changes:
+                conn.execute("UPDATE checklists SET revision = ? WHERE project_id = ?", (revision, project_id))
+                catalog.set_counts(conn, project_id, _item_counts(conn, project_id))
+            if updated_at and any(cs.applied for cs in changesets):
+                self._touch(conn, project_id, updated_at)
+        return True
+
+    def delete_project(self, project_id: str) -> bool:
+        with self._write() as conn:
+            deleted = conn.execute("DELETE FROM projects WHERE id = ?", (project_id,)).rowcount > 0
+            for table in ("checklists", "checklist_items", "evidence", "audit_events"):
+                conn.execute(f"DELETE FROM {table} WHERE project_id = ?", (project_id,))
+            catalog.remove(conn, project_id)
+        proj_dir = self.project_dir(project_id)
+        if proj_dir.is_dir():
+            shutil.rmtree(proj_dir)
+        self.blobs.release(project_id)
+        return deleted
+
+    def append_audit(self, project_id: str, event_type: str, actor: str, details: dict[str, Any]) -> None:
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO audit_events (project_id, ts, event_type, actor, details) VALUES (?, ?, ?, ?, ?)",
+                (project_id, utc_now_iso(), event_type, actor, dumps(details)),
+            )
+
+    def append_audit_events(self, project_id: str, events: list[AuditEvent]) -> None:
+        ts = utc_now_iso()
+        with self._write() as conn:
+            conn.executemany(
+                "INSERT INTO audit_events (project_id, ts, event_type, actor, details) VALUES (?, ?, ?, ?, ?)",
+                [(project_id, ts, e.event_type, e.actor, dumps(e.details)) for e in events],
+            )
+
+    def read_audit(self, project_id: str) -> list[dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT ts, event_type, actor, details FROM audit_events WHERE project_id = ? ORDER BY id", (project_id,)
+        ).fetchall()
+        return [{"ts": ts, "event_type": et, "actor": actor, "details": json.loads(details)} for ts, et, actor, details in rows]
+
+    def query_audit(self, project_id: str, query: AuditQuery) -> tuple[list[dict[str, Any]], str | None]:
+        where, params = ["project_id = ?"], [project_id]
+        if query.since:
+            where.append("ts >= ?")
+            params.append(query.since)
+        if query.until:
+            where.append("ts <= ?")
+            params.append(query.until)
+        if query.event_types:
+            where.append(f"event_type IN ({', '.join('?' * len(query.event_types))})")
+            params += list(query.event_types)
+        if query.cursor:
+            if not query.cursor.isdigit():
+                raise catalog.InvalidCursor("Malformed cursor")
+            where.append("id > ?")
+            params.append(int(query.cursor))
+        rows = self._conn().execute(
+            f"SELECT id, ts, event_type, actor, details FROM audit_events WHERE {' AND '.join(where)} ORDER BY id LIMIT ?",
+            params + [query.limit + 1],
+        ).fetchall()
+        events = [{"ts": ts, "event_type": et, "actor": actor, "details": json.loads(details)} for _, ts, et, actor, details in rows[:query.limit]]
+        return events, str(rows[query.limit - 1][0]) if len(rows) > query.limit else None
+
+    def replace_audit(self, project_id: str, records: list[dict[str, Any]]) -> None:
+        with self._write() as conn:
+            conn.execute("DELETE FROM audit_events WHERE project_id = ?", (project_id,))
+            conn.executemany(
+                "INSERT INTO audit_events (project_id, ts, event_type, actor, details) VALUES (?, ?, ?, ?, ?)",
+                [(project_id, r.get("ts") or utc_now_iso(), r.get("event_type") or "", r.get("actor"), dumps(r.get("details") or {})) for r in records],
+            )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+import aiofiles.os
+
+CHUNK_SIZE = 1024 * 1024
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes} byte limit")
+        self.max_bytes = max_bytes
+
+@dataclass(frozen=True)
+class StagedUpload:
+    path: Path
+    sha256: str
+    size: int
+
+async def stage_upload(upload: Any, directory: Path, max_bytes: int = 0) -> StagedUpload:
+    """Stream `upload` (anything with `async read(n)`) into a temp file in `directory`.
+
+    The SHA-256 is computed while writing; nothing is buffered beyond one
+    chunk. The temp file is removed if the upload fails or exceeds
+    `max_bytes` (0 = no limit). Callers move it into place with `os.replace`.
+    """
+    await aiofiles.os.makedirs(directory, exist_ok=True)
+    tmp = directory / f".upload.{uuid.uuid4().hex}.tmp"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp, "wb") as f:
+            while chunk := await upload.read(CHUNK_SIZE):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return StagedUpload(path=tmp, sha256=digest.hexdigest(), size=size)
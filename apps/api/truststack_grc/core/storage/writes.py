@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Any
+
+from truststack_grc.core.storage.base import ChangeSet, Storage
+from truststack_grc.core.storage.groupcommit import GroupCommit
+
+class WriteCoordinator:
+    """Group commit for checklist changes, per project.
+
+    Changesets submitted concurrently for one project are applied together
+    with a single `Storage.apply_changes` call, in submission order.
+    """
+
+    def __init__(self, max_batch: int = 256):
+        self._group: GroupCommit[tuple[ChangeSet, str | None], bool] = GroupCommit(max_batch)
+
+    def submit(self, storage: Storage, project_id: str, changeset: ChangeSet, updated_at: str | None = None) -> bool:
+        """Apply `changeset` (see `Storage.apply_changes`); returns False if the project has no checklist."""
+
+        def flush(batch: list[tuple[ChangeSet, str | None]]) -> list[bool]:
+            stamps = [stamp for _, stamp in batch if stamp]
+            result = storage.apply_changes(project_id, [cs for cs, _ in batch], updated_at=max(stamps) if stamps else None)
+            return [result] * len(batch)
+
+        key = (type(storage).__name__, str(storage.project_dir(project_id)))
+        return self._group.submit(key, (changeset, updated_at), flush)
+
+    def stats(self) -> dict[str, Any]:
+        stats = self._group.stats()
+        return {"batches": stats["batches"], "changesets": stats["items"]}
+
+write_coordinator = WriteCoordinator()
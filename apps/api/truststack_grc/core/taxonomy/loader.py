@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import copy
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-from jsonschema import Draft202012Validator
-import json
+from typing import Any, Callable
 
 from truststack_grc.config import get_settings
+from truststack_grc.core.packs.loader import load_validator
+from truststack_grc.core.snapshot.artifact import RegistrySnapshot, open_snapshot
+from truststack_grc.core.storage.hashing import sha256_text
+from truststack_grc.core.util.fingerprint import file_signature, tree_signature
 from truststack_grc.core.util.yamlio import read_yaml
 
 ROOT_KEYS = {"industry", "segment", "use_case", "tags", "pattern", "data", "deployment", "jurisdiction", "model", "system"}
@@ -17,11 +20,48 @@ class TaxonomyPaths:
     root: Path
     industries_dir: Path
 
+@dataclass(frozen=True)
+class TaxonomyModel:
+    """Loaded taxonomy tree with id indexes; shared across callers, treat as read-only."""
+
+    industries: list[dict[str, Any]]
+    industries_by_id: dict[str, dict[str, Any]]
+    # id -> (industry, segment) / (industry, segment, use case)
+    segments_by_id: dict[str, tuple[dict[str, Any], dict[str, Any]]]
+    use_cases_by_id: dict[str, tuple[dict[str, Any], dict[str, Any], dict[str, Any]]]
+    # Same value projects store as generated.taxonomy_hash
+    tree_hash: str
+
+    @classmethod
+    def build(cls, industries: list[dict[str, Any]]) -> "TaxonomyModel":
+        by_industry: dict[str, dict[str, Any]] = {}
+        by_segment: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {}
+        by_use_case: dict[str, tuple[dict[str, Any], dict[str, Any], dict[str, Any]]] = {}
+        # First occurrence wins, as with the linear scans this replaces.
+        for industry in industries:
+            by_industry.setdefault(industry.get("id"), industry)
+            for segment in industry.get("segments", []):
+                by_segment.setdefault(segment.get("id"), (industry, segment))
+                for uc in segment.get("use_cases", []):
+                    by_use_case.setdefault(uc.get("id"), (industry, segment, uc))
+        return cls(
+            industries=industries,
+            industries_by_id=by_industry,
+            segments_by_id=by_segment,
+            use_cases_by_id=by_use_case,
+            tree_hash=sha256_text(str(industries)),
+        )
+
+# Process-wide models keyed by source (taxonomy dir or snapshot file), each
+# with the stat signature it was built from.
+_models: dict[str, tuple[Any, TaxonomyModel]] = {}
+_models_lock = threading.Lock()
+
 class TaxonomyLoader:
-    def __init__(self, paths: TaxonomyPaths, schema_dir: Path):
+    def __init__(self, paths: TaxonomyPaths, schema_dir: Path, snapshot: RegistrySnapshot | None = None):
         self.paths = paths
         self.schema_dir = schema_dir
-        self._use_case_validator = Draft202012Validator(json.loads((schema_dir / "use_case.schema.json").read_text(encoding="utf-8")))
+        self.snapshot = snapshot
 
     @classmethod
     def from_env(cls) -> "TaxonomyLoader":
@@ -30,6 +70,7 @@ class TaxonomyLoader:
         return cls(
             paths=TaxonomyPaths(root=root, industries_dir=root / "industries"),
             schema_dir=(settings.config_root.parent / "schemas"),
+            snapshot=open_snapshot(settings.snapshot_path) if settings.snapshot_path else None,
         )
 
     def _industry_paths(self) -> list[Path]:
@@ -37,7 +78,39 @@ class TaxonomyLoader:
             return []
         return [p for p in self.paths.industries_dir.iterdir() if p.is_dir()]
 
+    def _from_snapshot(self) -> bool:
+        return self.snapshot is not None and "taxonomy:industries" in self.snapshot
+
+    def source_signature(self) -> Any:
+        """Stat signature of the files the taxonomy is read from; reads nothing."""
+        if self._from_snapshot():
+            return ("snapshot", str(self.snapshot.path), file_signature(self.snapshot.path))
+        return (tree_signature(self.paths.industries_dir), file_signature(self.schema_dir / "use_case.schema.json"))
+
+    def model(self) -> TaxonomyModel:
+        """The indexed taxonomy, rebuilt only when its files (or the snapshot) change."""
+        load: Callable[[], list[dict[str, Any]]]
+        if self._from_snapshot():
+            key = f"snapshot:{self.snapshot.path}"
+            load = lambda: self.snapshot.get("taxonomy:industries")
+        else:
+            key = str(self.paths.industries_dir)
+            load = self._read_industries
+        sig = self.source_signature()
+        with _models_lock:
+            cached = _models.get(key)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        model = TaxonomyModel.build(load())
+        with _models_lock:
+            _models[key] = (sig, model)
+        return model
+
     def list_industries(self) -> list[dict[str, Any]]:
+        # A copy: the model is shared by every caller in the process.
+        return copy.deepcopy(self.model().industries)
+
+    def _read_industries(self) -> list[dict[str, Any]]:
         items: list[dict[str, Any]] = []
         for ind_dir in self._industry_paths():
             ind_file = ind_dir / "industry.yaml"
@@ -65,31 +138,28 @@ class TaxonomyLoader:
         out: list[dict[str, Any]] = []
         if not uc_root.exists():
             return out
+        validator = load_validator(self.schema_dir / "use_case.schema.json")
         for uc_dir in sorted([d for d in uc_root.iterdir() if d.is_dir()], key=lambda p: p.name):
             uc_file = uc_dir / "use_case.yaml"
             if not uc_file.exists():
                 continue
             uc = read_yaml(uc_file)
             # validate; raise is ok for dev; in prod we'd log and skip
-            self._use_case_validator.validate(uc)
+            validator.validate(uc)
             out.append(uc)
         return out
 
     def get_industry(self, industry_id: str) -> dict[str, Any] | None:
-        for industry in self.list_industries():
-            if industry.get("id") == industry_id:
-                return industry
-        return None
+        return copy.deepcopy(self.model().industries_by_id.get(industry_id))
 
     def get_use_case(self, use_case_id: str) -> dict[str, Any] | None:
-        for industry in self.list_industries():
-            for segment in industry.get("segments", []):
-                for uc in segment.get("use_cases", []):
-                    if uc.get("id") == use_case_id:
-                        # include pointers
-                        return {
-                            "industry": {"id": industry.get("id"), "name": industry.get("name")},
-                            "segment": {"id": segment.get("id"), "name": segment.get("name")},
-                            **uc,
-                        }
-        return None
+        found = self.model().use_cases_by_id.get(use_case_id)
+        if found is None:
+            return None
+        industry, segment, uc = found
+        # include pointers
+        return {
+            "industry": {"id": industry.get("id"), "name": industry.get("name")},
+            "segment": {"id": segment.get("id"), "name": segment.get("name")},
+            **uc,
+        }
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+# (relative path, size, mtime_ns, inode) for every file under a directory.
+TreeSignature = tuple[tuple[str, int, int, int], ...]
+
+def _walk(root: str, prefix: str, out: list[tuple[str, int, int, int]]) -> None:
+    with os.scandir(root) as it:
+        for entry in it:
+            rel = f"{prefix}{entry.name}"
+            if entry.is_dir():
+                _walk(entry.path, rel + os.sep, out)
+            elif entry.is_file():
+                st = entry.stat()
+                out.append((rel, st.st_size, st.st_mtime_ns, st.st_ino))
+
+def tree_signature(path: Path) -> TreeSignature:
+    """Cheap change detector for a directory: stats every file, reads none."""
+    out: list[tuple[str, int, int, int]] = []
+    if path.is_dir():
+        _walk(str(path), "", out)
+    out.sort()
+    return tuple(out)
+
+def file_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
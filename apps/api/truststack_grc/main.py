@@ -5,8 +5,16 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from truststack_grc.api.routers import packs, projects, taxonomy, reports
 from truststack_grc.config import get_settings
+from truststack_grc.core.mapping.memo import checklist_memo
+from truststack_grc.core.packs.cache import pack_cache
+from truststack_grc.core.reporting.cache import report_cache
+from truststack_grc.core.reporting.service import precompile_templates
+from truststack_grc.core.storage.auditlog import audit_stats
+from truststack_grc.core.storage.writes import write_coordinator
 
 settings = get_settings()
+# Compile report templates now (or load them from the shared bytecode cache) rather than on the first export.
+precompile_templates()
 
 app = FastAPI(
     title="TrustStack AI GRC Workbench API",
@@ -30,4 +38,13 @@ app.include_router(reports.router, prefix="/api/reports", tags=["reports"])
 
 @app.get("/healthz")
 def healthz():
-    return {"ok": True, "service": "truststack-grc", "config_root": str(settings.config_root)}
+    return {
+        "ok": True,
+        "service": "truststack-grc",
+        "config_root": str(settings.config_root),
+        "pack_cache": pack_cache.stats(),
+        "checklist_memo": checklist_memo.stats(),
+        "checklist_writes": write_coordinator.stats(),
+        "audit_writes": audit_stats(),
+        "report_cache": report_cache.stats(),
+    }